@@ -0,0 +1,189 @@
+def _build(model_cls, **values):
+    """
+    Builds a pyawsopstoolkit_models object from trusted values, bypassing the per-attribute validation performed by
+    the model constructor and its __setattr__. Fields not provided are set to their declared defaults.
+
+    :param model_cls: The pyawsopstoolkit_models dataclass to be built.
+    :type model_cls: type
+    :param values: The field values of the object.
+    :type values: dict
+    :return: The pyawsopstoolkit_models object.
+    :rtype: Any
+    """
+    instance = object.__new__(model_cls)
+    for field_name, field in model_cls.__dataclass_fields__.items():
+        object.__setattr__(instance, field_name, values[field_name] if field_name in values else field.default)
+
+    return instance
+
+
+def _to_permissions_boundary(boundary: dict):
+    """
+    Converts the given boto3 IAM permissions boundary into a trusted pyawsopstoolkit_models permissions boundary.
+
+    :param boundary: The boto3 IAM permissions boundary.
+    :type boundary: dict
+    :return: The IAM permissions boundary, if any.
+    :rtype: pyawsopstoolkit_models.iam.permissions_boundary.PermissionsBoundary
+    """
+    from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
+
+    if not boundary:
+        return None
+
+    return _build(
+        PermissionsBoundary,
+        type=boundary.get('PermissionsBoundaryType', ''),
+        arn=boundary.get('PermissionsBoundaryArn', '')
+    )
+
+
+def _to_iam_role(account, role: dict):
+    """
+    Converts the given boto3 IAM role dictionary into a trusted pyawsopstoolkit_models IAM role, identical to the one
+    built by pyawsopstoolkit_advsearch.iam.Role._convert_to_iam_role.
+
+    :param account: The account of the IAM role.
+    :type account: pyawsopstoolkit.account.Account
+    :param role: The boto3 IAM role dictionary.
+    :type role: dict
+    :return: The IAM role.
+    :rtype: pyawsopstoolkit_models.iam.role.Role
+    """
+    from pyawsopstoolkit_models.iam.role import LastUsed, Role
+
+    last_used = role.get('RoleLastUsed')
+
+    return _build(
+        Role,
+        account=account,
+        name=role.get('RoleName', ''),
+        id=role.get('RoleId', ''),
+        arn=role.get('Arn', ''),
+        max_session_duration=role.get('MaxSessionDuration', 0),
+        path=role.get('Path', ''),
+        created_date=role.get('CreateDate', None),
+        assume_role_policy_document=role.get('AssumeRolePolicyDocument', None),
+        description=role.get('Description', None),
+        permissions_boundary=_to_permissions_boundary(role.get('PermissionsBoundary', {})),
+        last_used=_build(
+            LastUsed, used_date=last_used.get('LastUsedDate', None), region=last_used.get('Region', None)
+        ) if last_used else None,
+        tags=role.get('Tags', [])
+    )
+
+
+def _to_iam_user(account, user: dict):
+    """
+    Converts the given boto3 IAM user dictionary, including LoginProfile and AccessKeys if fetched, into a trusted
+    pyawsopstoolkit_models IAM user, identical to the one built by pyawsopstoolkit_advsearch.iam.User.
+    _convert_to_iam_user.
+
+    :param account: The account of the IAM user.
+    :type account: pyawsopstoolkit.account.Account
+    :param user: The boto3 IAM user dictionary.
+    :type user: dict
+    :return: The IAM user.
+    :rtype: pyawsopstoolkit_models.iam.user.User
+    """
+    from pyawsopstoolkit_models.iam.user import AccessKey, LoginProfile, User
+
+    login_profile = user.get('LoginProfile', None)
+    access_keys = user.get('AccessKeys', None)
+
+    def _to_access_key(key):
+        _access_key = key.get('access_key', {})
+        _last_used = key.get('last_used', {}).get('AccessKeyLastUsed', {})
+
+        return _build(
+            AccessKey,
+            id=_access_key.get('AccessKeyId', ''),
+            status=_access_key.get('Status', ''),
+            created_date=_access_key.get('CreateDate', None),
+            last_used_date=_last_used.get('LastUsedDate', None),
+            last_used_service=_last_used.get('ServiceName', None),
+            last_used_region=_last_used.get('Region', None)
+        )
+
+    return _build(
+        User,
+        account=account,
+        name=user.get('UserName', ''),
+        id=user.get('UserId', ''),
+        arn=user.get('Arn', ''),
+        path=user.get('Path', ''),
+        created_date=user.get('CreateDate', None),
+        password_last_used_date=user.get('PasswordLastUsed', None),
+        permissions_boundary=_to_permissions_boundary(user.get('PermissionsBoundary', {})),
+        login_profile=_build(
+            LoginProfile,
+            created_date=login_profile.get('CreateDate', None),
+            password_reset_required=login_profile.get('PasswordResetRequired', False)
+        ) if login_profile else None,
+        access_keys=[_to_access_key(key) for key in access_keys] if access_keys else None,
+        tags=user.get('Tags', [])
+    )
+
+
+def _to_ec2_security_group(account, region: str, sg: dict):
+    """
+    Converts the given boto3 EC2 security group dictionary into a trusted pyawsopstoolkit_models EC2 security group,
+    identical to the one built by pyawsopstoolkit_advsearch.ec2.SecurityGroup._convert_to_ec2_security_group.
+
+    :param account: The account of the EC2 security group.
+    :type account: pyawsopstoolkit.account.Account
+    :param region: The region of the EC2 security group.
+    :type region: str
+    :param sg: The boto3 EC2 security group dictionary.
+    :type sg: dict
+    :return: The EC2 security group.
+    :rtype: pyawsopstoolkit_models.ec2.security_group.SecurityGroup
+    """
+    from pyawsopstoolkit_models.ec2.security_group import IPPermission, IPRange, IPv6Range, PrefixList, \
+        SecurityGroup, UserIDGroupPair
+
+    def _to_ip_permission(perm):
+        return _build(
+            IPPermission,
+            from_port=perm.get('FromPort', 0),
+            to_port=perm.get('ToPort', 0),
+            ip_protocol=perm.get('IpProtocol', ''),
+            ip_ranges=[
+                _build(IPRange, cidr_ip=ip.get('CidrIp', ''), description=ip.get('Description', ''))
+                for ip in perm.get('IpRanges', [])
+            ],
+            ipv6_ranges=[
+                _build(IPv6Range, cidr_ipv6=ip.get('CidrIpv6', ''), description=ip.get('Description', ''))
+                for ip in perm.get('Ipv6Ranges', [])
+            ],
+            prefix_lists=[
+                _build(PrefixList, id=prefix.get('PrefixListId', ''), description=prefix.get('Description', ''))
+                for prefix in perm.get('PrefixListIds', [])
+            ],
+            user_id_group_pairs=[
+                _build(
+                    UserIDGroupPair,
+                    id=pair.get('GroupId', ''),
+                    name=pair.get('GroupName', ''),
+                    status=pair.get('PeeringStatus', ''),
+                    user_id=pair.get('UserId', ''),
+                    vpc_id=pair.get('VpcId', ''),
+                    description=pair.get('Description', ''),
+                    vpc_peering_connection_id=pair.get('VpcPeeringConnectionId', '')
+                )
+                for pair in perm.get('UserIdGroupPairs', [])
+            ]
+        )
+
+    return _build(
+        SecurityGroup,
+        account=account,
+        region=region,
+        id=sg.get('GroupId', ''),
+        name=sg.get('GroupName', ''),
+        owner_id=sg.get('OwnerId', ''),
+        vpc_id=sg.get('VpcId', ''),
+        ip_permissions=[_to_ip_permission(perm) for perm in sg.get('IpPermissions', [])],
+        ip_permissions_egress=[_to_ip_permission(perm) for perm in sg.get('IpPermissionsEgress', [])],
+        tags=sg.get('Tags', [])
+    )
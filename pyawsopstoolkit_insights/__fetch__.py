@@ -0,0 +1,245 @@
+import pickle
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+from pyawsopstoolkit_insights.__globals__ import MAX_WORKERS
+
+
+class _SingleFlight:
+    """
+    A class coalescing concurrent calls sharing the same key into a single in-flight call. The first caller executes
+    the call, and every caller arriving while it is in flight waits for, and receives, the same result or exception.
+    Results are not cached: once the call completes, the next caller executes it again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: tuple, fn: Callable):
+        """
+        Executes the given callable, or waits for the in-flight execution sharing the same key.
+
+        :param key: The key identifying identical calls.
+        :type key: tuple
+        :param fn: The callable to be executed.
+        :type fn: Callable
+        :return: The result of the callable.
+        :rtype: Any
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+        return future.result()
+
+
+_SINGLE_FLIGHT = _SingleFlight()
+
+
+def _get_client(session, service_name: str, region: Optional[str] = None):
+    """
+    Creates a boto3 client for the specified service leveraging the provided Session object. The client is expected to
+    be created once per fetch and shared across all calls made by it, since boto3 clients are thread safe.
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :param service_name: The name of the AWS service, e.g. 'iam' or 'ec2'.
+    :type service_name: str
+    :param region: The region the client should be bound to, if any.
+    :type region: str
+    :return: The boto3 client.
+    :rtype: botocore.client.BaseClient
+    """
+    from botocore.config import Config
+
+    kwargs = {}
+    if region:
+        kwargs['config'] = Config(region_name=region)
+    if session.cert_path:
+        kwargs['verify'] = session.cert_path
+
+    return session.get_session().client(service_name, **kwargs)
+
+
+def _project(detail: dict, keys) -> dict:
+    """
+    Returns a copy of the given boto3 response dictionary retaining only the specified keys.
+
+    :param detail: The boto3 response dictionary.
+    :type detail: dict
+    :param keys: The keys to be retained.
+    :type keys: Iterable
+    :return: The projected dictionary.
+    :rtype: dict
+    """
+    return {key: detail[key] for key in keys if key in detail}
+
+
+def _fetch_regions(session, service_name: str, regions: list, fetch: Callable) -> list:
+    """
+    Executes the given fetch function for every region in parallel, with one boto3 client per region, and returns the
+    concatenated results in the order of the regions. Concurrent fetches of the same region are coalesced.
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :param service_name: The name of the AWS service, e.g. 'ec2'.
+    :type service_name: str
+    :param regions: The regions to be fetched.
+    :type regions: list
+    :param fetch: A callable receiving the boto3 client and the region, returning a list of results.
+    :type fetch: Callable
+    :return: The results of all regions.
+    :rtype: list
+    """
+    def _fetch_region(region):
+        return _single_flight(
+            session, (service_name, region, fetch), lambda: fetch(_get_client(session, service_name, region), region)
+        )
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return [item for results in executor.map(_fetch_region, regions) for item in results]
+
+
+def _session_identity(session) -> Optional[str]:
+    """
+    Returns the access key the given Session object resolves to: its explicit access key, or the access key resolved by
+    the botocore credential chain of its profile, e.g. from the shared credentials file or the environment. Credentials
+    resolved lazily, e.g. by assuming a role or through SSO, are not resolved, to avoid a call to AWS per fetch.
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :return: The access key, if resolved.
+    :rtype: str
+    """
+    if session.credentials is not None:
+        return session.credentials.access_key
+
+    import botocore.session
+    from botocore.credentials import DeferredRefreshableCredentials
+    from botocore.exceptions import BotoCoreError
+
+    try:
+        credentials = botocore.session.Session(profile=session.profile_name).get_credentials()
+    except BotoCoreError:
+        return None
+    if credentials is None or isinstance(credentials, DeferredRefreshableCredentials):
+        return None
+
+    return credentials.access_key
+
+
+def _session_key(session) -> tuple:
+    """
+    Returns a hashable key identifying the given Session object. The profile name and the resolved access key determine
+    the AWS identity, hence sessions sharing the key address the same account with the same permissions.
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :return: The session key.
+    :rtype: tuple
+    """
+    return session.profile_name, _session_identity(session), session.region_code, session.cert_path
+
+
+def _single_flight(session, key: tuple, fn: Callable):
+    """
+    Executes the given fetch callable, sharing a single in-flight execution between concurrent callers with the same
+    session and key. Works from threads, including asyncio callers using asyncio.to_thread or run_in_executor.
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :param key: The key identifying the fetch, including its region and parameters.
+    :type key: tuple
+    :param fn: The fetch callable to be executed.
+    :type fn: Callable
+    :return: The result of the fetch, shared between the coalesced callers.
+    :rtype: Any
+    """
+    return _SINGLE_FLIGHT.do((_session_key(session),) + key, fn)
+
+
+def _paginate(client, operation_name: str, result_key: str, **kwargs) -> Iterator:
+    """
+    Utilizing the boto3 paginator of the specified operation, this method yields all items of the result key across
+    all pages, one page at a time.
+
+    :param client: The boto3 client.
+    :type client: botocore.client.BaseClient
+    :param operation_name: The name of the paginated operation, e.g. 'describe_volumes'.
+    :type operation_name: str
+    :param result_key: The key of the items within each page, e.g. 'Volumes'.
+    :type result_key: str
+    :param kwargs: The arguments of the operation, e.g. Filters.
+    :return: A generator of the items across all pages.
+    :rtype: Iterator
+    """
+    for page in client.get_paginator(operation_name).paginate(**kwargs):
+        yield from page.get(result_key, [])
+
+
+def _spool(records: Iterable, max_memory: int) -> Iterator:
+    """
+    Consumes the given records eagerly, holding at most max_memory bytes of pickled records in memory and spilling the
+    rest to an anonymous temporary file, and returns a generator reading them back in their original order. Exceptions
+    raised while consuming are therefore raised by this call, and the temporary file is removed once the generator is
+    exhausted or closed.
+
+    :param records: The records to be spooled.
+    :type records: Iterable
+    :param max_memory: The number of bytes of pickled records held in memory before spilling.
+    :type max_memory: int
+    :return: A generator of the spooled records.
+    :rtype: Iterator
+    """
+    buffer = []
+    buffer_size = 0
+    spill = None
+
+    try:
+        for record in records:
+            data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+            buffer.append(data)
+            buffer_size += len(data)
+
+            if buffer_size > max_memory:
+                if spill is None:
+                    spill = tempfile.TemporaryFile()
+                spill.writelines(buffer)
+                buffer = []
+                buffer_size = 0
+    except BaseException:
+        if spill is not None:
+            spill.close()
+        raise
+
+    def _read():
+        try:
+            if spill is not None:
+                spill.seek(0)
+                while True:
+                    try:
+                        yield pickle.load(spill)
+                    except EOFError:
+                        break
+            for data in buffer:
+                yield pickle.loads(data)
+        finally:
+            if spill is not None:
+                spill.close()
+
+    return _read()
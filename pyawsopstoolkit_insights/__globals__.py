@@ -0,0 +1,3 @@
+MAX_WORKERS = 10  # The number of parallel threads to be executed within the AWS Ops Toolkit insights package.
+CHUNK_SIZE = 100  # The number of principals fetched and evaluated at once within the chunked evaluation mode.
+MAX_MEMORY = 16 * 1024 * 1024  # The number of bytes of results held in memory before spilling within the chunked mode.
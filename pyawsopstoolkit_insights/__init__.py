@@ -1,9 +1,14 @@
 __all__ = [
+    "coordinator",
     "ec2",
-    "iam"
+    "iam",
+    "remediation",
+    "replay",
+    "report",
+    "tracker"
 ]
 __name__ = "pyawsopstoolkit_insights"
-__version__ = "0.1.1"
+__version__ = "0.2.0"
 __description__ = """
 This package offers a comprehensive array of features designed to clean up and maintain hygiene within AWS (Amazon Web
 Services). It includes tools for identifying unused IAM roles, EC2 Security Groups, and more. Meticulously engineered,
@@ -11,3 +11,37 @@ def _validate_type(value, expected_type, message) -> None:
     """
     if not isinstance(value, expected_type):
         raise TypeError(message)
+
+
+def _validate_top_unused(k: int, by: str, supported: tuple) -> None:
+    """
+    Validates the parameters of a top unused query.
+
+    :param k: The number of resources to be returned.
+    :type k: int
+    :param by: The ranking criteria.
+    :type by: str
+    :param supported: The supported ranking criteria.
+    :type supported: tuple
+    """
+    _validate_type(k, int, 'k should be an integer.')
+    if k <= 0:
+        raise ValueError('k should be greater than zero.')
+    _validate_type(by, str, 'by should be a string.')
+    if by not in supported:
+        raise ValueError(f'by should be one of: {", ".join(supported)}.')
+
+
+def _validate_chunked(chunk_size, max_memory) -> None:
+    """
+    Validates the parameters of the chunked evaluation mode.
+
+    :param chunk_size: The number of principals fetched and evaluated at once, if any.
+    :type chunk_size: int
+    :param max_memory: The number of bytes of results held in memory before spilling to a temporary file, if any.
+    :type max_memory: int
+    """
+    for name, value in (('chunk_size', chunk_size), ('max_memory', max_memory)):
+        _validate_type(value, (int, type(None)), f'{name} should be an integer.')
+        if value is not None and value <= 0:
+            raise ValueError(f'{name} should be greater than zero.')
@@ -0,0 +1,863 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from pyawsopstoolkit_insights.__validations__ import _validate_type
+
+# Maps the supported checks to whether they are regional, i.e. sharded per region, or global to the account.
+_CHECKS = {
+    'unused_roles': False,
+    'unused_users': False,
+    'unused_policies': False,
+    'unused_security_groups': True,
+    'unused_elastic_ips': True,
+    'unused_network_interfaces': True,
+    'unused_volumes': True
+}
+
+_WORK_QUEUE_METHODS = ('put', 'lease', 'extend', 'complete', 'fail', 'tasks', 'results')
+
+# The grace period, in seconds, after which a task claimed but never released (i.e. its worker stopped while holding
+# the claim) is returned to the queue by the FileWorkQueue.
+_LEASE_GRACE_SECONDS = 60
+
+_TASK_STATUSES = ('pending', 'leased', 'done', 'failed')
+
+
+def _run_check(session, check: str, region: Optional[str]) -> list:
+    """
+    Runs the given check against the given session, using the existing insights.
+
+    :param session: The Session object of the account.
+    :type session: pyawsopstoolkit.session.Session
+    :param check: The name of the check.
+    :type check: str
+    :param region: The region of the check, or None for global (IAM) checks.
+    :type region: str
+    :return: The results of the check, as dictionaries.
+    :rtype: list
+    """
+    from pyawsopstoolkit_insights.ec2 import ElasticIP, NetworkInterface, SecurityGroup, Volume
+    from pyawsopstoolkit_insights.iam import Policy, Role, User
+    from pyawsopstoolkit_insights.report import _to_record
+
+    checks = {
+        'unused_roles': lambda: Role(session=session, trusted=True).unused_roles(),
+        'unused_users': lambda: User(session=session, trusted=True).unused_users(),
+        'unused_policies': lambda: Policy(session=session).unused_policies(),
+        'unused_security_groups': lambda: SecurityGroup(session=session, trusted=True).unused_security_groups(region),
+        'unused_elastic_ips': lambda: ElasticIP(session=session).unused_elastic_ips(region),
+        'unused_network_interfaces': lambda: NetworkInterface(session=session).unused_network_interfaces(region),
+        'unused_volumes': lambda: Volume(session=session).unused_volumes(region)
+    }
+
+    return [_to_record(record) for record in checks[check]()]
+
+
+def _task_id(account: str, region: Optional[str], check: str) -> str:
+    """
+    Returns the identifier of the (account, region, check) shard, which is safe to be used as a file name.
+
+    :param account: The account number.
+    :type account: str
+    :param region: The region, or None for global checks.
+    :type region: str
+    :param check: The name of the check.
+    :type check: str
+    :return: The identifier of the shard.
+    :rtype: str
+    """
+    return f'{account}.{region or "global"}.{check}'
+
+
+def _validate_work_queue(value) -> None:
+    """
+    Validates if the given value implements the work queue interface shared by FileWorkQueue and SQLiteWorkQueue.
+
+    :param value: The value to be validated.
+    :type value: Any
+    """
+    if not all(callable(getattr(value, method, None)) for method in _WORK_QUEUE_METHODS):
+        raise TypeError(f'queue should implement {", ".join(_WORK_QUEUE_METHODS)}.')
+
+
+def _write_json(path: str, value: dict) -> None:
+    """
+    Writes the given value as JSON, atomically replacing the file if it exists.
+
+    :param path: The path of the file.
+    :type path: str
+    :param value: The value to be written.
+    :type value: dict
+    """
+    temp_path = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.{uuid.uuid4().hex}.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as handle:
+        json.dump(value, handle, default=str)
+    os.replace(temp_path, path)
+
+
+@dataclass
+class FileWorkQueue:
+    """
+    A class representing a work queue stored in a local or shared directory, holding one JSON file per task within a
+    directory per status. Tasks are claimed through atomic renames, so that concurrent workers never lease the same
+    task, and expired leases are returned to the queue until max_attempts is reached.
+    """
+
+    path: str
+    max_attempts: Optional[int] = 3
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+        for status in _TASK_STATUSES:
+            os.makedirs(os.path.join(self.path, status), exist_ok=True)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['path']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+        elif field_name in ['max_attempts']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def _file(self, status: str, task_id: str) -> str:
+        """
+        Returns the path of the file of the given task within the given status directory.
+
+        :param status: The status of the task.
+        :type status: str
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :return: The path of the task file.
+        :rtype: str
+        """
+        return os.path.join(self.path, status, f'{task_id}.json')
+
+    def _list(self, status: str) -> list:
+        """
+        Returns the identifiers of the tasks within the given status directory, in order.
+
+        :param status: The status of the tasks.
+        :type status: str
+        :return: The identifiers of the tasks.
+        :rtype: list
+        """
+        return sorted(
+            name[:-len('.json')] for name in os.listdir(os.path.join(self.path, status))
+            if name.endswith('.json') and not name.startswith('.')
+        )
+
+    def _list_claims(self) -> list:
+        """
+        Returns the claim files, along with the identifiers of their tasks.
+
+        :return: The names of the claim files and the identifiers of their tasks.
+        :rtype: list
+        """
+        return [
+            (name, name[1:].rsplit('.', 2)[0]) for name in os.listdir(os.path.join(self.path, 'leased'))
+            if name.startswith('.') and name.endswith('.claim')
+        ]
+
+    @staticmethod
+    def _read(path: str) -> Optional[dict]:
+        """
+        Reads the given task file, if it still exists.
+
+        :param path: The path of the task file.
+        :type path: str
+        :return: The task, if any.
+        :rtype: dict
+        """
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return None
+
+    def _claim(self, status: str, task_id: str) -> Optional[str]:
+        """
+        Claims the given task by atomically renaming its file to a claim file private to the caller, so that no other
+        worker can lease, reclaim or update the task until the claim is released. The claim file is touched, so that a
+        claim left behind by a stopped worker is recovered after the grace period.
+
+        :param status: The current status of the task.
+        :type status: str
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :return: The path of the claim file, or None if the task is no longer within the given status.
+        :rtype: str
+        """
+        claim = os.path.join(self.path, 'leased', f'.{task_id}.{uuid.uuid4().hex}.claim')
+        try:
+            os.rename(self._file(status, task_id), claim)
+        except FileNotFoundError:
+            return None
+        os.utime(claim)
+
+        return claim
+
+    def _release(self, claim: str, task: dict, status: str) -> None:
+        """
+        Releases the given claim, publishing the given task within the given status directory through a single atomic
+        rename of the fully written task file.
+
+        :param claim: The path of the claim file.
+        :type claim: str
+        :param task: The task to be published.
+        :type task: dict
+        :param status: The new status of the task.
+        :type status: str
+        """
+        _write_json(claim, task)
+        os.rename(claim, self._file(status, task.get('id', '')))
+
+    def _recover_claims(self, now: float) -> None:
+        """
+        Returns the tasks of the claims left behind by stopped workers, i.e. older than the grace period, to the
+        pending directory, or fails them once max_attempts is reached. Claims which are not valid JSON are failed,
+        since their task cannot be retried.
+
+        :param now: The current time, in seconds since the epoch.
+        :type now: float
+        """
+        leased = os.path.join(self.path, 'leased')
+        for name, task_id in self._list_claims():
+            path = os.path.join(leased, name)
+            claim = os.path.join(leased, f'.{task_id}.{uuid.uuid4().hex}.claim')
+            try:
+                if os.path.getmtime(path) + _LEASE_GRACE_SECONDS > now:
+                    continue
+                os.rename(path, claim)
+                os.utime(claim)
+            except FileNotFoundError:
+                continue
+
+            try:
+                task = self._read(claim)
+            except ValueError:
+                self._release(
+                    claim, {'id': task_id, 'owner': None, 'lease_expires': None, 'error': 'unreadable task'}, 'failed'
+                )
+                continue
+            if task is None:
+                # The claim was recovered by another worker between the rename and the touch.
+                continue
+
+            task = {**task, 'owner': None, 'lease_expires': None, 'error': 'lease expired'}
+            self._release(claim, task, 'pending' if task.get('attempts', 0) < self.max_attempts else 'failed')
+
+    def _reclaim_expired(self, now: float) -> None:
+        """
+        Returns the tasks whose lease expired to the pending directory, or fails them once max_attempts is reached.
+
+        :param now: The current time, in seconds since the epoch.
+        :type now: float
+        """
+        self._recover_claims(now)
+
+        for task_id in self._list('leased'):
+            task = self._read(self._file('leased', task_id))
+            if task is None or (task.get('lease_expires') or 0) > now:
+                continue
+
+            claim = self._claim('leased', task_id)
+            if claim is None:
+                continue
+
+            # The lease may have been extended between the read and the claim.
+            task = self._read(claim)
+            if (task.get('lease_expires') or 0) > now:
+                os.rename(claim, self._file('leased', task_id))
+                continue
+
+            task = {**task, 'owner': None, 'lease_expires': None, 'error': 'lease expired'}
+            self._release(claim, task, 'pending' if task.get('attempts', 0) < self.max_attempts else 'failed')
+
+    def put(self, tasks: list) -> int:
+        """
+        Adds the given tasks to the queue. Tasks already known to the queue, whatever their status, are skipped so that
+        publishing is idempotent.
+
+        :param tasks: The tasks to be added, each with an id, account, region and check.
+        :type tasks: list
+        :return: The number of tasks added.
+        :rtype: int
+        """
+        known = {task_id for status in _TASK_STATUSES for task_id in self._list(status)}
+        known.update(task_id for _, task_id in self._list_claims())
+        count = 0
+
+        for task in tasks:
+            if task.get('id') in known:
+                continue
+            _write_json(self._file('pending', task.get('id', '')), {
+                **task, 'attempts': 0, 'owner': None, 'lease_expires': None, 'error': None
+            })
+            known.add(task.get('id'))
+            count += 1
+
+        return count
+
+    def lease(self, owner: str, lease_seconds: int) -> Optional[dict]:
+        """
+        Leases the next pending task to the given owner for the given number of seconds.
+
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param lease_seconds: The duration of the lease.
+        :type lease_seconds: int
+        :return: The leased task, if any.
+        :rtype: dict
+        """
+        now = time.time()
+        self._reclaim_expired(now)
+
+        for task_id in self._list('pending'):
+            claim = self._claim('pending', task_id)
+            if claim is None:
+                continue
+
+            task = self._read(claim)
+            task = {**task, 'owner': owner, 'lease_expires': now + lease_seconds, 'attempts': task['attempts'] + 1}
+            self._release(claim, task, 'leased')
+
+            return task
+
+        return None
+
+    def extend(self, task_id: str, owner: str, lease_seconds: int) -> bool:
+        """
+        Extends the lease of the given task by the given number of seconds from now, if it is still leased by the given
+        owner.
+
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param lease_seconds: The duration of the lease.
+        :type lease_seconds: int
+        :return: True if the lease was extended, otherwise False.
+        :rtype: bool
+        """
+        claim = self._claim('leased', task_id)
+        if claim is None:
+            return False
+
+        task = self._read(claim)
+        if task.get('owner') != owner:
+            os.rename(claim, self._file('leased', task_id))
+            return False
+
+        self._release(claim, {**task, 'lease_expires': time.time() + lease_seconds}, 'leased')
+
+        return True
+
+    def complete(self, task_id: str, owner: str, result: list) -> bool:
+        """
+        Records the result of the given task, if it is still leased by the given owner.
+
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param result: The result of the task.
+        :type result: list
+        :return: True if the result was recorded, otherwise False.
+        :rtype: bool
+        """
+        claim = self._claim('leased', task_id)
+        if claim is None:
+            return False
+
+        task = self._read(claim)
+        if task.get('owner') != owner:
+            os.rename(claim, self._file('leased', task_id))
+            return False
+
+        self._release(claim, {**task, 'lease_expires': None, 'error': None, 'result': result}, 'done')
+
+        return True
+
+    def fail(self, task_id: str, owner: str, error: str) -> bool:
+        """
+        Records the failure of the given task, if it is still leased by the given owner. The task is returned to the
+        queue to be retried, unless max_attempts is reached.
+
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param error: The error message.
+        :type error: str
+        :return: True if the failure was recorded, otherwise False.
+        :rtype: bool
+        """
+        claim = self._claim('leased', task_id)
+        if claim is None:
+            return False
+
+        task = self._read(claim)
+        if task.get('owner') != owner:
+            os.rename(claim, self._file('leased', task_id))
+            return False
+
+        status = 'pending' if task.get('attempts', 0) < self.max_attempts else 'failed'
+        self._release(claim, {**task, 'owner': None, 'lease_expires': None, 'error': error}, status)
+
+        return True
+
+    def tasks(self) -> list:
+        """
+        Returns all the tasks of the queue, without their results.
+
+        :return: The tasks, including their status.
+        :rtype: list
+        """
+        tasks = []
+        for status in _TASK_STATUSES:
+            for task_id in self._list(status):
+                task = self._read(self._file(status, task_id))
+                if task is not None:
+                    task.pop('result', None)
+                    tasks.append({**task, 'status': status})
+
+        return tasks
+
+    def results(self) -> Iterator[dict]:
+        """
+        Yields the completed tasks, including their results.
+
+        :return: A generator of completed tasks.
+        :rtype: Iterator[dict]
+        """
+        for task_id in self._list('done'):
+            task = self._read(self._file('done', task_id))
+            if task is not None:
+                yield task
+
+
+@dataclass
+class SQLiteWorkQueue:
+    """
+    A class representing a work queue stored in a SQLite database. Tasks are leased within immediate transactions, so
+    that concurrent workers never lease the same task, and expired leases are returned to the queue until max_attempts
+    is reached.
+    """
+
+    path: str
+    max_attempts: Optional[int] = 3
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS tasks ('
+                'id TEXT PRIMARY KEY, account TEXT, region TEXT, check_name TEXT, status TEXT, attempts INTEGER, '
+                'owner TEXT, lease_expires REAL, error TEXT, result TEXT)'
+            )
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['path']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+        elif field_name in ['max_attempts']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def _connect(self):
+        """
+        Opens a connection to the database in autocommit mode, transactions being managed explicitly. The connection
+        is closed on exit, discarding any transaction left open.
+
+        :return: The database connection.
+        :rtype: sqlite3.Connection
+        """
+        return closing(sqlite3.connect(self.path, timeout=30, isolation_level=None))
+
+    @staticmethod
+    def _to_task(row) -> dict:
+        """
+        Converts the given database row into a task.
+
+        :param row: The database row.
+        :type row: tuple
+        :return: The task.
+        :rtype: dict
+        """
+        task_id, account, region, check, status, attempts, owner, lease_expires, error = row
+
+        return {
+            'id': task_id, 'account': account, 'region': region, 'check': check, 'status': status,
+            'attempts': attempts, 'owner': owner, 'lease_expires': lease_expires, 'error': error
+        }
+
+    def put(self, tasks: list) -> int:
+        """
+        Adds the given tasks to the queue. Tasks already known to the queue, whatever their status, are skipped so that
+        publishing is idempotent.
+
+        :param tasks: The tasks to be added, each with an id, account, region and check.
+        :type tasks: list
+        :return: The number of tasks added.
+        :rtype: int
+        """
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            count = sum(connection.execute(
+                'INSERT OR IGNORE INTO tasks (id, account, region, check_name, status, attempts) '
+                'VALUES (?, ?, ?, ?, \'pending\', 0)',
+                (task.get('id'), task.get('account'), task.get('region'), task.get('check'))
+            ).rowcount for task in tasks)
+            connection.execute('COMMIT')
+
+        return count
+
+    def lease(self, owner: str, lease_seconds: int) -> Optional[dict]:
+        """
+        Leases the next pending task, or the next task whose lease expired, to the given owner for the given number of
+        seconds.
+
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param lease_seconds: The duration of the lease.
+        :type lease_seconds: int
+        :return: The leased task, if any.
+        :rtype: dict
+        """
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            connection.execute(
+                'UPDATE tasks SET status = \'failed\', owner = NULL, lease_expires = NULL, error = \'lease expired\' '
+                'WHERE status = \'leased\' AND lease_expires <= ? AND attempts >= ?', (now, self.max_attempts)
+            )
+            row = connection.execute(
+                'SELECT id FROM tasks WHERE status = \'pending\' OR (status = \'leased\' AND lease_expires <= ?) '
+                'ORDER BY id LIMIT 1', (now,)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    'UPDATE tasks SET status = \'leased\', owner = ?, lease_expires = ?, attempts = attempts + 1 '
+                    'WHERE id = ?', (owner, now + lease_seconds, row[0])
+                )
+                row = connection.execute(
+                    'SELECT id, account, region, check_name, status, attempts, owner, lease_expires, error '
+                    'FROM tasks WHERE id = ?', (row[0],)
+                ).fetchone()
+            connection.execute('COMMIT')
+
+        return self._to_task(row) if row is not None else None
+
+    def extend(self, task_id: str, owner: str, lease_seconds: int) -> bool:
+        """
+        Extends the lease of the given task by the given number of seconds from now, if it is still leased by the given
+        owner.
+
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param lease_seconds: The duration of the lease.
+        :type lease_seconds: int
+        :return: True if the lease was extended, otherwise False.
+        :rtype: bool
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                'UPDATE tasks SET lease_expires = ? WHERE id = ? AND status = \'leased\' AND owner = ?',
+                (time.time() + lease_seconds, task_id, owner)
+            ).rowcount == 1
+
+    def complete(self, task_id: str, owner: str, result: list) -> bool:
+        """
+        Records the result of the given task, if it is still leased by the given owner.
+
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param result: The result of the task.
+        :type result: list
+        :return: True if the result was recorded, otherwise False.
+        :rtype: bool
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                'UPDATE tasks SET status = \'done\', lease_expires = NULL, error = NULL, result = ? '
+                'WHERE id = ? AND status = \'leased\' AND owner = ?',
+                (json.dumps(result, default=str), task_id, owner)
+            ).rowcount == 1
+
+    def fail(self, task_id: str, owner: str, error: str) -> bool:
+        """
+        Records the failure of the given task, if it is still leased by the given owner. The task is returned to the
+        queue to be retried, unless max_attempts is reached.
+
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :param owner: The identifier of the worker.
+        :type owner: str
+        :param error: The error message.
+        :type error: str
+        :return: True if the failure was recorded, otherwise False.
+        :rtype: bool
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                'UPDATE tasks SET status = CASE WHEN attempts < ? THEN \'pending\' ELSE \'failed\' END, '
+                'owner = NULL, lease_expires = NULL, error = ? WHERE id = ? AND status = \'leased\' AND owner = ?',
+                (self.max_attempts, error, task_id, owner)
+            ).rowcount == 1
+
+    def tasks(self) -> list:
+        """
+        Returns all the tasks of the queue, without their results.
+
+        :return: The tasks, including their status.
+        :rtype: list
+        """
+        with self._connect() as connection:
+            return [self._to_task(row) for row in connection.execute(
+                'SELECT id, account, region, check_name, status, attempts, owner, lease_expires, error '
+                'FROM tasks ORDER BY id'
+            ).fetchall()]
+
+    def results(self) -> Iterator[dict]:
+        """
+        Yields the completed tasks, including their results.
+
+        :return: A generator of completed tasks.
+        :rtype: Iterator[dict]
+        """
+        with self._connect() as connection:
+            for row in connection.execute(
+                    'SELECT id, account, region, check_name, status, attempts, owner, lease_expires, error, result '
+                    'FROM tasks WHERE status = \'done\' ORDER BY id'
+            ):
+                yield {**self._to_task(row[:-1]), 'result': json.loads(row[-1])}
+
+
+@dataclass
+class Coordinator:
+    """
+    A class representing the coordinator of a distributed scan. The scan is split into (account, region, check)
+    shards published to a work queue, which are processed by Workers on any number of nodes, and the results of the
+    shards are merged into one combined result.
+    """
+
+    queue: object
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['queue']:
+            _validate_work_queue(field_value)
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def publish(self, accounts: list, regions: list, checks: Optional[list] = None) -> int:
+        """
+        Splits the scan into shards and publishes them to the work queue. Regional checks are sharded per (account,
+        region), whereas global (IAM) checks are sharded per account only. Publishing is idempotent.
+
+        :param accounts: The account numbers to be scanned.
+        :type accounts: list
+        :param regions: The regions to be scanned.
+        :type regions: list
+        :param checks: The checks to be run. Defaults to all supported checks.
+        :type checks: list
+        :return: The number of shards published.
+        :rtype: int
+        """
+        from pyawsopstoolkit_validators.region_validator import region as region_val
+
+        _validate_type(accounts, list, 'accounts should be a list of strings.')
+        _validate_type(regions, list, 'regions should be a list of strings.')
+        _validate_type(checks, (list, type(None)), 'checks should be a list of strings.')
+
+        checks = list(_CHECKS) if checks is None else checks
+        unsupported = set(checks) - set(_CHECKS)
+        if unsupported:
+            raise ValueError(f'unsupported checks: {", ".join(sorted(unsupported))}.')
+        for _region in regions:
+            region_val(_region, True)
+
+        tasks = [
+            {'id': _task_id(account, region, check), 'account': account, 'region': region, 'check': check}
+            for account in accounts
+            for check in checks
+            for region in (regions if _CHECKS[check] else [None])
+        ]
+
+        return self.queue.put(tasks)
+
+    def status(self) -> dict:
+        """
+        Returns the number of shards per status.
+
+        :return: The number of pending, leased, done and failed shards.
+        :rtype: dict
+        """
+        counts = dict.fromkeys(_TASK_STATUSES, 0)
+        for task in self.queue.tasks():
+            counts[task.get('status')] = counts.get(task.get('status'), 0) + 1
+
+        return counts
+
+    def merge(self) -> dict:
+        """
+        Merges the results of the completed shards into one combined result.
+
+        :return: The combined result: results maps each check to its records, each holding the account and region of
+        its shard along with the resource; failed lists the shards which failed after max_attempts; complete indicates
+        whether shards were published and every shard is done.
+        :rtype: dict
+        """
+        results = {}
+        for task in self.queue.results():
+            results.setdefault(task.get('check'), []).extend(
+                {'account': task.get('account'), 'region': task.get('region'), 'resource': resource}
+                for resource in task.get('result', [])
+            )
+
+        tasks = self.queue.tasks()
+
+        return {
+            'results': results,
+            'failed': [task for task in tasks if task.get('status') == 'failed'],
+            'complete': bool(tasks) and all(task.get('status') == 'done' for task in tasks)
+        }
+
+
+@dataclass
+class Worker:
+    """
+    A class representing a worker of a distributed scan, leasing shards from the work queue and running the existing
+    insights against the session of the shard account. The lease of a shard is renewed every third of lease_seconds
+    while the shard is processed, so that long-running shards are not handed to another worker. Failed shards are
+    retried by any worker until the max_attempts of the work queue is reached.
+    """
+
+    queue: object
+    session_factory: Callable
+    worker_id: Optional[str] = None
+    lease_seconds: Optional[int] = 900
+
+    def __post_init__(self):
+        if self.worker_id is None:
+            self.worker_id = f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['queue']:
+            _validate_work_queue(field_value)
+        elif field_name in ['session_factory']:
+            if not callable(field_value):
+                raise TypeError(f'{field_name} should be callable.')
+        elif field_name in ['worker_id']:
+            _validate_type(field_value, (str, type(None)), f'{field_name} should be a string.')
+        elif field_name in ['lease_seconds']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def _heartbeat(self, task_id: str, stopped: threading.Event) -> None:
+        """
+        Renews the lease of the given task every third of lease_seconds until stopped, or until the lease is lost.
+
+        :param task_id: The identifier of the task.
+        :type task_id: str
+        :param stopped: The event set once the task is processed.
+        :type stopped: threading.Event
+        """
+        while not stopped.wait(self.lease_seconds / 3):
+            if not self.queue.extend(task_id, self.worker_id, self.lease_seconds):
+                return
+
+    def run_once(self) -> bool:
+        """
+        Leases and processes a single shard. The session of the shard is built by calling session_factory with the
+        account number of the shard.
+
+        :return: True if a shard was processed, otherwise False if no shard is available.
+        :rtype: bool
+        """
+        task = self.queue.lease(self.worker_id, self.lease_seconds)
+        if task is None:
+            return False
+
+        stopped = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task.get('id'), stopped), daemon=True)
+        heartbeat.start()
+        try:
+            result = _run_check(self.session_factory(task.get('account')), task.get('check'), task.get('region'))
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+        else:
+            error = None
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+        if error is None:
+            self.queue.complete(task.get('id'), self.worker_id, result)
+        else:
+            self.queue.fail(task.get('id'), self.worker_id, error)
+
+        return True
+
+    def run(self, max_tasks: Optional[int] = None) -> int:
+        """
+        Processes shards until no shard is available, or until max_tasks shards are processed.
+
+        :param max_tasks: The maximum number of shards to be processed. Defaults to no limit.
+        :type max_tasks: int
+        :return: The number of shards processed.
+        :rtype: int
+        """
+        _validate_type(max_tasks, (int, type(None)), 'max_tasks should be an integer.')
+
+        count = 0
+        while (max_tasks is None or count < max_tasks) and self.run_once():
+            count += 1
+
+        return count
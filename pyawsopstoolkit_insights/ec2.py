@@ -1,16 +1,243 @@
+import heapq
 from dataclasses import dataclass
+from typing import Iterator, Optional, Union
 
-from pyawsopstoolkit_insights.__validations__ import _validate_type
+from pyawsopstoolkit_insights.__converters__ import _to_ec2_security_group
+from pyawsopstoolkit_insights.__fetch__ import _fetch_regions, _paginate
+from pyawsopstoolkit_insights.__validations__ import _validate_top_unused, _validate_type
+
+BOTO3_CLIENT = 'ec2'
+
+_TOP_UNUSED_SECURITY_GROUPS_BY = ('references', 'ip_permissions', 'name')
+
+
+def _list_unused_addresses(client, region) -> list:
+    """
+    Utilizing boto3 EC2, this method retrieves the Elastic IP addresses of the region which are not associated with
+    any instance or ENI (Elastic Network Interface). DescribeAddresses is not paginated and offers no filter for
+    unassociated addresses, hence a single call is made and the association is verified on the response. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/client/describe_addresses.html
+
+    :param client: The boto3 EC2 client of the region.
+    :type client: botocore.client.EC2
+    :param region: The region of the client.
+    :type region: str
+    :return: A list of unassociated Elastic IP addresses, including the Region key.
+    :rtype: list
+    """
+    return [
+        {**address, 'Region': region} for address in client.describe_addresses().get('Addresses', [])
+        if not address.get('AssociationId') and not address.get('InstanceId')
+        and not address.get('NetworkInterfaceId')
+    ]
+
+
+def _list_unused_network_interfaces(client, region) -> list:
+    """
+    Utilizing boto3 EC2, this method retrieves the ENIs (Elastic Network Interfaces) of the region which are not
+    attached, filtering on the available status server side. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/paginator/DescribeNetworkInterfaces.html
+
+    :param client: The boto3 EC2 client of the region.
+    :type client: botocore.client.EC2
+    :param region: The region of the client.
+    :type region: str
+    :return: A list of available ENIs, including the Region key.
+    :rtype: list
+    """
+    return [
+        {**network_interface, 'Region': region} for network_interface in _paginate(
+            client, 'describe_network_interfaces', 'NetworkInterfaces',
+            Filters=[{'Name': 'status', 'Values': ['available']}]
+        )
+    ]
+
+
+def _list_unused_security_groups(client, region) -> list:
+    """
+    Utilizing boto3 EC2, this method retrieves the security groups of the region which are not associated with any ENI
+    (Elastic Network Interface). The ENIs of the region are listed once to build the set of security groups in use,
+    instead of verifying every security group separately. Each security group holds the number of rules of the other
+    security groups of the region referencing it, under the ReferenceCount key. References:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/paginator/DescribeNetworkInterfaces.html
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/paginator/DescribeSecurityGroups.html
+
+    :param client: The boto3 EC2 client of the region.
+    :type client: botocore.client.EC2
+    :param region: The region of the client.
+    :type region: str
+    :return: A list of unused security groups, including the Region and ReferenceCount keys.
+    :rtype: list
+    """
+    security_groups_in_use = {
+        group.get('GroupId', '')
+        for network_interface in _paginate(client, 'describe_network_interfaces', 'NetworkInterfaces')
+        for group in network_interface.get('Groups', [])
+    }
+
+    references = {}
+    unused_security_groups = []
+    for sg in _paginate(client, 'describe_security_groups', 'SecurityGroups'):
+        for permission in sg.get('IpPermissions', []) + sg.get('IpPermissionsEgress', []):
+            for group_id in {pair.get('GroupId') for pair in permission.get('UserIdGroupPairs', [])}:
+                if group_id and group_id != sg.get('GroupId'):
+                    references[group_id] = references.get(group_id, 0) + 1
+        if sg.get('GroupId', '') not in security_groups_in_use:
+            unused_security_groups.append({**sg, 'Region': region})
+
+    return [{**sg, 'ReferenceCount': references.get(sg.get('GroupId'), 0)} for sg in unused_security_groups]
+
+
+def _list_unused_volumes(client, region) -> list:
+    """
+    Utilizing boto3 EC2, this method retrieves the EBS volumes of the region which are not attached to any instance,
+    filtering on the available status server side. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/paginator/DescribeVolumes.html
+
+    :param client: The boto3 EC2 client of the region.
+    :type client: botocore.client.EC2
+    :param region: The region of the client.
+    :type region: str
+    :return: A list of available EBS volumes, including the Region key.
+    :rtype: list
+    """
+    return [
+        {**volume, 'Region': region} for volume in _paginate(
+            client, 'describe_volumes', 'Volumes', Filters=[{'Name': 'status', 'Values': ['available']}]
+        )
+    ]
+
+
+def _resolve_regions(session, region) -> list:
+    """
+    Returns the list of regions to be fetched, defaulting to the region of the session.
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :param region: The region or list of regions, if any.
+    :type region: str | list
+    :return: The list of regions.
+    :rtype: list
+    """
+    from pyawsopstoolkit_validators.region_validator import region as region_val
+
+    _validate_type(region, Union[str, list, None], 'region should be a string or list of strings.')
+
+    if region is None:
+        regions = [session.region_code]
+    elif isinstance(region, str):
+        regions = [region]
+    else:
+        regions = region
+
+    for _region in regions:
+        region_val(_region, True)
+
+    return regions
+
+
+@dataclass
+class ElasticIP:
+    """
+    A class representing insights related with EC2 Elastic IP addresses.
+    """
+    from pyawsopstoolkit.session import Session
+
+    session: Session
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        from pyawsopstoolkit.session import Session
+
+        field_value = getattr(self, field_name)
+        if field_name in ['session']:
+            _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def unused_elastic_ips(self, region: Optional[Union[str, list]] = None) -> list:
+        """
+        Returns a list of Elastic IP addresses not associated with any instance or ENI (Elastic Network Interface).
+        Regions are fetched in parallel.
+
+        :param region: The region or list of regions to search. Defaults to the region of the session.
+        :type region: str | list
+        :return: A list of unused Elastic IP addresses, as boto3 dictionaries including the Region key.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        regions = _resolve_regions(self.session, region)
+
+        try:
+            return _fetch_regions(self.session, BOTO3_CLIENT, regions, _list_unused_addresses)
+        except ClientError as e:
+            raise AdvanceSearchError('unused_elastic_ips', e)
+
+
+@dataclass
+class NetworkInterface:
+    """
+    A class representing insights related with EC2 ENIs (Elastic Network Interfaces).
+    """
+    from pyawsopstoolkit.session import Session
+
+    session: Session
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        from pyawsopstoolkit.session import Session
+
+        field_value = getattr(self, field_name)
+        if field_name in ['session']:
+            _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def unused_network_interfaces(self, region: Optional[Union[str, list]] = None) -> list:
+        """
+        Returns a list of ENIs (Elastic Network Interfaces) which are not attached. Regions are fetched in parallel,
+        with the status filter applied server side.
+
+        :param region: The region or list of regions to search. Defaults to the region of the session.
+        :type region: str | list
+        :return: A list of unused ENIs, as boto3 dictionaries including the Region key.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        regions = _resolve_regions(self.session, region)
+
+        try:
+            return _fetch_regions(self.session, BOTO3_CLIENT, regions, _list_unused_network_interfaces)
+        except ClientError as e:
+            raise AdvanceSearchError('unused_network_interfaces', e)
 
 
 @dataclass
 class SecurityGroup:
     """
-    A class representing insights related with EC2 security groups.
+    A class representing insights related with EC2 security groups. When trusted is set, the returned
+    pyawsopstoolkit_models objects are built from the AWS responses without per-attribute validation.
     """
     from pyawsopstoolkit.session import Session
 
     session: Session
+    trusted: Optional[bool] = False
 
     def __post_init__(self):
         for field_name, field_value in self.__dataclass_fields__.items():
@@ -22,22 +249,159 @@ class SecurityGroup:
         field_value = getattr(self, field_name)
         if field_name in ['session']:
             _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+        elif field_name in ['trusted']:
+            _validate_type(field_value, bool, f'{field_name} should be a boolean.')
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
             self.__validate__(key)
 
-    def unused_security_groups(self) -> list:
+    def _convert_security_groups(self, security_groups, account=None) -> Iterator:
         """
-        Returns a list of unused EC2 security groups.
+        Converts the given boto3 EC2 security group dictionaries into unused pyawsopstoolkit_models EC2 security
+        groups, without validation if trusted. Unless provided, the account is resolved only once, and only if there is
+        at least one security group.
+
+        :param security_groups: The boto3 EC2 security group dictionaries, including the Region key.
+        :type security_groups: Iterable
+        :param account: The account of the security groups, if already resolved.
+        :type account: pyawsopstoolkit.account.Account
+        :return: A generator of EC2 security groups.
+        :rtype: Iterator[pyawsopstoolkit_models.ec2.security_group.SecurityGroup]
         """
         from pyawsopstoolkit_advsearch.ec2 import SecurityGroup
 
-        sg_object = SecurityGroup(self.session)
-        security_groups = sg_object.search_security_groups(include_usage=True, in_use=False)
+        for sg in security_groups:
+            if account is None:
+                account = self.session.get_account()
+            if self.trusted:
+                security_group = _to_ec2_security_group(account, sg.get('Region', ''), sg)
+                object.__setattr__(security_group, 'in_use', False)
+            else:
+                security_group = SecurityGroup._convert_to_ec2_security_group(account, sg.get('Region', ''), sg)
+                security_group.in_use = False
+            yield security_group
+
+    def _list_unused_security_groups(self, region: Optional[Union[str, list]]) -> list:
+        """
+        Returns the unused EC2 security groups of the specified regions as boto3 dictionaries. Regions are fetched in
+        parallel.
+
+        :param region: The region or list of regions to search. Defaults to the region of the session.
+        :type region: str | list
+        :return: A list of unused EC2 security groups, including the Region key.
+        :rtype: list
+        """
+        return _fetch_regions(
+            self.session, BOTO3_CLIENT, _resolve_regions(self.session, region), _list_unused_security_groups
+        )
+
+    def unused_security_groups(self, region: Optional[Union[str, list]] = None) -> list:
+        """
+        Returns a list of unused EC2 security groups, i.e. security groups not associated with any ENI (Elastic Network
+        Interface).
+
+        :param region: The region or list of regions to search. Defaults to the region of the session.
+        :type region: str | list
+        :return: A list of unused EC2 security groups.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        try:
+            return list(self._convert_security_groups(self._list_unused_security_groups(region)))
+        except ClientError as e:
+            raise AdvanceSearchError('unused_security_groups', e)
+
+    def top_unused(
+            self,
+            k: Optional[int] = 50,
+            by: Optional[str] = 'references',
+            region: Optional[Union[str, list]] = None
+    ) -> list:
+        """
+        Returns the top k unused EC2 security groups, selected through a bounded heap so that only k security groups
+        are converted. EC2 exposes neither creation nor last used dates for security groups, hence they cannot be
+        ranked by staleness; the ranking is based on their rules instead.
+
+        :param k: The number of EC2 security groups to be returned. Defaults to 50.
+        :type k: int
+        :param by: The ranking criteria: 'references' ranks the security groups referenced by the fewest rules of other
+        security groups first, i.e. those deletable without revoking any rule; 'ip_permissions' ranks the security
+        groups with the most inbound rules first; 'name' ranks the security groups by name. Ties are broken by security
+        group ID. Defaults to 'references'.
+        :type by: str
+        :param region: The region or list of regions to search. Defaults to the region of the session.
+        :type region: str | list
+        :return: A list of at most k unused EC2 security groups.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        _validate_top_unused(k, by, _TOP_UNUSED_SECURITY_GROUPS_BY)
+
+        if by == 'references':
+            def _key(_sg):
+                return _sg.get('ReferenceCount', 0), _sg.get('GroupId', '')
+        elif by == 'ip_permissions':
+            def _key(_sg):
+                return -len(_sg.get('IpPermissions', [])), _sg.get('GroupId', '')
+        else:
+            def _key(_sg):
+                return _sg.get('GroupName', ''), _sg.get('GroupId', '')
+
+        try:
+            return list(self._convert_security_groups(
+                heapq.nsmallest(k, self._list_unused_security_groups(region), key=_key)
+            ))
+        except ClientError as e:
+            raise AdvanceSearchError('top_unused', e)
+
+
+@dataclass
+class Volume:
+    """
+    A class representing insights related with EC2 EBS volumes.
+    """
+    from pyawsopstoolkit.session import Session
+
+    session: Session
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        from pyawsopstoolkit.session import Session
+
+        field_value = getattr(self, field_name)
+        if field_name in ['session']:
+            _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def unused_volumes(self, region: Optional[Union[str, list]] = None) -> list:
+        """
+        Returns a list of EBS volumes which are not attached to any instance. Regions are fetched in parallel, with the
+        status filter applied server side.
+
+        :param region: The region or list of regions to search. Defaults to the region of the session.
+        :type region: str | list
+        :return: A list of unused EBS volumes, as boto3 dictionaries including the Region key.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
 
-        if security_groups is None:
-            return []
+        regions = _resolve_regions(self.session, region)
 
-        return security_groups
+        try:
+            return _fetch_regions(self.session, BOTO3_CLIENT, regions, _list_unused_volumes)
+        except ClientError as e:
+            raise AdvanceSearchError('unused_volumes', e)
@@ -1,19 +1,728 @@
+import hashlib
+import heapq
+import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import Callable, Iterator, Optional, Union
 
-from pyawsopstoolkit_insights.__validations__ import _validate_type
+from pyawsopstoolkit_insights.__converters__ import _to_iam_role, _to_iam_user
+from pyawsopstoolkit_insights.__fetch__ import _get_client, _project, _single_flight, _spool
+from pyawsopstoolkit_insights.__globals__ import CHUNK_SIZE, MAX_MEMORY, MAX_WORKERS
+from pyawsopstoolkit_insights.__validations__ import _validate_chunked, _validate_top_unused, _validate_type
+
+BOTO3_CLIENT = 'iam'
+
+_ROLE_IDENTITY_KEYS = ('RoleName', 'RoleId', 'Arn', 'MaxSessionDuration')
+# Maps the pyawsopstoolkit_models IAM role fields to the boto3 response key, and whether get_role is required to
+# retrieve it since list_roles excludes PermissionsBoundary, RoleLastUsed and Tags.
+_ROLE_FIELDS = {
+    'path': ('Path', False),
+    'created_date': ('CreateDate', False),
+    'assume_role_policy_document': ('AssumeRolePolicyDocument', False),
+    'description': ('Description', False),
+    'permissions_boundary': ('PermissionsBoundary', True),
+    'last_used': ('RoleLastUsed', True),
+    'tags': ('Tags', True)
+}
+
+_USER_IDENTITY_KEYS = ('UserName', 'UserId', 'Arn')
+# Maps the pyawsopstoolkit_models IAM user fields to the boto3 response key, and the detail call required to retrieve
+# it, if any. Detail calls are made in the order listed within _USER_DETAIL_CALLS.
+_USER_FIELDS = {
+    'path': ('Path', None),
+    'created_date': ('CreateDate', None),
+    'password_last_used_date': ('PasswordLastUsed', None),
+    'permissions_boundary': ('PermissionsBoundary', 'get_user'),
+    'tags': ('Tags', 'get_user'),
+    'login_profile': ('LoginProfile', 'get_login_profile'),
+    'access_keys': ('AccessKeys', 'list_access_keys')
+}
+_USER_DETAIL_CALLS = ('get_user', 'get_login_profile', 'list_access_keys')
+
+# The keys retained from each get_account_authorization_details list; inline and managed policy documents are dropped.
+_AUTHORIZATION_DETAILS_KEYS = {
+    'Policies': (
+        'PolicyName', 'PolicyId', 'Arn', 'Path', 'DefaultVersionId', 'AttachmentCount',
+        'PermissionsBoundaryUsageCount', 'IsAttachable', 'Description', 'CreateDate', 'UpdateDate'
+    ),
+    'RoleDetailList': (
+        'RoleName', 'RoleId', 'Arn', 'Path', 'CreateDate', 'RoleLastUsed', 'AttachedManagedPolicies',
+        'PermissionsBoundary'
+    ),
+    'UserDetailList': (
+        'UserName', 'UserId', 'Arn', 'Path', 'CreateDate', 'GroupList', 'AttachedManagedPolicies', 'PermissionsBoundary'
+    ),
+    'GroupDetailList': ('GroupName', 'GroupId', 'Arn', 'Path', 'AttachedManagedPolicies')
+}
+
+_UNUSED_ROLES_FIELDS = ('path', 'created_date', 'last_used')
+_UNUSED_USERS_FIELDS = ('created_date', 'password_last_used_date', 'login_profile', 'access_keys')
+
+_TOP_UNUSED_ROLES_BY = ('last_used', 'created_date')
+_TOP_UNUSED_USERS_BY = ('last_activity', 'created_date')
+
+_MAX_PAGE_SIZE = 1000  # The maximum number of items per page supported by the IAM list operations.
+
+_TRUST_POLICY_RULES = ('external_account', 'wildcard_principal', 'missing_external_id')
+# The actions assuming a role, lowercased, against which the (wildcard) actions of the trust policy are matched.
+_TRUST_POLICY_ACTIONS = ('sts:assumerole', 'sts:assumerolewithsaml', 'sts:assumerolewithwebidentity')
+# Condition keys restricting a wildcard principal to known principals, in which case it is not reported.
+_TRUST_POLICY_RESTRICTING_KEYS = frozenset({
+    'aws:principalorgid', 'aws:principalorgpaths', 'aws:principalaccount', 'aws:principalarn', 'aws:sourceaccount',
+    'aws:sourcearn', 'aws:sourceowner'
+})
+# Condition operators, lowercased, matching a condition key against specific values. Negated, Null and IfExists
+# operators are excluded, as well as the ForAllValues qualifier, since they match requests lacking the key.
+_TRUST_POLICY_RESTRICTING_OPERATORS = frozenset({
+    'stringequals', 'stringequalsignorecase', 'stringlike', 'arnequals', 'arnlike'
+})
+# Compiled trust policies, keyed by the SHA-256 digest of the canonical document. Bounded by
+# _TRUST_POLICY_CACHE_SIZE, evicting the oldest entries first.
+_TRUST_POLICY_CACHE = {}
+_TRUST_POLICY_CACHE_LOCK = threading.Lock()
+_TRUST_POLICY_CACHE_SIZE = 4096
+
+
+def _is_no_such_entity(error) -> bool:
+    """
+    Verifies if the given botocore ClientError represents a missing IAM entity.
+
+    :param error: The botocore ClientError.
+    :type error: botocore.exceptions.ClientError
+    :return: True if the error code is NoSuchEntity, otherwise False.
+    :rtype: bool
+    """
+    return error.response.get('Error', {}).get('Code', '') == 'NoSuchEntity'
+
+
+def _get_access_key_last_used(client, access_key_id) -> dict:
+    """
+    Utilizing boto3 IAM, this method retrieves the last used information of the specified IAM user access key.
+    Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/client/get_access_key_last_used.html
+
+    :param client: The boto3 IAM client.
+    :type client: botocore.client.IAM
+    :param access_key_id: The ID of the IAM user access key.
+    :type access_key_id: str
+    :return: Details of the IAM user access key last used.
+    :rtype: dict
+    """
+    return client.get_access_key_last_used(AccessKeyId=access_key_id)
+
+
+def _get_account_authorization_details(session, filters) -> dict:
+    """
+    Utilizing boto3 IAM, this method retrieves the IAM policies, roles, users and groups of the account in a single
+    paginated pass, retaining only the keys listed within _AUTHORIZATION_DETAILS_KEYS. Concurrent identical retrievals
+    are coalesced, hence the returned dictionary should not be modified. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/paginator/GetAccountAuthorizationDetails.html
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :param filters: The entity types to be retrieved, e.g. 'LocalManagedPolicy', 'Role', 'User' and 'Group'.
+    :type filters: list
+    :return: A dictionary containing the Policies, RoleDetailList, UserDetailList and GroupDetailList lists.
+    :rtype: dict
+    """
+    def _fetch():
+        client = _get_client(session, BOTO3_CLIENT)
+        details = {key: [] for key in _AUTHORIZATION_DETAILS_KEYS}
+
+        for page in client.get_paginator('get_account_authorization_details').paginate(Filter=list(filters)):
+            for key, keys in _AUTHORIZATION_DETAILS_KEYS.items():
+                details[key].extend(_project(item, keys) for item in page.get(key, []))
+
+        return details
+
+    return _single_flight(session, (BOTO3_CLIENT, None, 'get_account_authorization_details', tuple(filters)), _fetch)
+
+
+def _get_login_profile(client, user_name) -> dict:
+    """
+    Utilizing boto3 IAM, this method retrieves the login profile of the specified IAM user. An empty dictionary is
+    returned if the IAM user does not have a login profile. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/client/get_login_profile.html
+
+    :param client: The boto3 IAM client.
+    :type client: botocore.client.IAM
+    :param user_name: The name of the IAM user.
+    :type user_name: str
+    :return: Details of the IAM user login profile.
+    :rtype: dict
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        return client.get_login_profile(UserName=user_name).get('LoginProfile', {})
+    except ClientError as e:
+        if _is_no_such_entity(e):
+            return {}
+        raise e
+
+
+def _get_role(client, role_name) -> Optional[dict]:
+    """
+    Utilizing boto3 IAM, this method retrieves comprehensive details of the specified IAM role. None is returned if
+    the IAM role no longer exists. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/client/get_role.html
+
+    :param client: The boto3 IAM client.
+    :type client: botocore.client.IAM
+    :param role_name: The name of the IAM role.
+    :type role_name: str
+    :return: Details of the IAM role.
+    :rtype: dict
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        return client.get_role(RoleName=role_name).get('Role', {})
+    except ClientError as e:
+        if _is_no_such_entity(e):
+            return None
+        raise e
+
+
+def _get_user(client, user_name) -> Optional[dict]:
+    """
+    Utilizing boto3 IAM, this method retrieves comprehensive details of the specified IAM user. None is returned if
+    the IAM user no longer exists. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/client/get_user.html
+
+    :param client: The boto3 IAM client.
+    :type client: botocore.client.IAM
+    :param user_name: The name of the IAM user.
+    :type user_name: str
+    :return: Details of the IAM user.
+    :rtype: dict
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        return client.get_user(UserName=user_name).get('User', {})
+    except ClientError as e:
+        if _is_no_such_entity(e):
+            return None
+        raise e
+
+
+def _list_access_keys(client, user_name) -> list:
+    """
+    Utilizing boto3 IAM, this method retrieves a list of all access keys associated with the specified IAM user.
+    Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/paginator/ListAccessKeys.html
+
+    :param client: The boto3 IAM client.
+    :type client: botocore.client.IAM
+    :param user_name: The name of the IAM user.
+    :type user_name: str
+    :return: A list of IAM user access keys.
+    :rtype: list
+    """
+    access_keys = []
+
+    for page in client.get_paginator('list_access_keys').paginate(UserName=user_name):
+        access_keys.extend(page.get('AccessKeyMetadata', []))
+
+    return access_keys
+
+
+def _cutoff_date(no_of_days: int) -> datetime:
+    """
+    Returns the timezone naive cutoff date for the specified number of days. A date is within the specified number of
+    days, i.e. (today - date).days <= no_of_days, if and only if it is after the cutoff date, so the cutoff is computed
+    once per evaluation and each timestamp costs a single comparison.
+
+    :param no_of_days: The number of days (integer).
+    :type no_of_days: int
+    :return: The cutoff date.
+    :rtype: datetime
+    """
+    return datetime.today().replace(tzinfo=None) - timedelta(days=no_of_days + 1)
+
+
+def _is_recent(value: datetime, cutoff_date: datetime) -> bool:
+    """
+    Verifies if the given datetime is after the given cutoff date, ignoring timezone information.
+
+    :param value: The datetime to be verified.
+    :type value: datetime
+    :param cutoff_date: The timezone naive cutoff date, as returned by _cutoff_date.
+    :type cutoff_date: datetime
+    :return: True if the datetime is after the cutoff date, otherwise False.
+    :rtype: bool
+    """
+    return value.replace(tzinfo=None) > cutoff_date
+
+
+def _naive(value: Optional[datetime]) -> datetime:
+    """
+    Returns the given datetime without timezone information, or datetime.min if no datetime is provided, so that
+    missing dates sort as the oldest.
+
+    :param value: The datetime to be converted.
+    :type value: datetime
+    :return: The timezone naive datetime.
+    :rtype: datetime
+    """
+    return value.replace(tzinfo=None) if value is not None else datetime.min
+
+
+def _role_is_excluded(role: dict, cutoff_date: datetime, include_newly_created: bool) -> bool:
+    """
+    Verifies if the given IAM role cannot be unused, either because it is an AWS service role or because it was
+    created within the specified number of days and newly created roles are not included.
+
+    :param role: The boto3 IAM role dictionary.
+    :type role: dict
+    :param cutoff_date: The timezone naive cutoff date, as returned by _cutoff_date.
+    :type cutoff_date: datetime
+    :param include_newly_created: A flag indicating whether to include newly created IAM roles.
+    :type include_newly_created: bool
+    :return: True if the IAM role cannot be unused, otherwise False.
+    :rtype: bool
+    """
+    if re.search(r'/aws-service-role/', role.get('Path', ''), re.IGNORECASE):
+        return True
+
+    if include_newly_created:
+        return False
+
+    return _is_recent(role.get('CreateDate'), cutoff_date)
+
+
+def _role_is_unused(role: dict, cutoff_date: datetime) -> bool:
+    """
+    Verifies if the given IAM role has not been used within the specified number of days.
+
+    :param role: The boto3 IAM role dictionary, including RoleLastUsed.
+    :type role: dict
+    :param cutoff_date: The timezone naive cutoff date, as returned by _cutoff_date.
+    :type cutoff_date: datetime
+    :return: True if the IAM role is unused, otherwise False.
+    :rtype: bool
+    """
+    _last_used_date = _role_last_used_date(role)
+    if _last_used_date is None:
+        return True
+
+    return not _is_recent(_last_used_date, cutoff_date)
+
+
+def _role_last_used_date(role: dict) -> Optional[datetime]:
+    """
+    Returns the last used date of the given IAM role.
+
+    :param role: The boto3 IAM role dictionary.
+    :type role: dict
+    :return: The last used date, if any.
+    :rtype: datetime
+    """
+    return role.get('RoleLastUsed', {}).get('LastUsedDate', None)
+
+
+def _allows_assume_role(statement: dict) -> bool:
+    """
+    Verifies if the given trust policy statement applies to any action assuming the role. Actions are matched case
+    insensitively, including wildcards such as 'sts:Assume*', and NotAction applies to every action it does not match.
+    A statement without Action nor NotAction is considered to apply.
+
+    :param statement: The trust policy statement.
+    :type statement: dict
+    :return: True if the statement applies to any action assuming the role, otherwise False.
+    :rtype: bool
+    """
+    def _matches(patterns, action):
+        patterns = patterns if isinstance(patterns, list) else [patterns]
+        return any(fnmatchcase(action, str(pattern).lower()) for pattern in patterns)
+
+    if 'Action' in statement:
+        return any(_matches(statement.get('Action'), action) for action in _TRUST_POLICY_ACTIONS)
+    if 'NotAction' in statement:
+        return not all(_matches(statement.get('NotAction'), action) for action in _TRUST_POLICY_ACTIONS)
+
+    return True
+
+
+def _restricted_keys(condition: dict) -> frozenset:
+    """
+    Returns the lowercased condition keys of the given statement condition which are matched against specific values
+    by a positive-match operator, optionally qualified by ForAnyValue. Keys matched against wildcard-only values, e.g.
+    '*', are not restricted.
+
+    :param condition: The Condition element of the statement.
+    :type condition: dict
+    :return: The restricted condition keys.
+    :rtype: frozenset
+    """
+    keys = set()
+    for operator, conditions in (condition or {}).items():
+        operator = operator.lower()
+        if operator.startswith('foranyvalue:'):
+            operator = operator[len('foranyvalue:'):]
+        if operator not in _TRUST_POLICY_RESTRICTING_OPERATORS or not isinstance(conditions, dict):
+            continue
+
+        for key, values in conditions.items():
+            values = values if isinstance(values, list) else [values]
+            if values and all(str(value).strip('*?') for value in values):
+                keys.add(key.lower())
+
+    return frozenset(keys)
+
+
+def _compile_trust_policy(document) -> tuple:
+    """
+    Compiles the given IAM role trust policy into the statements allowing to assume the role, each as a dictionary
+    holding the Sid, the principals as (type, value) tuples, whether NotPrincipal is used, and the lowercased condition
+    keys restricted to specific values. Compiled trust policies are cached by the digest of the canonical document,
+    since many roles share identical trust policies.
+
+    :param document: The trust policy document, either decoded or as a (URL encoded) JSON string.
+    :type document: dict | str
+    :return: The digest of the document, and the compiled statements.
+    :rtype: tuple
+    """
+    if isinstance(document, str):
+        from urllib.parse import unquote
+
+        document = json.loads(unquote(document))
+
+    canonical = json.dumps(document or {}, sort_keys=True, separators=(',', ':'))
+    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    with _TRUST_POLICY_CACHE_LOCK:
+        compiled = _TRUST_POLICY_CACHE.get(digest)
+    if compiled is not None:
+        return digest, compiled
+
+    def _as_list(value):
+        return value if isinstance(value, list) else [value]
+
+    statements = []
+    for statement in _as_list((document or {}).get('Statement', [])):
+        if statement.get('Effect') != 'Allow' or not _allows_assume_role(statement):
+            continue
+
+        principal = statement.get('Principal', statement.get('NotPrincipal', {}))
+        if principal == '*':
+            principals = (('AWS', '*'),)
+        else:
+            principals = tuple(
+                (principal_type, value)
+                for principal_type, values in principal.items() for value in _as_list(values)
+            )
+
+        statements.append({
+            'Sid': statement.get('Sid', ''),
+            'Principals': principals,
+            'NotPrincipal': 'NotPrincipal' in statement,
+            'RestrictedKeys': _restricted_keys(statement.get('Condition'))
+        })
+
+    compiled = tuple(statements)
+    with _TRUST_POLICY_CACHE_LOCK:
+        if len(_TRUST_POLICY_CACHE) >= _TRUST_POLICY_CACHE_SIZE:
+            del _TRUST_POLICY_CACHE[next(iter(_TRUST_POLICY_CACHE))]
+        _TRUST_POLICY_CACHE[digest] = compiled
+
+    return digest, compiled
+
+
+def _principal_account(value: str) -> Optional[str]:
+    """
+    Returns the account of the given AWS principal, specified either as an account number or an IAM or STS ARN.
+
+    :param value: The AWS principal.
+    :type value: str
+    :return: The account of the principal, if any.
+    :rtype: str
+    """
+    if re.fullmatch(r'\d{12}', value):
+        return value
+
+    match = re.match(r'arn:aws[\w-]*:(?:iam|sts)::([^:]*):', value)
+
+    return match.group(1) if match else None
+
+
+def _trust_policy_findings(compiled: tuple, account_number: str, trusted_accounts: frozenset, rules: tuple) -> list:
+    """
+    Evaluates the given compiled trust policy against the rule set:
+    - wildcard_principal: any principal may assume the role, through a wildcard AWS principal or NotPrincipal, without
+    a condition matching the principals against a specific organization, account or ARN.
+    - external_account: a principal of another account, not within the trusted accounts, may assume the role.
+    - missing_external_id: a principal of another account, not within the trusted accounts, may assume the role
+    without a sts:ExternalId condition matching a specific value.
+
+    :param compiled: The compiled statements, as returned by _compile_trust_policy.
+    :type compiled: tuple
+    :param account_number: The account number of the IAM role.
+    :type account_number: str
+    :param trusted_accounts: The account numbers which are not considered external.
+    :type trusted_accounts: frozenset
+    :param rules: The rules to be evaluated.
+    :type rules: tuple
+    :return: The findings, as dictionaries holding the Rule, Principal and Sid.
+    :rtype: list
+    """
+    findings = []
+
+    def _add(rule, principal, statement):
+        finding = {'Rule': rule, 'Principal': principal, 'Sid': statement.get('Sid', '')}
+        if rule in rules and finding not in findings:
+            findings.append(finding)
+
+    for statement in compiled:
+        for principal_type, value in statement.get('Principals', ()):
+            if principal_type != 'AWS':
+                continue
+
+            account = _principal_account(value)
+            if statement.get('NotPrincipal') or value == '*' or (account is not None and '*' in account):
+                if not statement.get('RestrictedKeys') & _TRUST_POLICY_RESTRICTING_KEYS:
+                    _add('wildcard_principal', value, statement)
+            elif account is not None and account != account_number and account not in trusted_accounts:
+                _add('external_account', value, statement)
+                if 'sts:externalid' not in statement.get('RestrictedKeys'):
+                    _add('missing_external_id', value, statement)
+
+    return findings
+
+
+def _user_is_excluded(user: dict, cutoff_date: datetime, include_newly_created: bool) -> bool:
+    """
+    Verifies if the given IAM user cannot be unused because it was created within the specified number of days and
+    newly created users are not included.
+
+    :param user: The boto3 IAM user dictionary.
+    :type user: dict
+    :param cutoff_date: The timezone naive cutoff date, as returned by _cutoff_date.
+    :type cutoff_date: datetime
+    :param include_newly_created: A flag indicating whether to include newly created IAM users.
+    :type include_newly_created: bool
+    :return: True if the IAM user cannot be unused, otherwise False.
+    :rtype: bool
+    """
+    return not include_newly_created and _is_recent(user.get('CreateDate'), cutoff_date)
+
+
+def _user_is_unused(user: dict, cutoff_date: datetime) -> bool:
+    """
+    Verifies if the given IAM user has no activity within the specified number of days.
+
+    :param user: The boto3 IAM user dictionary, including LoginProfile and AccessKeys if fetched.
+    :type user: dict
+    :param cutoff_date: The timezone naive cutoff date, as returned by _cutoff_date.
+    :type cutoff_date: datetime
+    :return: True if the IAM user is unused, otherwise False.
+    :rtype: bool
+    """
+    _recent_activity_date = _user_recent_activity_date(user)
+
+    return _recent_activity_date is None or not _is_recent(_recent_activity_date, cutoff_date)
+
+
+def _user_recent_activity_date(user: dict) -> Optional[datetime]:
+    """
+    Returns the most recent activity date of the given IAM user, considering the login profile creation date, the
+    access keys last used dates, and the password last used date.
+
+    :param user: The boto3 IAM user dictionary, including LoginProfile and AccessKeys if fetched.
+    :type user: dict
+    :return: The most recent activity date, if any.
+    :rtype: datetime
+    """
+    _last_login = user.get('LoginProfile', {}).get('CreateDate', None)
+    _access_key_last_used = None
+
+    for _key in user.get('AccessKeys', []):
+        _last_used_date = _key.get('last_used', {}).get('AccessKeyLastUsed', {}).get('LastUsedDate', None)
+        if _last_used_date and (not _access_key_last_used or _last_used_date > _access_key_last_used):
+            _access_key_last_used = _last_used_date
+
+    _password_last_used = user.get('PasswordLastUsed', None)
+
+    return max(filter(None, [_last_login, _access_key_last_used, _password_last_used]), default=None)
+
+
+def _validate_fields(fields, mappings: dict) -> None:
+    """
+    Validates if the given fields are supported by the fetch layer.
+
+    :param fields: The requested fields.
+    :type fields: Iterable
+    :param mappings: The supported fields mapping.
+    :type mappings: dict
+    """
+    unsupported = set(fields) - set(mappings)
+    if unsupported:
+        raise ValueError(f'unsupported fields: {", ".join(sorted(unsupported))}.')
+
+
+def _list_chunks(client, operation_name: str, result_key: str, chunk_size: Optional[int] = None) -> Iterator[list]:
+    """
+    Utilizing the boto3 paginator of the specified IAM list operation, this method yields the items of the result key
+    one page at a time or, if chunk_size is provided, in chunks of at most chunk_size items, with pages requested in
+    the same size when supported.
+
+    :param client: The boto3 IAM client.
+    :type client: botocore.client.BaseClient
+    :param operation_name: The name of the paginated operation, e.g. 'list_roles'.
+    :type operation_name: str
+    :param result_key: The key of the items within each page, e.g. 'Roles'.
+    :type result_key: str
+    :param chunk_size: The maximum number of items per chunk, if any.
+    :type chunk_size: int
+    :return: A generator of item lists.
+    :rtype: Iterator[list]
+    """
+    kwargs = {'PaginationConfig': {'PageSize': min(chunk_size, _MAX_PAGE_SIZE)}} if chunk_size else {}
+
+    for page in client.get_paginator(operation_name).paginate(**kwargs):
+        items = page.get(result_key, [])
+        if not chunk_size:
+            yield items
+            continue
+
+        for start in range(0, len(items), chunk_size):
+            yield items[start:start + chunk_size]
+
+
+def _iter_roles(
+        session,
+        fields,
+        exclude: Optional[Callable[[dict], bool]] = None,
+        chunk_size: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Utilizing boto3 IAM, this method yields IAM roles retaining only the identity keys and the boto3 keys backing the
+    requested fields. Roles are listed page by page, or in chunks of at most chunk_size roles, and get_role is called in
+    parallel only if a requested field is not returned by list_roles. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/paginator/ListRoles.html
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :param fields: The pyawsopstoolkit_models IAM role fields required by the caller.
+    :type fields: Iterable
+    :param exclude: A callable receiving the listed IAM role, returning True if the role cannot affect the result.
+    Excluded roles are neither yielded nor fetched in detail.
+    :type exclude: Callable
+    :param chunk_size: The maximum number of IAM roles listed and fetched in detail at once, if any.
+    :type chunk_size: int
+    :return: A generator of IAM roles.
+    :rtype: Iterator[dict]
+    """
+    _validate_fields(fields, _ROLE_FIELDS)
+
+    keys = _ROLE_IDENTITY_KEYS + tuple(_ROLE_FIELDS[field][0] for field in fields)
+    include_details = any(_ROLE_FIELDS[field][1] for field in fields)
+    client = _get_client(session, BOTO3_CLIENT)
+
+    def _process_role(role_detail):
+        if include_details:
+            role_detail = _get_role(client, role_detail.get('RoleName', ''))
+
+        return _project(role_detail, keys) if role_detail is not None else None
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for chunk in _list_chunks(client, 'list_roles', 'Roles', chunk_size):
+            roles_to_process = [
+                role for role in chunk if exclude is None or not exclude(role)
+            ]
+            roles = executor.map(_process_role, roles_to_process) if include_details \
+                else map(_process_role, roles_to_process)
+
+            for role in roles:
+                if role is not None:
+                    yield role
+
+
+def _iter_users(
+        session,
+        fields,
+        exclude: Optional[Callable[[dict], bool]] = None,
+        chunk_size: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Utilizing boto3 IAM, this method yields IAM users retaining only the identity keys and the boto3 keys backing the
+    requested fields. Users are listed page by page, or in chunks of at most chunk_size users, and only the detail calls
+    backing the requested fields are made, in parallel across users. The login profile and access keys are stored under
+    the LoginProfile and AccessKeys keys respectively. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/iam/paginator/ListUsers.html
+
+    :param session: The Session object which provide access to AWS services.
+    :type session: pyawsopstoolkit.session.Session
+    :param fields: The pyawsopstoolkit_models IAM user fields required by the caller.
+    :type fields: Iterable
+    :param exclude: A callable receiving the IAM user fetched so far, returning True if the user cannot affect the
+    result. It is evaluated after listing and after every detail call, and no further calls are made for excluded
+    users, which are not yielded.
+    :type exclude: Callable
+    :param chunk_size: The maximum number of IAM users listed and fetched in detail at once, if any.
+    :type chunk_size: int
+    :return: A generator of IAM users.
+    :rtype: Iterator[dict]
+    """
+    _validate_fields(fields, _USER_FIELDS)
+
+    keys = _USER_IDENTITY_KEYS + tuple(_USER_FIELDS[field][0] for field in fields)
+    detail_calls = [call for call in _USER_DETAIL_CALLS if any(_USER_FIELDS[f][1] == call for f in fields)]
+    client = _get_client(session, BOTO3_CLIENT)
+
+    def _process_user(user_detail):
+        user_name = user_detail.get('UserName', '')
+
+        for call in detail_calls:
+            if call == 'get_user':
+                _user = _get_user(client, user_name)
+                if _user is None:
+                    return None
+                user_detail = {**user_detail, **_user}
+            elif call == 'get_login_profile':
+                user_detail = {**user_detail, 'LoginProfile': _get_login_profile(client, user_name)}
+            elif call == 'list_access_keys':
+                user_detail = {**user_detail, 'AccessKeys': [
+                    {
+                        'access_key': a_key,
+                        'last_used': _get_access_key_last_used(client, a_key.get('AccessKeyId', ''))
+                    }
+                    for a_key in _list_access_keys(client, user_name)
+                ]}
+
+            if exclude is not None and exclude(user_detail):
+                return None
+
+        return _project(user_detail, keys)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for chunk in _list_chunks(client, 'list_users', 'Users', chunk_size):
+            users_to_process = [
+                user for user in chunk if exclude is None or not exclude(user)
+            ]
+            users = executor.map(_process_user, users_to_process) if detail_calls \
+                else map(_process_user, users_to_process)
+
+            for user in users:
+                if user is not None:
+                    yield user
 
 
 @dataclass
 class Role:
     """
-    A class representing insights related with IAM roles.
+    A class representing insights related with IAM roles. When trusted is set, the returned pyawsopstoolkit_models
+    objects are built from the AWS responses without per-attribute validation.
     """
     from pyawsopstoolkit.session import Session
 
     session: Session
+    trusted: Optional[bool] = False
 
     def __post_init__(self):
         for field_name, field_value in self.__dataclass_fields__.items():
@@ -25,75 +734,231 @@ class Role:
         field_value = getattr(self, field_name)
         if field_name in ['session']:
             _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+        elif field_name in ['trusted']:
+            _validate_type(field_value, bool, f'{field_name} should be a boolean.')
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
             self.__validate__(key)
 
+    def _convert_roles(self, roles, account=None) -> Iterator:
+        """
+        Converts the given boto3 IAM role dictionaries into pyawsopstoolkit_models IAM roles, without validation if
+        trusted. Unless provided, the account is resolved only once, and only if there is at least one role.
+
+        :param roles: The boto3 IAM role dictionaries.
+        :type roles: Iterable
+        :param account: The account of the roles, if already resolved.
+        :type account: pyawsopstoolkit.account.Account
+        :return: A generator of IAM roles.
+        :rtype: Iterator[pyawsopstoolkit_models.iam.role.Role]
+        """
+        from pyawsopstoolkit_advsearch.iam import Role
+
+        convert = _to_iam_role if self.trusted else Role._convert_to_iam_role
+
+        for role in roles:
+            if account is None:
+                account = self.session.get_account()
+            yield convert(account, role)
+
+    def _iter_unused_roles(
+            self,
+            no_of_days: int,
+            include_newly_created: bool,
+            chunk_size: Optional[int] = None
+    ) -> Iterator[dict]:
+        """
+        Yields unused IAM roles, as boto3 dictionaries, based on the specified parameters. Only the fields required for
+        the evaluation are fetched, and roles that cannot be unused (AWS service roles and, unless included, newly
+        created roles) are not fetched in detail.
+
+        :param no_of_days: The number of days (integer) to check if the IAM role has been used within the
+        specified period.
+        :type no_of_days: int
+        :param include_newly_created: A flag indicating whether to include newly created IAM roles within the
+        specified number of days.
+        :type include_newly_created: bool
+        :param chunk_size: The maximum number of IAM roles fetched and evaluated at once, if any.
+        :type chunk_size: int
+        :return: A generator of unused IAM roles.
+        :rtype: Iterator[dict]
+        """
+        cutoff_date = _cutoff_date(no_of_days)
+
+        def role_is_excluded(_role):
+            return _role_is_excluded(_role, cutoff_date, include_newly_created)
+
+        for role in _iter_roles(self.session, _UNUSED_ROLES_FIELDS, role_is_excluded, chunk_size):
+            if _role_is_unused(role, cutoff_date):
+                yield role
+
     def unused_roles(
             self,
             no_of_days: Optional[int] = 90,
+            include_newly_created: Optional[bool] = False,
+            chunk_size: Optional[int] = None,
+            max_memory: Optional[int] = None
+    ) -> Union[list, Iterator]:
+        """
+        Returns a list of unused IAM roles based on the specified parameters. If chunk_size or max_memory is provided,
+        the roles are fetched and evaluated in chunks, at most max_memory bytes of unused roles are held in memory with
+        the rest spilled to a temporary file, and a generator converting one role at a time is returned instead.
+
+        :param no_of_days: The number of days (integer) to check if the IAM role has been used within the
+        specified period. Defaults to 90 days.
+        :type no_of_days: int
+        :param include_newly_created: A flag indicating whether to include newly created IAM roles within the
+        specified number of days. Defaults to False.
+        :type include_newly_created: bool
+        :param chunk_size: The maximum number of IAM roles fetched and evaluated at once within the chunked mode.
+        Defaults to None, or 100 if only max_memory is provided.
+        :type chunk_size: int
+        :param max_memory: The number of bytes of unused IAM roles held in memory before spilling within the chunked
+        mode. Defaults to None, or 16 MiB if only chunk_size is provided.
+        :type max_memory: int
+        :return: A list, or a generator within the chunked mode, of unused IAM roles.
+        :rtype: Union[list, Iterator]
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        _validate_type(no_of_days, int, 'no_of_days should be an integer.')
+        _validate_type(include_newly_created, bool, 'include_newly_created should be a boolean.')
+        _validate_chunked(chunk_size, max_memory)
+
+        try:
+            if chunk_size is not None or max_memory is not None:
+                return self._convert_roles(_spool(
+                    self._iter_unused_roles(no_of_days, include_newly_created, chunk_size or CHUNK_SIZE),
+                    max_memory or MAX_MEMORY
+                ))
+
+            roles = _single_flight(
+                self.session, (BOTO3_CLIENT, None, 'unused_roles', no_of_days, include_newly_created),
+                lambda: list(self._iter_unused_roles(no_of_days, include_newly_created))
+            )
+
+            return list(self._convert_roles(roles))
+        except ClientError as e:
+            raise AdvanceSearchError('unused_roles', e)
+
+    def top_unused(
+            self,
+            k: Optional[int] = 50,
+            by: Optional[str] = 'last_used',
+            no_of_days: Optional[int] = 90,
             include_newly_created: Optional[bool] = False
     ) -> list:
         """
-        Returns a list of unused IAM roles based on the specified parameters.
+        Returns the k stalest unused IAM roles, stalest first. Unused roles are streamed through a bounded heap, so only
+        k roles are retained and converted regardless of the number of roles within the account.
 
+        :param k: The number of IAM roles to be returned. Defaults to 50.
+        :type k: int
+        :param by: The ranking criteria: 'last_used' ranks never used roles first, followed by the least recently used
+        roles, with ties broken by creation date; 'created_date' ranks the oldest roles first. Defaults to 'last_used'.
+        :type by: str
         :param no_of_days: The number of days (integer) to check if the IAM role has been used within the
         specified period. Defaults to 90 days.
         :type no_of_days: int
         :param include_newly_created: A flag indicating whether to include newly created IAM roles within the
         specified number of days. Defaults to False.
         :type include_newly_created: bool
-        :return: A list of unused IAM roles.
+        :return: A list of at most k unused IAM roles.
         :rtype: list
         """
-        from pyawsopstoolkit_advsearch.iam import Role
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
 
+        _validate_top_unused(k, by, _TOP_UNUSED_ROLES_BY)
         _validate_type(no_of_days, int, 'no_of_days should be an integer.')
         _validate_type(include_newly_created, bool, 'include_newly_created should be a boolean.')
 
-        current_date = datetime.today().replace(tzinfo=None)
-        role_object = Role(self.session)
-        iam_roles = role_object.search_roles(include_details=True)
+        if by == 'last_used':
+            def _key(_role):
+                return _naive(_role_last_used_date(_role)), _naive(_role.get('CreateDate', None))
+        else:
+            def _key(_role):
+                return _naive(_role.get('CreateDate', None))
 
-        if iam_roles is None:
-            return []
+        try:
+            return list(self._convert_roles(
+                heapq.nsmallest(k, self._iter_unused_roles(no_of_days, include_newly_created), key=_key)
+            ))
+        except ClientError as e:
+            raise AdvanceSearchError('top_unused', e)
 
-        def role_is_unused(_role):
-            if _role.last_used is None:
-                return True
+    def risky_trust_policies(
+            self,
+            trusted_accounts: Optional[list] = None,
+            rules: Optional[list] = None
+    ) -> list:
+        """
+        Returns a list of IAM roles whose trust policy allows external accounts, wildcard principals, or external
+        accounts without a sts:ExternalId condition. Trust policies are retrieved through list_roles only, each distinct
+        trust policy is compiled and evaluated once, and the compiled form is cached by document digest across calls.
 
-            if (current_date - _role.last_used.used_date.replace(tzinfo=None)).days <= no_of_days:
-                return False
+        :param trusted_accounts: The account numbers which are not considered external, e.g. the accounts of the
+        organization. The account of the session is always trusted. Defaults to None.
+        :type trusted_accounts: list
+        :param rules: The rules to be evaluated, among 'external_account', 'wildcard_principal' and
+        'missing_external_id'. Defaults to all rules.
+        :type rules: list
+        :return: A list of IAM roles, as dictionaries holding the RoleName, RoleId, Arn, Path and the Findings, each
+        finding holding the Rule, Principal and Sid.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        _validate_type(trusted_accounts, (list, type(None)), 'trusted_accounts should be a list of strings.')
+        _validate_type(rules, (list, type(None)), 'rules should be a list of strings.')
+
+        rules = tuple(_TRUST_POLICY_RULES if rules is None else rules)
+        unsupported = set(rules) - set(_TRUST_POLICY_RULES)
+        if unsupported:
+            raise ValueError(f'unsupported rules: {", ".join(sorted(unsupported))}.')
 
-            return True
+        trusted_accounts = frozenset(trusted_accounts or [])
+        account_number = None
+        findings_by_policy = {}
+        risky_roles = []
 
-        unused_roles_list = []
+        try:
+            for role in _iter_roles(self.session, ('path', 'assume_role_policy_document')):
+                if account_number is None:
+                    account_number = self.session.get_account().number
 
-        for role in iam_roles:
-            if not re.search(r'/aws-service-role/', role.path, re.IGNORECASE):
-                if include_newly_created:
-                    if role_is_unused(role):
-                        unused_roles_list.append(role)
-                else:
-                    if (
-                            (current_date - role.created_date.replace(tzinfo=None)).days > no_of_days
-                            and role_is_unused(role)
-                    ):
-                        unused_roles_list.append(role)
+                digest, compiled = _compile_trust_policy(role.get('AssumeRolePolicyDocument', {}))
+                if digest not in findings_by_policy:
+                    findings_by_policy[digest] = _trust_policy_findings(
+                        compiled, account_number, trusted_accounts, rules
+                    )
 
-        return unused_roles_list
+                findings = findings_by_policy[digest]
+                if findings:
+                    risky_roles.append({
+                        **{key: role.get(key) for key in ('RoleName', 'RoleId', 'Arn', 'Path')},
+                        'Findings': [dict(finding) for finding in findings]
+                    })
+        except ClientError as e:
+            raise AdvanceSearchError('risky_trust_policies', e)
+
+        return risky_roles
 
 
 @dataclass
 class User:
     """
-    A class representing insights related with IAM users.
+    A class representing insights related with IAM users. When trusted is set, the returned pyawsopstoolkit_models
+    objects are built from the AWS responses without per-attribute validation.
     """
     from pyawsopstoolkit.session import Session
 
     session: Session
+    trusted: Optional[bool] = False
 
     def __post_init__(self):
         for field_name, field_value in self.__dataclass_fields__.items():
@@ -105,79 +970,332 @@ class User:
         field_value = getattr(self, field_name)
         if field_name in ['session']:
             _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+        elif field_name in ['trusted']:
+            _validate_type(field_value, bool, f'{field_name} should be a boolean.')
 
     def __setattr__(self, key, value):
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
             self.__validate__(key)
 
+    def _convert_users(self, users, account=None) -> Iterator:
+        """
+        Converts the given boto3 IAM user dictionaries into pyawsopstoolkit_models IAM users, without validation if
+        trusted. Unless provided, the account is resolved only once, and only if there is at least one user.
+
+        :param users: The boto3 IAM user dictionaries.
+        :type users: Iterable
+        :param account: The account of the users, if already resolved.
+        :type account: pyawsopstoolkit.account.Account
+        :return: A generator of IAM users.
+        :rtype: Iterator[pyawsopstoolkit_models.iam.user.User]
+        """
+        from pyawsopstoolkit_advsearch.iam import User
+
+        for user in users:
+            if account is None:
+                account = self.session.get_account()
+            if self.trusted:
+                yield _to_iam_user(account, user)
+            else:
+                yield User._convert_to_iam_user(
+                    account, user, user.get('LoginProfile', None), user.get('AccessKeys', None)
+                )
+
+    def _iter_unused_users(
+            self,
+            no_of_days: int,
+            include_newly_created: bool,
+            exclude: Optional[Callable[[dict], bool]] = None,
+            chunk_size: Optional[int] = None
+    ) -> Iterator[dict]:
+        """
+        Yields unused IAM users, as boto3 dictionaries, based on the specified parameters. Only the fields required for
+        the evaluation are fetched, and no further detail calls are made for a user once it is known to be used or,
+        unless included, newly created.
+
+        :param no_of_days: The number of days (integer) to check if the IAM user has been used within the
+        specified period.
+        :type no_of_days: int
+        :param include_newly_created: A flag indicating whether to include newly created IAM users within the
+        specified number of days.
+        :type include_newly_created: bool
+        :param exclude: An optional callable receiving the listed IAM user, returning True if the user should not be
+        evaluated at all.
+        :type exclude: Callable
+        :param chunk_size: The maximum number of IAM users fetched and evaluated at once, if any.
+        :type chunk_size: int
+        :return: A generator of unused IAM users.
+        :rtype: Iterator[dict]
+        """
+        cutoff_date = _cutoff_date(no_of_days)
+
+        def user_is_excluded(_user):
+            if exclude is not None and exclude(_user):
+                return True
+
+            if _user_is_excluded(_user, cutoff_date, include_newly_created):
+                return True
+
+            return not _user_is_unused(_user, cutoff_date)
+
+        for user in _iter_users(self.session, _UNUSED_USERS_FIELDS, user_is_excluded, chunk_size):
+            if _user_is_unused(user, cutoff_date):
+                yield user
+
     def unused_users(
             self,
             no_of_days: Optional[int] = 90,
+            include_newly_created: Optional[bool] = False,
+            chunk_size: Optional[int] = None,
+            max_memory: Optional[int] = None
+    ) -> Union[list, Iterator]:
+        """
+        Returns a list of unused IAM users based on the specified parameters. If chunk_size or max_memory is provided,
+        the users are fetched and evaluated in chunks, at most max_memory bytes of unused users are held in memory with
+        the rest spilled to a temporary file, and a generator converting one user at a time is returned instead.
+
+        :param no_of_days: The number of days (integer) to check if the IAM user has been used within the
+        specified period. Defaults to 90 days.
+        :type no_of_days: int
+        :param include_newly_created: A flag indicating whether to include newly created IAM users within the
+        specified number of days. Defaults to False.
+        :type include_newly_created: bool
+        :param chunk_size: The maximum number of IAM users fetched and evaluated at once within the chunked mode.
+        Defaults to None, or 100 if only max_memory is provided.
+        :type chunk_size: int
+        :param max_memory: The number of bytes of unused IAM users held in memory before spilling within the chunked
+        mode. Defaults to None, or 16 MiB if only chunk_size is provided.
+        :type max_memory: int
+        :return: A list, or a generator within the chunked mode, of unused IAM users.
+        :rtype: Union[list, Iterator]
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        _validate_type(no_of_days, int, 'no_of_days should be an integer.')
+        _validate_type(include_newly_created, bool, 'include_newly_created should be a boolean.')
+        _validate_chunked(chunk_size, max_memory)
+
+        try:
+            if chunk_size is not None or max_memory is not None:
+                return self._convert_users(_spool(
+                    self._iter_unused_users(no_of_days, include_newly_created, chunk_size=chunk_size or CHUNK_SIZE),
+                    max_memory or MAX_MEMORY
+                ))
+
+            users = _single_flight(
+                self.session, (BOTO3_CLIENT, None, 'unused_users', no_of_days, include_newly_created),
+                lambda: list(self._iter_unused_users(no_of_days, include_newly_created))
+            )
+
+            return list(self._convert_users(users))
+        except ClientError as e:
+            raise AdvanceSearchError('unused_users', e)
+
+    def top_unused(
+            self,
+            k: Optional[int] = 50,
+            by: Optional[str] = 'last_activity',
+            no_of_days: Optional[int] = 90,
             include_newly_created: Optional[bool] = False
     ) -> list:
         """
-        Returns a list of unused IAM users based on the specified parameters.
+        Returns the k stalest unused IAM users, stalest first. Unused users are streamed through a bounded heap, so only
+        k users are retained and converted regardless of the number of users within the account.
 
+        :param k: The number of IAM users to be returned. Defaults to 50.
+        :type k: int
+        :param by: The ranking criteria: 'last_activity' ranks users without any activity first, followed by the users
+        with the least recent activity, with ties broken by creation date; 'created_date' ranks the oldest users first.
+        Defaults to 'last_activity'.
+        :type by: str
         :param no_of_days: The number of days (integer) to check if the IAM user has been used within the
         specified period. Defaults to 90 days.
         :type no_of_days: int
         :param include_newly_created: A flag indicating whether to include newly created IAM users within the
         specified number of days. Defaults to False.
         :type include_newly_created: bool
-        :return: A list of unused IAM users.
+        :return: A list of at most k unused IAM users.
         :rtype: list
         """
-        from pyawsopstoolkit_advsearch.iam import User
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
 
+        _validate_top_unused(k, by, _TOP_UNUSED_USERS_BY)
         _validate_type(no_of_days, int, 'no_of_days should be an integer.')
         _validate_type(include_newly_created, bool, 'include_newly_created should be a boolean.')
 
-        current_date = datetime.today().replace(tzinfo=None)
-        user_object = User(self.session)
-        iam_users = user_object.search_users(include_details=True)
+        if by == 'last_activity':
+            def _key(_user):
+                return _naive(_user_recent_activity_date(_user)), _naive(_user.get('CreateDate', None))
+        else:
+            def _key(_user):
+                return _naive(_user.get('CreateDate', None))
 
-        if iam_users is None:
-            return []
+        try:
+            return list(self._convert_users(
+                heapq.nsmallest(k, self._iter_unused_users(no_of_days, include_newly_created), key=_key)
+            ))
+        except ClientError as e:
+            raise AdvanceSearchError('top_unused', e)
 
-        def user_is_unused(_user):
-            _last_login = None
-            _access_key_last_used = None
 
-            if _user.login_profile is not None:
-                _last_login = _user.login_profile.created_date
+@dataclass
+class Policy:
+    """
+    A class representing insights related with IAM customer managed policies.
+    """
+    from pyawsopstoolkit.session import Session
 
-            if _user.access_keys is not None:
-                for _key in _user.access_keys:
-                    _last_used_date = _key.last_used_date
-                    if not _access_key_last_used or _last_used_date > _access_key_last_used:
-                        _access_key_last_used = _last_used_date
+    session: Session
 
-            _password_last_used = _user.password_last_used_date
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
 
-            _recent_activity_date: datetime = max(
-                filter(None, [_last_login, _access_key_last_used, _password_last_used]), default=None
-            )
+    def __validate__(self, field_name):
+        from pyawsopstoolkit.session import Session
 
-            if _recent_activity_date is None:
-                return True
+        field_value = getattr(self, field_name)
+        if field_name in ['session']:
+            _validate_type(field_value, Session, f'{field_name} should be of Session type.')
 
-            if (current_date - _recent_activity_date.replace(tzinfo=None)).days <= no_of_days:
-                return False
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def _unused_principals(self, details: dict, candidates: set, no_of_days: int, include_newly_created: bool) -> set:
+        """
+        Returns the principals attached to the candidate policies which are unused, as (type, name) tuples. IAM roles
+        are evaluated from the authorization details directly, whereas IAM users, directly attached or members of
+        attached groups, are evaluated through the IAM User insight restricted to those users. IAM groups are unused if
+        all their members are unused.
+
+        :param details: The account authorization details.
+        :type details: dict
+        :param candidates: The principals attached to the candidate policies, as (type, name) tuples.
+        :type candidates: set
+        :param no_of_days: The number of days (integer) to check if a principal has been used within.
+        :type no_of_days: int
+        :param include_newly_created: A flag indicating whether to consider newly created principals as unused.
+        :type include_newly_created: bool
+        :return: The unused principals.
+        :rtype: set
+        """
+        cutoff_date = _cutoff_date(no_of_days)
+
+        group_members = {}
+        for user in details.get('UserDetailList', []):
+            for group_name in user.get('GroupList', []):
+                group_members.setdefault(group_name, set()).add(user.get('UserName', ''))
+
+        user_names = {name for _type, name in candidates if _type == 'user'}
+        for _type, name in candidates:
+            if _type == 'group':
+                user_names.update(group_members.get(name, set()))
+
+        unused_user_names = set()
+        if user_names:
+            unused_user_names = {
+                user.get('UserName', '') for user in User(session=self.session)._iter_unused_users(
+                    no_of_days, include_newly_created, lambda _user: _user.get('UserName', '') not in user_names
+                )
+            }
+
+        unused_principals = {
+            ('role', role.get('RoleName', '')) for role in details.get('RoleDetailList', [])
+            if not _role_is_excluded(role, cutoff_date, include_newly_created)
+            and _role_is_unused(role, cutoff_date)
+        }
+        unused_principals.update(('user', name) for name in unused_user_names)
+        unused_principals.update(
+            ('group', group.get('GroupName', '')) for group in details.get('GroupDetailList', [])
+            if group_members.get(group.get('GroupName', ''), set()) <= unused_user_names
+        )
+
+        return unused_principals
+
+    def unused_policies(
+            self,
+            include_unused_principals: Optional[bool] = False,
+            no_of_days: Optional[int] = 90,
+            include_newly_created: Optional[bool] = False
+    ) -> list:
+        """
+        Returns a list of unused IAM customer managed policies, i.e. policies neither attached to any principal nor used
+        as a permissions boundary. All policies are retrieved through a single paginated
+        get_account_authorization_details pass, and attachments are resolved from an in-memory index instead of calling
+        list_entities_for_policy per policy.
+
+        :param include_unused_principals: A flag indicating whether to also include policies whose attached principals
+        (IAM roles, users and groups) are all unused within the specified number of days. Defaults to False.
+        :type include_unused_principals: bool
+        :param no_of_days: The number of days (integer) to check if the IAM policy has been created, or its principals
+        used, within the specified period. Defaults to 90 days.
+        :type no_of_days: int
+        :param include_newly_created: A flag indicating whether to include IAM policies and principals newly created
+        within the specified number of days. Defaults to False.
+        :type include_newly_created: bool
+        :return: A list of unused IAM policies, as boto3 dictionaries without policy documents.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
 
-            return True
+        _validate_type(include_unused_principals, bool, 'include_unused_principals should be a boolean.')
+        _validate_type(no_of_days, int, 'no_of_days should be an integer.')
+        _validate_type(include_newly_created, bool, 'include_newly_created should be a boolean.')
 
-        unused_users_list = []
+        cutoff_date = _cutoff_date(no_of_days)
 
-        for user in iam_users:
+        def policy_is_excluded(_policy):
             if include_newly_created:
-                if user_is_unused(user):
-                    unused_users_list.append(user)
-            else:
-                if (
-                        (current_date - user.created_date.replace(tzinfo=None)).days > no_of_days
-                        and user_is_unused(user)
-                ):
-                    unused_users_list.append(user)
+                return False
+
+            return _is_recent(_policy.get('CreateDate'), cutoff_date)
+
+        try:
+            if not include_unused_principals:
+                details = _get_account_authorization_details(self.session, ['LocalManagedPolicy'])
+
+                return [
+                    policy for policy in details.get('Policies', [])
+                    if not policy_is_excluded(policy)
+                    and policy.get('AttachmentCount', 0) == 0
+                    and policy.get('PermissionsBoundaryUsageCount', 0) == 0
+                ]
+
+            details = _get_account_authorization_details(
+                self.session, ['LocalManagedPolicy', 'Role', 'User', 'Group']
+            )
+
+            attachments = {}
+            for _type, key, name_key in [
+                ('role', 'RoleDetailList', 'RoleName'),
+                ('user', 'UserDetailList', 'UserName'),
+                ('group', 'GroupDetailList', 'GroupName')
+            ]:
+                for principal in details.get(key, []):
+                    principal_id = (_type, principal.get(name_key, ''))
+                    for attached_policy in principal.get('AttachedManagedPolicies', []):
+                        attachments.setdefault(attached_policy.get('PolicyArn', ''), set()).add(principal_id)
+                    boundary_arn = principal.get('PermissionsBoundary', {}).get('PermissionsBoundaryArn', None)
+                    if boundary_arn:
+                        attachments.setdefault(boundary_arn, set()).add(principal_id)
+
+            policies = [policy for policy in details.get('Policies', []) if not policy_is_excluded(policy)]
+            candidates = {
+                principal for policy in policies for principal in attachments.get(policy.get('Arn', ''), set())
+            }
+            unused_principals = self._unused_principals(
+                details, candidates, no_of_days, include_newly_created
+            ) if candidates else set()
 
-        return unused_users_list
+            return [
+                policy for policy in policies
+                if attachments.get(policy.get('Arn', ''), set()) <= unused_principals
+            ]
+        except ClientError as e:
+            raise AdvanceSearchError('unused_policies', e)
@@ -0,0 +1,423 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Optional
+
+from pyawsopstoolkit_insights.__fetch__ import _get_client, _paginate
+from pyawsopstoolkit_insights.__globals__ import MAX_WORKERS
+from pyawsopstoolkit_insights.__validations__ import _validate_type
+
+# The error codes indicating that a step has already been applied, e.g. by an interrupted run which completed the
+# call but not its journal entry, hence treated as successful.
+_ALREADY_APPLIED_CODES = frozenset({'NoSuchEntity', 'InvalidGroup.NotFound', 'InvalidPermission.NotFound'})
+
+# Maps the security group rule keys to the boto3 operation revoking them.
+_REVOKE_OPERATIONS = {
+    'IpPermissions': 'revoke_security_group_ingress',
+    'IpPermissionsEgress': 'revoke_security_group_egress'
+}
+
+
+class _RateLimiter:
+    """
+    A class spacing the calls made across threads so that at most rate calls are started per second.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self) -> None:
+        """
+        Blocks until the next call is allowed to start.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+
+        if start > now:
+            time.sleep(start - now)
+
+
+def _step(service: str, region: Optional[str], operation: str, parameters: dict, depends_on=None) -> dict:
+    """
+    Builds a remediation step. The identifier is derived from the call itself, so that the same step is given the same
+    identifier across plans, which allows a journal to be resumed with a newly built plan.
+
+    :param service: The name of the AWS service, e.g. 'iam' or 'ec2'.
+    :type service: str
+    :param region: The region of the call, or None for global services.
+    :type region: str
+    :param operation: The name of the boto3 operation, e.g. 'delete_role'.
+    :type operation: str
+    :param parameters: The parameters of the boto3 operation.
+    :type parameters: dict
+    :param depends_on: The identifiers of the steps to be completed before this step.
+    :type depends_on: list
+    :return: The remediation step.
+    :rtype: dict
+    """
+    return {
+        'Id': f'{service}:{region or "global"}:{operation}:{json.dumps(parameters, sort_keys=True)}',
+        'Service': service,
+        'Region': region,
+        'Operation': operation,
+        'Parameters': parameters,
+        'DependsOn': list(depends_on or [])
+    }
+
+
+def _role_steps(client, role_name: str) -> list:
+    """
+    Utilizing boto3 IAM, this method builds the steps deleting the given IAM role: removing it from its instance
+    profiles, detaching its managed policies and deleting its inline policies, all of which the role deletion depends
+    on. No steps are returned if the role no longer exists.
+
+    :param client: The boto3 IAM client.
+    :type client: botocore.client.BaseClient
+    :param role_name: The name of the IAM role.
+    :type role_name: str
+    :return: The remediation steps.
+    :rtype: list
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        steps = [
+            _step('iam', None, 'remove_role_from_instance_profile', {
+                'InstanceProfileName': profile.get('InstanceProfileName', ''), 'RoleName': role_name
+            })
+            for profile in _paginate(client, 'list_instance_profiles_for_role', 'InstanceProfiles', RoleName=role_name)
+        ]
+        steps += [
+            _step('iam', None, 'detach_role_policy', {'PolicyArn': policy.get('PolicyArn', ''), 'RoleName': role_name})
+            for policy in _paginate(client, 'list_attached_role_policies', 'AttachedPolicies', RoleName=role_name)
+        ]
+        steps += [
+            _step('iam', None, 'delete_role_policy', {'PolicyName': policy_name, 'RoleName': role_name})
+            for policy_name in _paginate(client, 'list_role_policies', 'PolicyNames', RoleName=role_name)
+        ]
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code', '') in _ALREADY_APPLIED_CODES:
+            return []
+        raise
+
+    return steps + [_step('iam', None, 'delete_role', {'RoleName': role_name}, [step['Id'] for step in steps])]
+
+
+def _security_group_steps(client, region: str, group_ids: list) -> list:
+    """
+    Utilizing boto3 EC2, this method builds the steps deleting the given security groups of a region. Every ingress or
+    egress rule of another security group referencing one of them is revoked first, and a security group modified this
+    way, if deleted as well, is deleted only after its rules are revoked. Rules are revoked with their original pair,
+    less its Description, since the UserId, VpcId and VpcPeeringConnectionId of cross-account and peered VPC references
+    are required to match the rule. The default security groups of the VPCs, which cannot be deleted, are excluded so
+    that no rule referencing them is revoked.
+
+    :param client: The boto3 EC2 client of the region.
+    :type client: botocore.client.BaseClient
+    :param region: The region of the security groups.
+    :type region: str
+    :param group_ids: The identifiers of the security groups to be deleted.
+    :type group_ids: list
+    :return: The remediation steps.
+    :rtype: list
+    """
+    groups = list(_paginate(client, 'describe_security_groups', 'SecurityGroups'))
+    defaults = {group.get('GroupId', '') for group in groups if group.get('GroupName', '') == 'default'}
+    group_ids = [group_id for group_id in group_ids if group_id not in defaults]
+    candidates = set(group_ids)
+    steps = {}
+    references = defaultdict(list)
+    modifications = defaultdict(list)
+
+    for group in groups:
+        group_id = group.get('GroupId', '')
+        for key, operation in _REVOKE_OPERATIONS.items():
+            for permission in group.get(key, []):
+                for pair in permission.get('UserIdGroupPairs', []):
+                    referenced_id = pair.get('GroupId', '')
+                    if referenced_id not in candidates or referenced_id == group_id:
+                        continue
+
+                    ip_permission = {k: permission[k] for k in ('IpProtocol', 'FromPort', 'ToPort') if k in permission}
+                    ip_permission['UserIdGroupPairs'] = [{k: v for k, v in pair.items() if k != 'Description'}]
+                    step = _step('ec2', region, operation, {'GroupId': group_id, 'IpPermissions': [ip_permission]})
+                    if step['Id'] not in steps:
+                        steps[step['Id']] = step
+                        references[referenced_id].append(step['Id'])
+                        modifications[group_id].append(step['Id'])
+
+    for group_id in dict.fromkeys(group_ids):
+        step = _step(
+            'ec2', region, 'delete_security_group', {'GroupId': group_id},
+            references[group_id] + modifications[group_id]
+        )
+        steps[step['Id']] = step
+
+    return list(steps.values())
+
+
+def _topological_order(steps: list) -> list:
+    """
+    Returns the identifiers of the given steps in a dependency respecting order, keeping the order of the steps where
+    possible.
+
+    :param steps: The remediation steps.
+    :type steps: list
+    :return: The ordered step identifiers.
+    :rtype: list
+    """
+    ids = [step.get('Id') for step in steps]
+    if len(set(ids)) != len(ids):
+        raise ValueError('steps should have unique identifiers.')
+
+    remaining = {}
+    dependents = defaultdict(list)
+    for step in steps:
+        depends_on = set(step.get('DependsOn', []))
+        unknown = depends_on - set(ids)
+        if unknown:
+            raise ValueError(f'unknown step dependencies: {", ".join(sorted(unknown))}.')
+        remaining[step.get('Id')] = len(depends_on)
+        for dependency in depends_on:
+            dependents[dependency].append(step.get('Id'))
+
+    order = [step_id for step_id in ids if remaining[step_id] == 0]
+    for step_id in order:
+        for dependent in dependents[step_id]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                order.append(dependent)
+
+    if len(order) != len(ids):
+        raise ValueError('steps should not contain dependency cycles.')
+
+    return order
+
+
+@dataclass
+class Remediator:
+    """
+    A class representing the remediation of unused resources. The deletion of every resource is planned as a dependency
+    graph of steps, which are executed in topological order on a bounded worker pool. Steps are only executed if
+    dry_run is unset, at most rate_limit calls are started per second if set, and every completed step is recorded in
+    the journal file if set, so that an interrupted remediation can be resumed by executing the same plan again.
+    """
+    from pyawsopstoolkit.session import Session
+
+    session: Session
+    dry_run: Optional[bool] = True
+    max_workers: Optional[int] = MAX_WORKERS
+    rate_limit: Optional[float] = None
+    journal: Optional[str] = None
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        from pyawsopstoolkit.session import Session
+
+        field_value = getattr(self, field_name)
+        if field_name in ['session']:
+            _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+        elif field_name in ['dry_run']:
+            _validate_type(field_value, bool, f'{field_name} should be a boolean.')
+        elif field_name in ['max_workers']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+        elif field_name in ['rate_limit']:
+            _validate_type(field_value, (int, float, type(None)), f'{field_name} should be a number.')
+            if field_value is not None and field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+        elif field_name in ['journal']:
+            _validate_type(field_value, (str, type(None)), f'{field_name} should be a string.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def _read_journal(self) -> set:
+        """
+        Reads the identifiers of the completed steps from the journal. A partially written last line, left by an
+        interrupted run, is ignored.
+
+        :return: The identifiers of the completed steps.
+        :rtype: set
+        """
+        if self.journal is None or not os.path.exists(self.journal):
+            return set()
+
+        completed = set()
+        with open(self.journal, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get('Status') == 'completed':
+                    completed.add(entry.get('Id'))
+
+        return completed
+
+    def _write_journal(self, lock: threading.Lock, entry: dict) -> None:
+        """
+        Appends the given entry to the journal, if any, and flushes it to disk.
+
+        :param lock: The lock serializing the journal writes.
+        :type lock: threading.Lock
+        :param entry: The journal entry.
+        :type entry: dict
+        """
+        if self.journal is None:
+            return
+
+        with lock:
+            with open(self.journal, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry, default=str) + '\n')
+                file.flush()
+                os.fsync(file.fileno())
+
+    def plan(self, roles: Optional[list] = None, security_groups: Optional[list] = None) -> list:
+        """
+        Builds the remediation steps deleting the given IAM roles and EC2 security groups, as returned by the insights,
+        e.g. Role.unused_roles and SecurityGroup.unused_security_groups. The default security groups of the VPCs, which
+        cannot be deleted, are excluded. Each step is a dictionary holding its Id, the Service, Region, Operation and
+        Parameters of the boto3 call, and the identifiers of the steps it DependsOn.
+
+        :param roles: The IAM roles to be deleted. Defaults to None.
+        :type roles: list
+        :param security_groups: The EC2 security groups to be deleted. Defaults to None.
+        :type security_groups: list
+        :return: The remediation steps.
+        :rtype: list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        _validate_type(roles, (list, type(None)), 'roles should be a list.')
+        _validate_type(security_groups, (list, type(None)), 'security_groups should be a list.')
+
+        regions = defaultdict(list)
+        for security_group in security_groups or []:
+            regions[security_group.region].append(security_group.id)
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                steps = []
+                if roles:
+                    client = _get_client(self.session, 'iam')
+                    for role_steps in executor.map(lambda role: _role_steps(client, role.name), roles):
+                        steps += role_steps
+
+                for region_steps in executor.map(
+                        lambda region: _security_group_steps(
+                            _get_client(self.session, 'ec2', region), region, regions[region]
+                        ),
+                        regions
+                ):
+                    steps += region_steps
+
+            return steps
+        except ClientError as e:
+            raise AdvanceSearchError('plan', e)
+
+    def execute(self, steps: list) -> dict:
+        """
+        Executes the given remediation steps, as returned by plan, in topological order on a pool of max_workers
+        threads. Steps recorded as completed in the journal are skipped, and the steps depending on a failed step are
+        blocked. If dry_run is set, no call is made and the steps which would be executed are returned in order.
+
+        :param steps: The remediation steps.
+        :type steps: list
+        :return: A dictionary holding the identifiers of the executed, skipped and blocked steps, and the errors of the
+        failed steps by identifier.
+        :rtype: dict
+        """
+        from botocore.exceptions import ClientError
+
+        _validate_type(steps, list, 'steps should be a list.')
+
+        order = _topological_order(steps)
+        completed = self._read_journal()
+        result = {
+            'executed': [],
+            'skipped': [step_id for step_id in order if step_id in completed],
+            'failed': {},
+            'blocked': []
+        }
+        if self.dry_run:
+            result['executed'] = [step_id for step_id in order if step_id not in completed]
+            return result
+
+        steps_by_id = {step.get('Id'): step for step in steps}
+        dependents = defaultdict(list)
+        remaining = {}
+        for step_id in order:
+            depends_on = set(steps_by_id[step_id].get('DependsOn', [])) - completed
+            remaining[step_id] = len(depends_on)
+            for dependency in depends_on:
+                dependents[dependency].append(step_id)
+
+        clients = {}
+        clients_lock = threading.Lock()
+        journal_lock = threading.Lock()
+        rate_limiter = _RateLimiter(self.rate_limit) if self.rate_limit else None
+
+        def _execute_step(step):
+            key = (step.get('Service'), step.get('Region'))
+            with clients_lock:
+                if key not in clients:
+                    clients[key] = _get_client(self.session, *key)
+
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            try:
+                getattr(clients[key], step.get('Operation'))(**step.get('Parameters', {}))
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code', '') not in _ALREADY_APPLIED_CODES:
+                    raise
+
+        blocked = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(_execute_step, steps_by_id[step_id]): step_id
+                for step_id in order if step_id not in completed and remaining[step_id] == 0
+            }
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_id = futures.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        result['executed'].append(step_id)
+                        self._write_journal(journal_lock, {'Id': step_id, 'Status': 'completed'})
+                        for dependent in dependents[step_id]:
+                            remaining[dependent] -= 1
+                            if remaining[dependent] == 0:
+                                futures[executor.submit(_execute_step, steps_by_id[dependent])] = dependent
+                    else:
+                        result['failed'][step_id] = f'{type(error).__name__}: {error}'
+                        self._write_journal(journal_lock, {
+                            'Id': step_id, 'Status': 'failed', 'Error': result['failed'][step_id]
+                        })
+                        pending = list(dependents[step_id])
+                        while pending:
+                            dependent = pending.pop()
+                            if dependent not in blocked:
+                                blocked.add(dependent)
+                                pending.extend(dependents[dependent])
+
+        result['blocked'] = [step_id for step_id in order if step_id in blocked]
+
+        return result
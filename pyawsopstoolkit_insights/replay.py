@@ -0,0 +1,818 @@
+import copy
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Optional
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from pyawsopstoolkit.session import Session
+
+from pyawsopstoolkit_insights.__validations__ import _validate_type
+
+# The services whose responses do not depend on the region of the client.
+_GLOBAL_SERVICES = ('iam', 'sts')
+
+# The services paginating their list calls by default, e.g. IAM with a MaxItems of 100. Other services, e.g. EC2,
+# return every item in a single page unless the call specifies a limit.
+_PAGED_SERVICES = ('iam',)
+
+# The error codes and HTTP status codes of throttled calls by service, defaulting to Throttling.
+_THROTTLING_ERRORS = {'ec2': ('RequestLimitExceeded', 503)}
+
+_PARAMS_CONTEXT_KEY = 'replay_params'
+
+
+def _decode(value: dict):
+    """
+    Restores the datetime values encoded by _encode while loading a recording.
+
+    :param value: The decoded JSON object.
+    :type value: dict
+    :return: The datetime, or the JSON object itself.
+    :rtype: Any
+    """
+    if set(value) == {'$datetime'}:
+        return datetime.fromisoformat(value['$datetime'])
+
+    return value
+
+
+def _encode(value):
+    """
+    Encodes the datetime values of a boto3 response, which are not JSON serializable, while saving a recording.
+
+    :param value: The value to be encoded.
+    :type value: Any
+    :return: The JSON serializable value.
+    :rtype: Any
+    """
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+
+    raise TypeError(f'{type(value).__name__} is not JSON serializable.')
+
+
+@lru_cache(maxsize=None)
+def _paginator_config(service_name: str, operation_name: str) -> dict:
+    """
+    Returns the botocore pagination configuration of the given operation, holding its input_token, output_token,
+    limit_key, result_key and, for some services, more_results.
+
+    :param service_name: The name of the AWS service, e.g. 'iam'.
+    :type service_name: str
+    :param operation_name: The name of the paginated operation, e.g. 'ListRoles'.
+    :type operation_name: str
+    :return: The pagination configuration.
+    :rtype: dict
+    """
+    import botocore.session
+
+    return dict(botocore.session.get_session().get_paginator_model(service_name).get_paginator(operation_name))
+
+
+def _params_key(params: dict) -> str:
+    """
+    Returns the canonical representation of the given boto3 operation parameters.
+
+    :param params: The boto3 operation parameters.
+    :type params: dict
+    :return: The canonical representation.
+    :rtype: str
+    """
+    return json.dumps(params, sort_keys=True, default=_encode)
+
+
+def _filter_key(_filter: dict) -> str:
+    """
+    Returns the item key of the given EC2 filter, e.g. Status for 'status' and GroupId for 'group-id'.
+
+    :param _filter: The EC2 filter.
+    :type _filter: dict
+    :return: The item key.
+    :rtype: str
+    """
+    return ''.join(part.capitalize() for part in _filter.get('Name', '').split('-'))
+
+
+def _matches_filters(item: dict, filters: list) -> bool:
+    """
+    Verifies if the given item matches the given EC2 filters. Items without the key of a filter do not match it.
+
+    :param item: The boto3 item.
+    :type item: dict
+    :param filters: The EC2 filters.
+    :type filters: list
+    :return: True if the item matches all filters, otherwise False.
+    :rtype: bool
+    """
+    for _filter in filters:
+        key = _filter_key(_filter)
+        if key not in item or str(item[key]) not in _filter.get('Values', []):
+            return False
+
+    return True
+
+
+def _invalid_filter(operation_name: str, name: str):
+    """
+    Returns the botocore ClientError raised by EC2 for an unsupported filter.
+
+    :param operation_name: The name of the operation, e.g. 'DescribeVolumes'.
+    :type operation_name: str
+    :param name: The name of the filter.
+    :type name: str
+    :return: The botocore ClientError.
+    :rtype: botocore.exceptions.ClientError
+    """
+    from botocore.exceptions import ClientError
+
+    return ClientError(
+        {'Error': {'Code': 'InvalidParameterValue', 'Message': f"The filter '{name}' is invalid"}}, operation_name
+    )
+
+
+def _no_such_entity(operation_name: str, message: str):
+    """
+    Returns the botocore ClientError raised by IAM for a missing entity.
+
+    :param operation_name: The name of the operation, e.g. 'GetRole'.
+    :type operation_name: str
+    :param message: The error message.
+    :type message: str
+    :return: The botocore ClientError.
+    :rtype: botocore.exceptions.ClientError
+    """
+    from botocore.exceptions import ClientError
+
+    return ClientError({'Error': {'Code': 'NoSuchEntity', 'Message': message}}, operation_name)
+
+
+def _http_body(protocol: str, operation_name: str, response: dict) -> bytes:
+    """
+    Returns the HTTP body of the given response in the wire format of the given botocore protocol. The body of an error
+    holds its code and message, for botocore's retry handler to classify it, while the body of a successful response is
+    empty, since the response replaces the parsed body once the call completes.
+
+    :param protocol: The botocore protocol of the service, e.g. 'query' or 'ec2'.
+    :type protocol: str
+    :param operation_name: The name of the operation, e.g. 'ListRoles'.
+    :type operation_name: str
+    :param response: The parsed response.
+    :type response: dict
+    :return: The HTTP body.
+    :rtype: bytes
+    """
+    error = response.get('Error')
+    if protocol in ('json', 'rest-json'):
+        return json.dumps({'__type': error.get('Code'), 'message': error.get('Message')} if error else {}).encode()
+    if error is None:
+        return f'<{operation_name}Response><{operation_name}Result/></{operation_name}Response>'.encode()
+
+    error = f'<Code>{escape(str(error.get("Code")))}</Code><Message>{escape(str(error.get("Message")))}</Message>'
+    if protocol == 'ec2':
+        return f'<Response><Errors><Error>{error}</Error></Errors><RequestID>replay</RequestID></Response>'.encode()
+    if protocol == 'query':
+        error = f'<Error><Type>Sender</Type>{error}</Error>'
+        return f'<ErrorResponse>{error}<RequestId>replay</RequestId></ErrorResponse>'.encode()
+
+    return f'<Error>{error}<RequestId>replay</RequestId></Error>'.encode()
+
+
+class _RawResponse:
+    """
+    A class representing the raw HTTP response of a replayed call, streaming the given body as expected by botocore.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+class _ClientFactory:
+    """
+    A class creating boto3 clients from a single boto3 session, serializing the creation since boto3 sessions are not
+    thread safe. An optional botocore Config is merged under the Config of every client, and an optional callable is
+    invoked with every client created.
+    """
+
+    def __init__(self, session, on_client: Optional[Callable] = None, config=None) -> None:
+        self._session = session
+        self._on_client = on_client
+        self._config = config
+        self._lock = threading.Lock()
+
+    def client(self, service_name: str, **kwargs):
+        """
+        Creates a boto3 client for the specified service.
+
+        :param service_name: The name of the AWS service, e.g. 'iam' or 'ec2'.
+        :type service_name: str
+        :return: The boto3 client.
+        :rtype: botocore.client.BaseClient
+        """
+        if self._config is not None:
+            kwargs['config'] = self._config.merge(kwargs['config']) if kwargs.get('config') else self._config
+
+        with self._lock:
+            client = self._session.client(service_name, **kwargs)
+
+        if self._on_client is not None:
+            self._on_client(client)
+
+        return client
+
+
+class _ReplaySession(Session):
+    """
+    A class representing a Session whose boto3 clients are served by a ReplayBackend instead of AWS.
+    """
+
+    def __init__(self, backend, region_code: str) -> None:
+        from botocore.config import Config
+
+        super().__init__(profile_name=f'replay-{id(backend)}', region_code=region_code)
+        self._factory = _ClientFactory(
+            backend._boto3_session(region_code), backend._register_server,
+            Config(retries={'total_max_attempts': backend.max_attempts})
+        )
+
+    def get_session(self):
+        return self._factory
+
+
+class _RecordingSession(Session):
+    """
+    A class representing a Session forwarding to the given Session, while recording every call into a ReplayBackend.
+    """
+
+    def __init__(self, backend, session: Session) -> None:
+        super().__init__(
+            profile_name=session.profile_name,
+            credentials=session.credentials,
+            region_code=session.region_code,
+            cert_path=session.cert_path
+        )
+        self._backend = backend
+        self._source = session
+
+    def get_session(self):
+        return _ClientFactory(self._source.get_session(), self._backend._register_recorder)
+
+
+@dataclass
+class ReplayBackend:
+    """
+    A class representing an offline backend serving recorded or synthetic IAM and EC2 responses to the unmodified
+    insights, through real boto3 clients and paginators. Every HTTP request is delayed by latency seconds, and
+    throttled with a probability of throttle_rate, in which case botocore's retry handler retries it with its own
+    exponential backoff, up to max_attempts attempts unless the client configures its own retries. The API calls
+    made, the throttled calls, the maximum number of concurrent calls and the throughput are reported.
+    """
+
+    account: Optional[str] = '123456789012'
+    latency: Optional[float] = 0.0
+    throttle_rate: Optional[float] = 0.0
+    max_attempts: Optional[int] = 5
+    page_size: Optional[int] = 100
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._random = random.Random(self.seed)
+        self._responses = {}
+        self._handlers = {}
+        self._items = {}
+        self.reset_stats()
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['account']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+        elif field_name in ['latency']:
+            _validate_type(field_value, (int, float), f'{field_name} should be a number.')
+            if field_value < 0:
+                raise ValueError(f'{field_name} should not be negative.')
+        elif field_name in ['throttle_rate']:
+            _validate_type(field_value, (int, float), f'{field_name} should be a number.')
+            if not 0 <= field_value <= 1:
+                raise ValueError(f'{field_name} should be between 0 and 1.')
+        elif field_name in ['max_attempts', 'page_size']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+        elif field_name in ['seed']:
+            _validate_type(field_value, (int, type(None)), f'{field_name} should be an integer.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    @staticmethod
+    def _region_key(service_name: str, region: Optional[str]) -> Optional[str]:
+        """
+        Returns the region under which the responses of the given service are stored.
+
+        :param service_name: The name of the AWS service.
+        :type service_name: str
+        :param region: The region of the client.
+        :type region: str
+        :return: The region, or None for global services.
+        :rtype: str
+        """
+        return None if service_name in _GLOBAL_SERVICES else region
+
+    def _boto3_session(self, region_code: str):
+        """
+        Creates a boto3 session whose calls are served by this backend. The credentials are never used, since no
+        request is sent.
+
+        :param region_code: The default region of the session.
+        :type region_code: str
+        :return: The boto3 session.
+        :rtype: boto3.Session
+        """
+        import boto3
+
+        session = boto3.Session(
+            aws_access_key_id='replay', aws_secret_access_key='replay', region_name=region_code
+        )
+        session.events.register('before-parameter-build', self._stash_params)
+        session.events.register('before-call', self._before_call)
+        session.events.register('before-send', self._before_send)
+
+        return session
+
+    def _register_recorder(self, client) -> None:
+        """
+        Registers the handlers recording every call of the given boto3 client.
+
+        :param client: The boto3 client.
+        :type client: botocore.client.BaseClient
+        """
+        client.meta.events.register('before-parameter-build', self._stash_params)
+        client.meta.events.register_first(
+            f'after-call.{client.meta.service_model.service_id.hyphenize()}', self._record
+        )
+
+    def _register_server(self, client) -> None:
+        """
+        Registers the handler replacing the parsed responses of the given boto3 client by the replayed responses,
+        ahead of botocore's post-processing.
+
+        :param client: The boto3 client.
+        :type client: botocore.client.BaseClient
+        """
+        client.meta.events.register_first(
+            f'after-call.{client.meta.service_model.service_id.hyphenize()}', self._serve
+        )
+
+    @staticmethod
+    def _stash_params(params, context, **kwargs) -> None:
+        context[_PARAMS_CONTEXT_KEY] = dict(params)
+
+    def _record(self, http_response, parsed, model, context, **kwargs) -> None:
+        service_name = model.service_model.service_name
+        response = copy.deepcopy({key: value for key, value in parsed.items() if key != 'ResponseMetadata'})
+        self.add_response(
+            service_name, model.name, response, context.get(_PARAMS_CONTEXT_KEY, {}),
+            context.get('client_region'), http_response.status_code
+        )
+
+    def _before_call(self, model, context, **kwargs) -> None:
+        region = self._region_key(model.service_model.service_name, context.get('client_region'))
+        self._local.call = (model, region, context.get(_PARAMS_CONTEXT_KEY, {}))
+
+    def _before_send(self, request, **kwargs):
+        from botocore.awsrequest import AWSResponse
+
+        model, region, params = self._local.call
+        service_name = model.service_model.service_name
+        operation = f'{service_name}.{model.name}'
+
+        with self._lock:
+            self._active += 1
+            self._max_active = max(self._max_active, self._active)
+            if self._started is None:
+                self._started = time.perf_counter()
+            self._calls[operation] = self._calls.get(operation, 0) + 1
+            throttled = self._random.random() < self.throttle_rate
+            if throttled:
+                self._throttled += 1
+
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if throttled:
+                code, status_code = _THROTTLING_ERRORS.get(service_name, ('Throttling', 400))
+                response = {'Error': {'Code': code, 'Message': 'Rate exceeded'}}
+            else:
+                status_code, response = self._respond(service_name, region, model, params)
+
+            self._local.response = copy.deepcopy(response)
+            body = _http_body(model.service_model.protocol, model.name, response)
+
+            return AWSResponse(request.url, status_code, {}, _RawResponse(body))
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._finished = time.perf_counter()
+
+    def _serve(self, parsed, **kwargs) -> None:
+        response = self._local.__dict__.pop('response', None)
+        if response is not None:
+            metadata = parsed.get('ResponseMetadata')
+            parsed.clear()
+            parsed.update(response)
+            if metadata is not None:
+                parsed['ResponseMetadata'] = metadata
+
+    def _respond(self, service_name: str, region: Optional[str], model, params: dict) -> tuple:
+        """
+        Returns the HTTP status code and the parsed response of the given call, from the recorded responses, handlers
+        and paginated items in this order.
+
+        :param service_name: The name of the AWS service.
+        :type service_name: str
+        :param region: The region of the call, or None for global services.
+        :type region: str
+        :param model: The botocore operation model.
+        :type model: botocore.model.OperationModel
+        :param params: The boto3 operation parameters.
+        :type params: dict
+        :return: The HTTP status code and the parsed response.
+        :rtype: tuple
+        """
+        from botocore.exceptions import ClientError
+
+        operation_name = model.name
+        for region_key in dict.fromkeys((region, None)):
+            recorded = self._responses.get((service_name, region_key, operation_name, _params_key(params)))
+            if recorded is not None:
+                return recorded
+
+        try:
+            handler = self._handlers.get((service_name, operation_name))
+            if handler is not None:
+                return 200, handler(params)
+
+            for region_key in dict.fromkeys((region, None)):
+                items = self._items.get((service_name, region_key, operation_name))
+                if items is not None:
+                    return 200, self._page(service_name, operation_name, items, params)
+        except ClientError as e:
+            return e.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 400), {
+                key: value for key, value in e.response.items() if key != 'ResponseMetadata'
+            }
+
+        if (service_name, operation_name) == ('sts', 'GetCallerIdentity'):
+            return 200, {
+                'UserId': 'AIDAREPLAY', 'Account': self.account, 'Arn': f'arn:aws:iam::{self.account}:user/replay'
+            }
+
+        return 400, {'Error': {
+            'Code': 'ReplayResponseNotFound', 'Message': f'No response for {service_name}.{operation_name}.'
+        }}
+
+    def _page(self, service_name: str, operation_name: str, items: list, params: dict) -> dict:
+        """
+        Returns a page of the given items, following the pagination tokens and limit of the operation, with the items
+        not matching the EC2 filters, if any, skipped. Only the services paginating by default apply page_size to the
+        calls without a limit, and filters whose key none of the items holds are rejected, as EC2 does.
+
+        :param service_name: The name of the AWS service.
+        :type service_name: str
+        :param operation_name: The name of the operation, e.g. 'ListRoles'.
+        :type operation_name: str
+        :param items: The items of the operation.
+        :type items: list
+        :param params: The boto3 operation parameters.
+        :type params: dict
+        :return: The page.
+        :rtype: dict
+        :raises botocore.exceptions.ClientError: If a filter is not supported by the items.
+        """
+        paginator = _paginator_config(service_name, operation_name)
+        limit = params.get(paginator['limit_key']) or (self.page_size if service_name in _PAGED_SERVICES else None)
+        filters = params.get('Filters', [])
+        for _filter in filters:
+            if items and not any(_filter_key(_filter) in item for item in items):
+                raise _invalid_filter(operation_name, _filter.get('Name', ''))
+
+        page = []
+        index = int(params.get(paginator['input_token']) or 0)
+        while index < len(items) and (limit is None or len(page) < limit):
+            if _matches_filters(items[index], filters):
+                page.append(items[index])
+            index += 1
+
+        response = {paginator['result_key']: page}
+        truncated = index < len(items)
+        if truncated:
+            response[paginator['output_token']] = str(index)
+        if 'more_results' in paginator:
+            response[paginator['more_results']] = truncated
+
+        return response
+
+    def add_response(
+            self,
+            service_name: str,
+            operation_name: str,
+            response: dict,
+            params: Optional[dict] = None,
+            region: Optional[str] = None,
+            status_code: Optional[int] = 200
+    ) -> None:
+        """
+        Adds the response of a call with the exact given parameters. Error responses hold the Error key and a status
+        code of 400 or more. Responses, including those of handlers and items, are given as parsed by botocore before
+        its post-processing, e.g. with the IAM policy documents URL-encoded.
+
+        :param service_name: The name of the AWS service, e.g. 'iam'.
+        :type service_name: str
+        :param operation_name: The name of the operation, e.g. 'GetRole'.
+        :type operation_name: str
+        :param response: The parsed response.
+        :type response: dict
+        :param params: The boto3 operation parameters. Defaults to no parameters.
+        :type params: dict
+        :param region: The region of the call. Defaults to any region.
+        :type region: str
+        :param status_code: The HTTP status code. Defaults to 200.
+        :type status_code: int
+        """
+        key = (service_name, self._region_key(service_name, region), operation_name, _params_key(params or {}))
+        with self._lock:
+            self._responses[key] = (status_code, response)
+
+    def add_handler(self, service_name: str, operation_name: str, handler: Callable) -> None:
+        """
+        Adds a handler serving the calls of the given operation which have no recorded response. The handler receives
+        the boto3 operation parameters and returns the parsed response, or raises a botocore ClientError, which is
+        served as an error response.
+
+        :param service_name: The name of the AWS service, e.g. 'iam'.
+        :type service_name: str
+        :param operation_name: The name of the operation, e.g. 'GetRole'.
+        :type operation_name: str
+        :param handler: The handler.
+        :type handler: Callable
+        """
+        with self._lock:
+            self._handlers[(service_name, operation_name)] = handler
+
+    def add_items(self, service_name: str, operation_name: str, items: list, region: Optional[str] = None) -> None:
+        """
+        Adds the items served by the given paginated operation, page by page, to the calls which have neither a
+        recorded response nor a handler.
+
+        :param service_name: The name of the AWS service, e.g. 'iam'.
+        :type service_name: str
+        :param operation_name: The name of the paginated operation, e.g. 'ListRoles'.
+        :type operation_name: str
+        :param items: The items.
+        :type items: list
+        :param region: The region of the items. Defaults to any region.
+        :type region: str
+        """
+        with self._lock:
+            self._items[(service_name, self._region_key(service_name, region), operation_name)] = list(items)
+
+    def populate(
+            self,
+            roles: Optional[int] = 0,
+            users: Optional[int] = 0,
+            security_groups: Optional[int] = 0,
+            network_interfaces: Optional[int] = 0,
+            region: Optional[str] = None
+    ) -> None:
+        """
+        Adds synthetic IAM roles and users and EC2 security groups and network interfaces. Every other role and user,
+        starting with the first, was used today, and the others were never used. Every other network interface,
+        starting with the first, is in use, and the network interfaces reference the first half of the security groups.
+
+        :param roles: The number of IAM roles. Defaults to 0.
+        :type roles: int
+        :param users: The number of IAM users. Defaults to 0.
+        :type users: int
+        :param security_groups: The number of EC2 security groups. Defaults to 0.
+        :type security_groups: int
+        :param network_interfaces: The number of EC2 network interfaces. Defaults to 0.
+        :type network_interfaces: int
+        :param region: The region of the EC2 resources. Defaults to any region.
+        :type region: str
+        """
+        for name, value in (
+                ('roles', roles), ('users', users), ('security_groups', security_groups),
+                ('network_interfaces', network_interfaces)
+        ):
+            _validate_type(value, int, f'{name} should be an integer.')
+        _validate_type(region, (str, type(None)), 'region should be a string.')
+
+        created_date = datetime(2022, 3, 15, tzinfo=timezone.utc)
+        used_date = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        role_list = [{
+            'Path': '/',
+            'RoleName': f'role{i}',
+            'RoleId': f'AROAREPLAY{i}',
+            'Arn': f'arn:aws:iam::{self.account}:role/role{i}',
+            'CreateDate': created_date,
+            'AssumeRolePolicyDocument': quote(json.dumps({'Version': '2012-10-17', 'Statement': [{
+                'Effect': 'Allow', 'Principal': {'Service': 'ec2.amazonaws.com'}, 'Action': 'sts:AssumeRole'
+            }]})),
+            'MaxSessionDuration': 3600
+        } for i in range(roles)]
+        role_index = {role['RoleName']: i for i, role in enumerate(role_list)}
+
+        def _get_role(params):
+            i = role_index.get(params.get('RoleName'))
+            if i is None:
+                raise _no_such_entity('GetRole', f'The role with name {params.get("RoleName")} cannot be found.')
+
+            return {'Role': {
+                **role_list[i], 'Tags': [], 'RoleLastUsed': {'LastUsedDate': used_date} if i % 2 == 0 else {}
+            }}
+
+        user_list = [{
+            'Path': '/',
+            'UserName': f'user{i}',
+            'UserId': f'AIDAREPLAY{i}',
+            'Arn': f'arn:aws:iam::{self.account}:user/user{i}',
+            'CreateDate': created_date,
+            **({'PasswordLastUsed': used_date} if i % 2 == 0 else {})
+        } for i in range(users)]
+        user_index = {user['UserName']: i for i, user in enumerate(user_list)}
+
+        def _get_user(params):
+            i = user_index.get(params.get('UserName'))
+            if i is None:
+                raise _no_such_entity('GetUser', f'The user with name {params.get("UserName")} cannot be found.')
+
+            return {'User': {**user_list[i], 'Tags': []}}
+
+        def _get_login_profile(params):
+            i = user_index.get(params.get('UserName'))
+            if i is None or i % 2 == 1:
+                raise _no_such_entity(
+                    'GetLoginProfile', f'Login Profile for User {params.get("UserName")} cannot be found.'
+                )
+
+            return {'LoginProfile': {'UserName': params.get('UserName'), 'CreateDate': created_date}}
+
+        group_list = [{
+            'GroupId': f'sg-{i:08x}',
+            'GroupName': f'group{i}',
+            'Description': f'Security group group{i}',
+            'OwnerId': self.account,
+            'VpcId': 'vpc-1a2b3c4d',
+            'IpPermissions': [],
+            'IpPermissionsEgress': []
+        } for i in range(security_groups)]
+
+        network_interface_list = [{
+            'NetworkInterfaceId': f'eni-{i:08x}',
+            'Status': 'in-use' if i % 2 == 0 else 'available',
+            'OwnerId': self.account,
+            'VpcId': 'vpc-1a2b3c4d',
+            'Groups': [{
+                'GroupId': f'sg-{i % max(1, security_groups // 2):08x}',
+                'GroupName': f'group{i % max(1, security_groups // 2)}'
+            }] if security_groups else [],
+            **({'Attachment': {
+                'AttachmentId': f'eni-attach-{i:08x}', 'InstanceId': f'i-{i:08x}', 'Status': 'attached'
+            }} if i % 2 == 0 else {})
+        } for i in range(network_interfaces)]
+
+        self.add_items('iam', 'ListRoles', role_list)
+        self.add_handler('iam', 'GetRole', _get_role)
+        self.add_items('iam', 'ListUsers', user_list)
+        self.add_handler('iam', 'GetUser', _get_user)
+        self.add_handler('iam', 'GetLoginProfile', _get_login_profile)
+        self.add_handler('iam', 'ListAccessKeys', lambda params: {'AccessKeyMetadata': [], 'IsTruncated': False})
+        self.add_items('ec2', 'DescribeSecurityGroups', group_list, region)
+        self.add_items('ec2', 'DescribeNetworkInterfaces', network_interface_list, region)
+
+    def session(self, region_code: Optional[str] = 'eu-west-1') -> Session:
+        """
+        Returns a Session whose boto3 clients are served by this backend, to be passed to the insights.
+
+        :param region_code: The default region of the session. Defaults to 'eu-west-1'.
+        :type region_code: str
+        :return: The Session object.
+        :rtype: pyawsopstoolkit.session.Session
+        """
+        return _ReplaySession(self, region_code)
+
+    def record(self, session: Session) -> Session:
+        """
+        Returns a Session forwarding to the given Session, while recording every call and its response into this
+        backend, so that they can be replayed or saved.
+
+        :param session: The Session object to be recorded.
+        :type session: pyawsopstoolkit.session.Session
+        :return: The recording Session object.
+        :rtype: pyawsopstoolkit.session.Session
+        """
+        _validate_type(session, Session, 'session should be of Session type.')
+
+        return _RecordingSession(self, session)
+
+    def save(self, path: str) -> int:
+        """
+        Saves the recorded responses as JSON Lines.
+
+        :param path: The path of the recording.
+        :type path: str
+        :return: The number of responses saved.
+        :rtype: int
+        """
+        _validate_type(path, str, 'path should be a string.')
+
+        with self._lock:
+            responses = list(self._responses.items())
+
+        with open(path, 'w', encoding='utf-8') as file:
+            for (service_name, region, operation_name, params), (status_code, response) in responses:
+                file.write(json.dumps({
+                    'Service': service_name,
+                    'Region': region,
+                    'Operation': operation_name,
+                    'Parameters': json.loads(params, object_hook=_decode),
+                    'StatusCode': status_code,
+                    'Response': response
+                }, default=_encode) + '\n')
+
+        return len(responses)
+
+    def load(self, path: str) -> int:
+        """
+        Loads the responses saved as JSON Lines.
+
+        :param path: The path of the recording.
+        :type path: str
+        :return: The number of responses loaded.
+        :rtype: int
+        """
+        _validate_type(path, str, 'path should be a string.')
+
+        count = 0
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line, object_hook=_decode)
+                self.add_response(
+                    entry.get('Service'), entry.get('Operation'), entry.get('Response', {}), entry.get('Parameters'),
+                    entry.get('Region'), entry.get('StatusCode', 200)
+                )
+                count += 1
+
+        return count
+
+    def reset_stats(self) -> None:
+        """
+        Resets the statistics of the calls.
+        """
+        with self._lock:
+            self._calls = {}
+            self._throttled = 0
+            self._active = 0
+            self._max_active = 0
+            self._started = None
+            self._finished = None
+
+    def stats(self) -> dict:
+        """
+        Returns the statistics of the calls since the backend was created or reset: the number of calls by operation,
+        e.g. 'iam.ListRoles', including throttled attempts, the total number of calls, the number of throttled calls,
+        the maximum number of concurrent calls, the elapsed seconds between the first call and the last response, and
+        the throughput in calls per second.
+
+        :return: The statistics of the calls.
+        :rtype: dict
+        """
+        with self._lock:
+            total_calls = sum(self._calls.values())
+            elapsed = self._finished - self._started if self._started is not None else 0.0
+
+            return {
+                'calls': dict(sorted(self._calls.items())),
+                'total_calls': total_calls,
+                'throttled': self._throttled,
+                'max_concurrency': self._max_active,
+                'elapsed': elapsed,
+                'throughput': total_calls / elapsed if elapsed > 0 else 0.0
+            }
@@ -0,0 +1,445 @@
+import csv
+import gzip
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Optional
+
+from pyawsopstoolkit_insights.__validations__ import _validate_type
+
+
+@contextmanager
+def _atomic_path(path: str):
+    """
+    Provides a temporary path within the directory of the given path, which replaces the given path once the block
+    completes, and is removed if the block fails. A report is therefore either written completely or not at all.
+
+    :param path: The path of the report.
+    :type path: str
+    :return: The temporary path to be written.
+    :rtype: str
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    temp_path = os.path.join(directory, f'.{name}.{uuid.uuid4().hex}.tmp')
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _batched(records: Iterable, batch_size: int):
+    """
+    Yields lists of at most batch_size records from the given iterable without materializing it.
+
+    :param records: The records to be grouped.
+    :type records: Iterable
+    :param batch_size: The maximum number of records per batch.
+    :type batch_size: int
+    :return: A generator of record batches.
+    :rtype: Generator
+    """
+    iterator = iter(records)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def _flatten_record(record: dict) -> dict:
+    """
+    Converts nested dictionaries and lists within a record into JSON strings, producing a single level record with
+    stable columns suitable for tabular formats.
+
+    :param record: The record to be flattened.
+    :type record: dict
+    :return: The flattened record.
+    :rtype: dict
+    """
+    return {
+        key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+        for key, value in record.items()
+    }
+
+
+def _columns(rows: list) -> list:
+    """
+    Returns the keys of the given rows, in order of first appearance.
+
+    :param rows: The flattened rows.
+    :type rows: list
+    :return: The column names.
+    :rtype: list
+    """
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def _validate_columns(rows: list, columns: list) -> None:
+    """
+    Validates that the given rows hold no key outside of the given columns, so that no value is silently discarded.
+
+    :param rows: The flattened rows.
+    :type rows: list
+    :param columns: The column names of the report.
+    :type columns: list
+    """
+    unexpected = set(_columns(rows)) - set(columns)
+    if unexpected:
+        raise ValueError(
+            f'records hold keys which are not columns of the report: {", ".join(sorted(unexpected))}. Provide the '
+            f'columns of the report upfront.'
+        )
+
+
+def _import_pyarrow():
+    """
+    Imports the optional pyarrow dependency required for Arrow and Parquet reports.
+
+    :return: The pyarrow module.
+    :rtype: module
+    """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            'pyarrow is required for Arrow and Parquet reports. Install it using "pip install pyarrow".'
+        ) from e
+
+    return pyarrow
+
+
+def _open_text(path: str, compress: bool):
+    """
+    Opens the given path for writing text, optionally gzip compressed.
+
+    :param path: The path of the file to be written.
+    :type path: str
+    :param compress: Flag to indicate if the file should be gzip compressed.
+    :type compress: bool
+    :return: A writable text file object.
+    :rtype: TextIO
+    """
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _to_record(item) -> dict:
+    """
+    Converts an insight result into a dictionary. Results are expected to be either dictionaries or
+    pyawsopstoolkit_models objects exposing to_dict.
+
+    :param item: The insight result to be converted.
+    :type item: Any
+    :return: Dictionary representation of the insight result.
+    :rtype: dict
+    """
+    if isinstance(item, dict):
+        return item
+
+    if hasattr(item, 'to_dict'):
+        return item.to_dict()
+
+    raise TypeError('records should be dictionaries or objects exposing to_dict.')
+
+
+def _to_arrow_table(pa, rows: list, schema=None):
+    """
+    Builds a pyarrow Table from the given flattened rows. When no schema is provided, it is inferred from the keys of
+    all rows, and columns containing only null values are typed as strings so that subsequent batches can be appended.
+    Rows holding keys outside of the schema are rejected.
+
+    :param pa: The pyarrow module.
+    :type pa: module
+    :param rows: The flattened rows to be converted.
+    :type rows: list
+    :param schema: The schema to be applied, if already known.
+    :type schema: pyarrow.Schema
+    :return: The pyarrow Table.
+    :rtype: pyarrow.Table
+    """
+    if schema is None:
+        columns = _columns(rows)
+        inferred = pa.Table.from_pylist([{column: row.get(column) for column in columns} for row in rows]).schema
+        schema = pa.schema([
+            pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field for field in inferred
+        ])
+
+    _validate_columns(rows, schema.names)
+
+    string_columns = [field.name for field in schema if pa.types.is_string(field.type)]
+    for row in rows:
+        for column in string_columns:
+            value = row.get(column)
+            if value is not None and not isinstance(value, str):
+                row[column] = str(value)
+
+    return pa.Table.from_pylist(rows, schema=schema)
+
+
+@dataclass
+class JSONLWriter:
+    """
+    A class representing a streaming JSON Lines report writer. Records are serialized in fixed-size batches so that
+    memory usage stays bounded regardless of the number of records.
+    """
+
+    path: str
+    batch_size: Optional[int] = 1000
+    compress: Optional[bool] = False
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['path']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+        elif field_name in ['batch_size']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+        elif field_name in ['compress']:
+            _validate_type(field_value, bool, f'{field_name} should be a boolean.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def write(self, records: Iterable) -> int:
+        """
+        Writes the given records as JSON Lines, one record per line, gzip compressed if requested. The report is written
+        to a temporary file replacing path only once complete.
+
+        :param records: The insight results to be written. Can be a list or any iterable, including generators.
+        :type records: Iterable
+        :return: The number of records written.
+        :rtype: int
+        """
+        count = 0
+
+        with _atomic_path(self.path) as path, _open_text(path, self.compress) as handle:
+            for batch in _batched(records, self.batch_size):
+                handle.write(''.join(json.dumps(_to_record(item), default=str) + '\n' for item in batch))
+                count += len(batch)
+
+        return count
+
+
+@dataclass
+class CSVWriter:
+    """
+    A class representing a streaming CSV report writer. Columns are taken from fieldnames if provided, otherwise from
+    the keys of the first batch, and records holding any other key are rejected rather than truncated. Nested values
+    are written as JSON strings.
+    """
+
+    path: str
+    batch_size: Optional[int] = 1000
+    compress: Optional[bool] = False
+    fieldnames: Optional[list] = None
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['path']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+        elif field_name in ['batch_size']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+        elif field_name in ['compress']:
+            _validate_type(field_value, bool, f'{field_name} should be a boolean.')
+        elif field_name in ['fieldnames']:
+            _validate_type(field_value, (list, type(None)), f'{field_name} should be a list of strings.')
+            if field_value is not None and not all(isinstance(name, str) for name in field_value):
+                raise TypeError(f'{field_name} should be a list of strings.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def write(self, records: Iterable) -> int:
+        """
+        Writes the given records as CSV, gzip compressed if requested. Keys missing from a record are written as empty
+        values, whereas a ValueError is raised for a key which is not a column, e.g. an optional key first appearing
+        after the first batch when fieldnames is not provided. The report is written to a temporary file replacing path
+        only once complete, so that a failed write leaves no truncated report. The header is written even when there are
+        no records, if fieldnames is provided.
+
+        :param records: The insight results to be written. Can be a list or any iterable, including generators.
+        :type records: Iterable
+        :return: The number of records written.
+        :rtype: int
+        """
+        count = 0
+
+        with _atomic_path(self.path) as path, _open_text(path, self.compress) as handle:
+            writer = None
+            if self.fieldnames is not None:
+                writer = csv.DictWriter(handle, fieldnames=self.fieldnames)
+                writer.writeheader()
+
+            for batch in _batched(records, self.batch_size):
+                rows = [_flatten_record(_to_record(item)) for item in batch]
+                if writer is None:
+                    writer = csv.DictWriter(handle, fieldnames=_columns(rows))
+                    writer.writeheader()
+                _validate_columns(rows, writer.fieldnames)
+                writer.writerows(rows)
+                count += len(rows)
+
+        return count
+
+
+@dataclass
+class ParquetWriter:
+    """
+    A class representing a streaming Parquet report writer. Each batch is written as a separate row group. The schema
+    is taken from schema if provided, otherwise inferred from the first batch. Requires the optional pyarrow dependency.
+    """
+
+    path: str
+    batch_size: Optional[int] = 10000
+    compression: Optional[str] = 'snappy'
+    schema: Optional[object] = None
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['path', 'compression']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+        elif field_name in ['batch_size']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+        elif field_name in ['schema']:
+            if field_value is not None:
+                _validate_type(field_value, _import_pyarrow().Schema, f'{field_name} should be a pyarrow Schema.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def write(self, records: Iterable) -> int:
+        """
+        Writes the given records as a Parquet file. Unless provided, the schema is inferred from the keys of the first
+        batch, and a ValueError is raised for a key which is not part of the schema rather than discarding its values.
+        The report is written to a temporary file replacing path only once complete, so that a failed write leaves no
+        truncated report. When there are no records, a file holding the provided schema, if any, is written.
+
+        :param records: The insight results to be written. Can be a list or any iterable, including generators.
+        :type records: Iterable
+        :return: The number of records written.
+        :rtype: int
+        """
+        pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        count = 0
+        schema = self.schema
+        writer = None
+
+        with _atomic_path(self.path) as path:
+            try:
+                for batch in _batched(records, self.batch_size):
+                    rows = [_flatten_record(_to_record(item)) for item in batch]
+                    table = _to_arrow_table(pa, rows, schema)
+                    if writer is None:
+                        schema = table.schema
+                        writer = pq.ParquetWriter(path, schema, compression=self.compression)
+                    writer.write_table(table)
+                    count += len(rows)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, schema or pa.schema([]), compression=self.compression)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+        return count
+
+
+@dataclass
+class ArrowWriter:
+    """
+    A class representing a streaming Arrow IPC (Feather v2) report writer. Each batch is written as a separate record
+    batch. The schema is taken from schema if provided, otherwise inferred from the first batch. Requires the optional
+    pyarrow dependency.
+    """
+
+    path: str
+    batch_size: Optional[int] = 10000
+    schema: Optional[object] = None
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['path']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+        elif field_name in ['batch_size']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+            if field_value <= 0:
+                raise ValueError(f'{field_name} should be greater than zero.')
+        elif field_name in ['schema']:
+            if field_value is not None:
+                _validate_type(field_value, _import_pyarrow().Schema, f'{field_name} should be a pyarrow Schema.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def write(self, records: Iterable) -> int:
+        """
+        Writes the given records as an Arrow IPC file. Unless provided, the schema is inferred from the keys of the
+        first batch, and a ValueError is raised for a key which is not part of the schema rather than discarding its
+        values. The report is written to a temporary file replacing path only once complete, so that a failed write
+        leaves no truncated report. When there are no records, a file holding the provided schema, if any, is written.
+
+        :param records: The insight results to be written. Can be a list or any iterable, including generators.
+        :type records: Iterable
+        :return: The number of records written.
+        :rtype: int
+        """
+        pa = _import_pyarrow()
+
+        count = 0
+        schema = self.schema
+        writer = None
+
+        with _atomic_path(self.path) as path:
+            try:
+                for batch in _batched(records, self.batch_size):
+                    rows = [_flatten_record(_to_record(item)) for item in batch]
+                    table = _to_arrow_table(pa, rows, schema)
+                    if writer is None:
+                        schema = table.schema
+                        writer = pa.ipc.new_file(path, schema)
+                    writer.write_table(table)
+                    count += len(rows)
+                if writer is None:
+                    writer = pa.ipc.new_file(path, schema or pa.schema([]))
+            finally:
+                if writer is not None:
+                    writer.close()
+
+        return count
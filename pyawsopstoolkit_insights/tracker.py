@@ -0,0 +1,772 @@
+import copy
+import gzip
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from queue import Empty, Queue, SimpleQueue
+from typing import Iterator, Optional, Union
+
+from pyawsopstoolkit_insights.__fetch__ import _fetch_regions, _paginate
+from pyawsopstoolkit_insights.__validations__ import _validate_type
+
+
+def _iter_records(payload) -> Iterator[dict]:
+    """
+    Yields the CloudTrail records of the given payload, which is either a single record or a CloudTrail log file
+    object holding the records under the Records key.
+
+    :param payload: The CloudTrail record or log file object.
+    :type payload: dict
+    :return: A generator of CloudTrail records.
+    :rtype: Iterator[dict]
+    """
+    if not isinstance(payload, dict):
+        return
+
+    if 'Records' in payload:
+        yield from (record for record in payload.get('Records', []) if isinstance(record, dict))
+    else:
+        yield payload
+
+
+def _items(value: Optional[dict]) -> list:
+    """
+    Returns the items of a CloudTrail item set, e.g. {'items': [...]}.
+
+    :param value: The CloudTrail item set, if any.
+    :type value: dict
+    :return: The items of the set.
+    :rtype: list
+    """
+    return (value or {}).get('items', [])
+
+
+def _later(value: Optional[datetime], other: Optional[datetime]) -> Optional[datetime]:
+    """
+    Returns the most recent of the given datetimes, ignoring timezone information for the comparison.
+
+    :param value: The first datetime, if any.
+    :type value: datetime
+    :param other: The second datetime, if any.
+    :type other: datetime
+    :return: The most recent datetime, if any.
+    :rtype: datetime
+    """
+    from pyawsopstoolkit_insights.iam import _naive
+
+    if value is None or (other is not None and _naive(other) > _naive(value)):
+        return other
+
+    return value
+
+
+def _list_network_interfaces(client, region) -> list:
+    """
+    Utilizing boto3 EC2, this method retrieves all the ENIs (Elastic Network Interfaces) of the region. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/paginator/DescribeNetworkInterfaces.html
+
+    :param client: The boto3 EC2 client of the region.
+    :type client: botocore.client.EC2
+    :param region: The region of the client.
+    :type region: str
+    :return: A list of ENIs, including the Region key.
+    :rtype: list
+    """
+    return [
+        {**network_interface, 'Region': region}
+        for network_interface in _paginate(client, 'describe_network_interfaces', 'NetworkInterfaces')
+    ]
+
+
+def _list_security_groups(client, region) -> list:
+    """
+    Utilizing boto3 EC2, this method retrieves all the security groups of the region. Reference:
+    https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/paginator/DescribeSecurityGroups.html
+
+    :param client: The boto3 EC2 client of the region.
+    :type client: botocore.client.EC2
+    :param region: The region of the client.
+    :type region: str
+    :return: A list of security groups, including the Region key.
+    :rtype: list
+    """
+    return [{**sg, 'Region': region} for sg in _paginate(client, 'describe_security_groups', 'SecurityGroups')]
+
+
+def _parse_event_time(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parses the eventTime of a CloudTrail record, e.g. 2024-05-18T10:15:00Z, into a timezone aware datetime.
+
+    :param value: The eventTime of the CloudTrail record.
+    :type value: str
+    :return: The parsed datetime, if any.
+    :rtype: datetime
+    """
+    if not value:
+        return None
+
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+@dataclass
+class FileEventSource:
+    """
+    A class representing a source of CloudTrail-style events stored in a local file, optionally gzip compressed. Each
+    line of the file is either a single record or a CloudTrail log file object holding the records under the Records
+    key, hence both JSON Lines exports and CloudTrail log files are supported.
+    """
+
+    path: str
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['path']:
+            _validate_type(field_value, str, f'{field_name} should be a string.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def events(self) -> Iterator[dict]:
+        """
+        Yields the events of the file in order, reading it line by line.
+
+        :return: A generator of CloudTrail records.
+        :rtype: Iterator[dict]
+        """
+        _open = gzip.open if self.path.endswith('.gz') else open
+
+        with _open(self.path, 'rt', encoding='utf-8') as handle:
+            for line in handle:
+                if line.strip():
+                    yield from _iter_records(json.loads(line))
+
+
+@dataclass
+class QueueEventSource:
+    """
+    A class representing a source of CloudTrail-style events pushed to an in-process queue, standing in for a message
+    queue such as SQS. Each queue item is either a single record or a CloudTrail log file object.
+    """
+
+    queue: Union[Queue, SimpleQueue]
+    timeout: Optional[float] = None
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+    def __validate__(self, field_name):
+        field_value = getattr(self, field_name)
+        if field_name in ['queue']:
+            _validate_type(field_value, (Queue, SimpleQueue), f'{field_name} should be of Queue type.')
+        elif field_name in ['timeout']:
+            _validate_type(field_value, (int, float, type(None)), f'{field_name} should be a number.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def events(self) -> Iterator[dict]:
+        """
+        Yields the events of the queue until it is empty. When a timeout is set, waits up to timeout seconds for each
+        further event before stopping.
+
+        :return: A generator of CloudTrail records.
+        :rtype: Iterator[dict]
+        """
+        while True:
+            try:
+                if self.timeout is None:
+                    payload = self.queue.get_nowait()
+                else:
+                    payload = self.queue.get(timeout=self.timeout)
+            except Empty:
+                return
+
+            yield from _iter_records(payload)
+
+
+@dataclass
+class Tracker:
+    """
+    A class representing an event-driven tracker of unused IAM roles, IAM users, EC2 security groups and ENIs (Elastic
+    Network Interfaces). The state is seeded from one full scan and kept current by applying CloudTrail-style events,
+    so that queries are answered from memory instead of fresh scans.
+    """
+    from pyawsopstoolkit.session import Session
+
+    session: Session
+    no_of_days: Optional[int] = 90
+    include_newly_created: Optional[bool] = False
+
+    def __post_init__(self):
+        for field_name, field_value in self.__dataclass_fields__.items():
+            self.__validate__(field_name)
+
+        self._lock = threading.RLock()
+        self._roles = {}
+        self._users = {}
+        self._access_keys = {}
+        self._security_groups = {}
+        self._security_group_usage = {}
+        self._network_interfaces = {}
+        self._attachments = {}
+        self._regions = set()
+        self._account = None
+
+    def __validate__(self, field_name):
+        from pyawsopstoolkit.session import Session
+
+        field_value = getattr(self, field_name)
+        if field_name in ['session']:
+            _validate_type(field_value, Session, f'{field_name} should be of Session type.')
+        elif field_name in ['no_of_days']:
+            _validate_type(field_value, int, f'{field_name} should be an integer.')
+        elif field_name in ['include_newly_created']:
+            _validate_type(field_value, bool, f'{field_name} should be a boolean.')
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in self.__dataclass_fields__:
+            self.__validate__(key)
+
+    def _add_network_interface(self, network_interface: dict) -> None:
+        """
+        Tracks the given ENI, replacing any previous state, and counts it against its security groups.
+
+        :param network_interface: The boto3 EC2 ENI dictionary, including the Region key.
+        :type network_interface: dict
+        """
+        self._remove_network_interface(network_interface.get('NetworkInterfaceId', ''))
+
+        self._network_interfaces[network_interface.get('NetworkInterfaceId', '')] = network_interface
+        for group in network_interface.get('Groups', []):
+            group_id = group.get('GroupId', '')
+            self._security_group_usage[group_id] = self._security_group_usage.get(group_id, 0) + 1
+
+        attachment_id = network_interface.get('Attachment', {}).get('AttachmentId')
+        if attachment_id:
+            self._attachments[attachment_id] = network_interface.get('NetworkInterfaceId', '')
+
+    def _add_user(self, user: dict) -> None:
+        """
+        Tracks the given IAM user, indexing its access keys.
+
+        :param user: The boto3 IAM user dictionary, including LoginProfile and AccessKeys.
+        :type user: dict
+        """
+        self._users[user.get('UserName', '')] = user
+        for key in user.get('AccessKeys', []):
+            self._access_keys[key.get('access_key', {}).get('AccessKeyId', '')] = user.get('UserName', '')
+
+    def _remove_network_interface(self, network_interface_id: str) -> bool:
+        """
+        Stops tracking the given ENI, releasing its security groups.
+
+        :param network_interface_id: The ID of the ENI.
+        :type network_interface_id: str
+        :return: True if the ENI was tracked, otherwise False.
+        :rtype: bool
+        """
+        network_interface = self._network_interfaces.pop(network_interface_id, None)
+        if network_interface is None:
+            return False
+
+        for group in network_interface.get('Groups', []):
+            group_id = group.get('GroupId', '')
+            self._security_group_usage[group_id] = self._security_group_usage.get(group_id, 0) - 1
+            if self._security_group_usage[group_id] <= 0:
+                del self._security_group_usage[group_id]
+
+        self._attachments.pop(network_interface.get('Attachment', {}).get('AttachmentId'), None)
+
+        return True
+
+    def _use_access_key(self, access_key_id: str, event_time: datetime, event: dict) -> bool:
+        """
+        Records the use of the given access key.
+
+        :param access_key_id: The ID of the access key.
+        :type access_key_id: str
+        :param event_time: The time of the event.
+        :type event_time: datetime
+        :param event: The CloudTrail record.
+        :type event: dict
+        :return: True if the access key is tracked, otherwise False.
+        :rtype: bool
+        """
+        user = self._users.get(self._access_keys.get(access_key_id))
+        if user is None:
+            return False
+
+        for key in user.get('AccessKeys', []):
+            if key.get('access_key', {}).get('AccessKeyId', '') == access_key_id:
+                last_used = key.setdefault('last_used', {}).setdefault('AccessKeyLastUsed', {})
+                if _later(last_used.get('LastUsedDate'), event_time) is event_time:
+                    last_used.update({
+                        'LastUsedDate': event_time,
+                        'ServiceName': event.get('eventSource', '').split('.')[0],
+                        'Region': event.get('awsRegion', '')
+                    })
+
+        return True
+
+    def _use_role(self, role_arn: str, event_time: datetime, region: str) -> bool:
+        """
+        Records the use of the given IAM role. The role is matched by its full ARN, so that a role of another account
+        sharing the name of a tracked role is not considered.
+
+        :param role_arn: The ARN of the IAM role.
+        :type role_arn: str
+        :param event_time: The time of the event.
+        :type event_time: datetime
+        :param region: The region of the event.
+        :type region: str
+        :return: True if the IAM role is tracked, otherwise False.
+        :rtype: bool
+        """
+        role = self._roles.get(role_arn.rsplit('/', 1)[-1])
+        if role is None or role.get('Arn') != role_arn:
+            return False
+
+        last_used = role.get('RoleLastUsed') or {}
+        if _later(last_used.get('LastUsedDate'), event_time) is event_time:
+            role['RoleLastUsed'] = {'LastUsedDate': event_time, 'Region': region}
+
+        return True
+
+    def _apply_identity(self, event: dict, event_time: datetime) -> bool:
+        """
+        Records the use of the IAM role or access key which made the request of the given event.
+
+        :param event: The CloudTrail record.
+        :type event: dict
+        :param event_time: The time of the event.
+        :type event_time: datetime
+        :return: True if the event used a tracked IAM role or access key, otherwise False.
+        :rtype: bool
+        """
+        identity = event.get('userIdentity') or {}
+
+        if identity.get('type') == 'AssumedRole':
+            issuer = identity.get('sessionContext', {}).get('sessionIssuer', {})
+            if issuer.get('type') == 'Role':
+                return self._use_role(issuer.get('arn', ''), event_time, event.get('awsRegion', ''))
+        elif identity.get('type') == 'IAMUser':
+            changed = False
+            if event.get('eventName') == 'ConsoleLogin':
+                user = self._users.get(identity.get('userName', ''))
+                if user is not None and (event.get('responseElements') or {}).get('ConsoleLogin') == 'Success':
+                    user['PasswordLastUsed'] = _later(user.get('PasswordLastUsed'), event_time)
+                    changed = True
+            if identity.get('accessKeyId'):
+                changed = self._use_access_key(identity.get('accessKeyId', ''), event_time, event) or changed
+
+            return changed
+
+        return False
+
+    def _apply_iam(self, event: dict, event_time: datetime) -> bool:
+        """
+        Applies the IAM lifecycle events (role, user, access key and login profile creation and deletion) and the role
+        assumptions.
+
+        :param event: The CloudTrail record.
+        :type event: dict
+        :param event_time: The time of the event.
+        :type event_time: datetime
+        :return: True if the event changed the tracked state, otherwise False.
+        :rtype: bool
+        """
+        name = event.get('eventName', '')
+        request = event.get('requestParameters') or {}
+        response = event.get('responseElements') or {}
+
+        if name == 'AssumeRole':
+            return self._use_role(request.get('roleArn', ''), event_time, event.get('awsRegion', ''))
+        elif name == 'CreateRole':
+            role = response.get('role', {})
+            self._roles[role.get('roleName', '')] = {
+                'RoleName': role.get('roleName', ''),
+                'RoleId': role.get('roleId', ''),
+                'Arn': role.get('arn', ''),
+                'MaxSessionDuration': request.get('maxSessionDuration', 3600),
+                'Path': role.get('path', '/'),
+                'CreateDate': event_time,
+                'RoleLastUsed': {}
+            }
+        elif name == 'DeleteRole':
+            return self._roles.pop(request.get('roleName', ''), None) is not None
+        elif name == 'CreateUser':
+            user = response.get('user', {})
+            self._add_user({
+                'UserName': user.get('userName', ''),
+                'UserId': user.get('userId', ''),
+                'Arn': user.get('arn', ''),
+                'Path': user.get('path', '/'),
+                'CreateDate': event_time,
+                'LoginProfile': {},
+                'AccessKeys': []
+            })
+        elif name == 'DeleteUser':
+            user = self._users.pop(request.get('userName', ''), None)
+            for key in (user or {}).get('AccessKeys', []):
+                self._access_keys.pop(key.get('access_key', {}).get('AccessKeyId', ''), None)
+            return user is not None
+        elif name == 'CreateAccessKey':
+            access_key = response.get('accessKey', {})
+            user = self._users.get(access_key.get('userName', ''))
+            if user is None:
+                return False
+            user.setdefault('AccessKeys', []).append({
+                'access_key': {
+                    'UserName': access_key.get('userName', ''),
+                    'AccessKeyId': access_key.get('accessKeyId', ''),
+                    'Status': access_key.get('status', 'Active'),
+                    'CreateDate': event_time
+                },
+                'last_used': {'AccessKeyLastUsed': {}}
+            })
+            self._access_keys[access_key.get('accessKeyId', '')] = access_key.get('userName', '')
+        elif name == 'DeleteAccessKey':
+            user = self._users.get(self._access_keys.pop(request.get('accessKeyId', ''), None))
+            if user is None:
+                return False
+            user['AccessKeys'] = [
+                key for key in user.get('AccessKeys', [])
+                if key.get('access_key', {}).get('AccessKeyId', '') != request.get('accessKeyId', '')
+            ]
+        elif name in ['CreateLoginProfile', 'DeleteLoginProfile']:
+            user = self._users.get(request.get('userName', ''))
+            if user is None:
+                return False
+            user['LoginProfile'] = {'UserName': user.get('UserName', ''), 'CreateDate': event_time} \
+                if name == 'CreateLoginProfile' else {}
+        else:
+            return False
+
+        return True
+
+    def _apply_ec2(self, event: dict) -> bool:
+        """
+        Applies the EC2 security group and ENI (Elastic Network Interface) events of the tracked regions.
+
+        :param event: The CloudTrail record.
+        :type event: dict
+        :return: True if the event changed the tracked state, otherwise False.
+        :rtype: bool
+        """
+        name = event.get('eventName', '')
+        region = event.get('awsRegion', '')
+        request = event.get('requestParameters') or {}
+        response = event.get('responseElements') or {}
+
+        if region not in self._regions:
+            return False
+
+        def _network_interface(item, status, instance_id=None):
+            attachment = item.get('attachment') or {}
+            network_interface = {
+                'NetworkInterfaceId': item.get('networkInterfaceId', ''),
+                'Status': status,
+                'VpcId': item.get('vpcId', ''),
+                'SubnetId': item.get('subnetId', ''),
+                'Groups': [
+                    {'GroupId': group.get('groupId', ''), 'GroupName': group.get('groupName', '')}
+                    for group in _items(item.get('groupSet'))
+                ],
+                'Region': region
+            }
+            if attachment.get('attachmentId'):
+                network_interface['Attachment'] = {
+                    'AttachmentId': attachment.get('attachmentId', ''),
+                    'InstanceId': instance_id,
+                    'DeleteOnTermination': attachment.get('deleteOnTermination', False)
+                }
+
+            return network_interface
+
+        if name == 'CreateSecurityGroup':
+            group_id = response.get('groupId', '')
+            self._security_groups[group_id] = {
+                'GroupId': group_id,
+                'GroupName': request.get('groupName', ''),
+                'Description': request.get('groupDescription', ''),
+                'OwnerId': event.get('recipientAccountId', ''),
+                'VpcId': request.get('vpcId', ''),
+                'IpPermissions': [],
+                'IpPermissionsEgress': [],
+                'Region': region
+            }
+        elif name == 'DeleteSecurityGroup':
+            return self._security_groups.pop(request.get('groupId', ''), None) is not None
+        elif name == 'CreateNetworkInterface':
+            self._add_network_interface(_network_interface(response.get('networkInterface', {}), 'available'))
+        elif name == 'DeleteNetworkInterface':
+            return self._remove_network_interface(request.get('networkInterfaceId', ''))
+        elif name == 'ModifyNetworkInterfaceAttribute':
+            network_interface = self._network_interfaces.get(request.get('networkInterfaceId', ''))
+            if network_interface is None or 'groupSet' not in request:
+                return False
+            self._add_network_interface({**network_interface, 'Groups': [
+                {'GroupId': group.get('groupId', '')} for group in _items(request.get('groupSet'))
+            ]})
+        elif name == 'AttachNetworkInterface':
+            network_interface = self._network_interfaces.get(request.get('networkInterfaceId', ''))
+            if network_interface is None:
+                return False
+            self._add_network_interface({**network_interface, 'Status': 'in-use', 'Attachment': {
+                'AttachmentId': response.get('attachmentId', ''),
+                'InstanceId': request.get('instanceId'),
+                'DeleteOnTermination': False
+            }})
+        elif name == 'DetachNetworkInterface':
+            network_interface = self._network_interfaces.get(self._attachments.get(request.get('attachmentId', '')))
+            if network_interface is None:
+                return False
+            network_interface = {**network_interface, 'Status': 'available'}
+            network_interface.pop('Attachment', None)
+            self._add_network_interface(network_interface)
+        elif name == 'RunInstances':
+            for instance in _items(response.get('instancesSet')):
+                for item in _items(instance.get('networkInterfaceSet')):
+                    self._add_network_interface(_network_interface(item, 'in-use', instance.get('instanceId')))
+        elif name == 'TerminateInstances':
+            instance_ids = {instance.get('instanceId') for instance in _items(response.get('instancesSet'))}
+            for network_interface in list(self._network_interfaces.values()):
+                attachment = network_interface.get('Attachment', {})
+                if attachment.get('InstanceId') not in instance_ids:
+                    continue
+                if attachment.get('DeleteOnTermination', False):
+                    self._remove_network_interface(network_interface.get('NetworkInterfaceId', ''))
+                else:
+                    network_interface = {**network_interface, 'Status': 'available'}
+                    network_interface.pop('Attachment', None)
+                    self._add_network_interface(network_interface)
+        else:
+            return False
+
+        return True
+
+    def seed(self, region: Optional[Union[str, list]] = None) -> None:
+        """
+        Seeds the tracker from one full scan of the IAM roles and users of the account, and of the security groups and
+        ENIs of the specified regions, replacing any previous state. The account of the session is resolved once, so
+        that the events of other accounts are ignored.
+
+        :param region: The region or list of regions to track. Defaults to the region of the session.
+        :type region: str | list
+        """
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+        from pyawsopstoolkit_insights.ec2 import BOTO3_CLIENT, _resolve_regions
+        from pyawsopstoolkit_insights.iam import _UNUSED_ROLES_FIELDS, _UNUSED_USERS_FIELDS, _iter_roles, _iter_users
+
+        regions = _resolve_regions(self.session, region)
+
+        try:
+            account = self.session.get_account()
+            roles = list(_iter_roles(self.session, _UNUSED_ROLES_FIELDS))
+            users = list(_iter_users(self.session, _UNUSED_USERS_FIELDS))
+            security_groups = _fetch_regions(self.session, BOTO3_CLIENT, regions, _list_security_groups)
+            network_interfaces = _fetch_regions(self.session, BOTO3_CLIENT, regions, _list_network_interfaces)
+        except ClientError as e:
+            raise AdvanceSearchError('seed', e)
+
+        with self._lock:
+            self._account = account
+            self._regions = set(regions)
+            self._roles = {role.get('RoleName', ''): role for role in roles}
+            self._users = {}
+            self._access_keys = {}
+            for user in users:
+                self._add_user(user)
+            self._security_groups = {sg.get('GroupId', ''): sg for sg in security_groups}
+            self._security_group_usage = {}
+            self._network_interfaces = {}
+            self._attachments = {}
+            for network_interface in network_interfaces:
+                self._add_network_interface(network_interface)
+
+    def apply(self, event: dict) -> bool:
+        """
+        Applies the given CloudTrail-style event to the tracked state. Supported events are role use (AssumeRole and
+        requests made by assumed role sessions), access key and console use by IAM users, IAM role, user, access key
+        and login profile creation and deletion, security group creation and deletion, and ENI creation, deletion,
+        attachment, detachment and security group changes, including the ENIs of launched and terminated instances.
+        Failed requests, and the requests recorded for another account than the account of the session, are ignored.
+
+        :param event: The CloudTrail record.
+        :type event: dict
+        :return: True if the event changed the tracked state, otherwise False.
+        :rtype: bool
+        """
+        _validate_type(event, dict, 'event should be a dictionary.')
+
+        if event.get('errorCode'):
+            return False
+
+        recipient_account = event.get('recipientAccountId')
+        if recipient_account and self._account is not None and recipient_account != self._account.number:
+            return False
+
+        event_time = _parse_event_time(event.get('eventTime'))
+        if event_time is None:
+            return False
+
+        with self._lock:
+            changed = self._apply_identity(event, event_time)
+            if event.get('eventSource') == 'iam.amazonaws.com' or event.get('eventName') == 'AssumeRole':
+                changed = self._apply_iam(event, event_time) or changed
+            elif event.get('eventSource') == 'ec2.amazonaws.com':
+                changed = self._apply_ec2(event) or changed
+
+            return changed
+
+    def consume(self, source) -> int:
+        """
+        Applies all the events of the given source, such as a FileEventSource or a QueueEventSource. Any object
+        exposing an events method returning an iterable of CloudTrail records is supported.
+
+        :param source: The source of events.
+        :type source: FileEventSource | QueueEventSource
+        :return: The number of events which changed the tracked state.
+        :rtype: int
+        """
+        if not callable(getattr(source, 'events', None)):
+            raise TypeError('source should expose an events method.')
+
+        return sum(1 for event in source.events() if self.apply(event))
+
+    def is_network_interface_unused(self, network_interface_id: str) -> bool:
+        """
+        Verifies if the given ENI is not attached, in O(1) time.
+
+        :param network_interface_id: The ID of the ENI.
+        :type network_interface_id: str
+        :return: True if the ENI is tracked and unused, otherwise False.
+        :rtype: bool
+        """
+        with self._lock:
+            network_interface = self._network_interfaces.get(network_interface_id)
+
+            return network_interface is not None and network_interface.get('Status') == 'available'
+
+    def is_role_unused(self, role_name: str) -> bool:
+        """
+        Verifies if the given IAM role is unused based on the tracker parameters, in O(1) time.
+
+        :param role_name: The name of the IAM role.
+        :type role_name: str
+        :return: True if the IAM role is tracked and unused, otherwise False.
+        :rtype: bool
+        """
+        from pyawsopstoolkit_insights.iam import _cutoff_date, _role_is_excluded, _role_is_unused
+
+        cutoff_date = _cutoff_date(self.no_of_days)
+        with self._lock:
+            role = self._roles.get(role_name)
+
+            return role is not None and not _role_is_excluded(role, cutoff_date, self.include_newly_created) \
+                and _role_is_unused(role, cutoff_date)
+
+    def is_security_group_unused(self, group_id: str) -> bool:
+        """
+        Verifies if the given security group is not associated with any ENI, in O(1) time.
+
+        :param group_id: The ID of the security group.
+        :type group_id: str
+        :return: True if the security group is tracked and unused, otherwise False.
+        :rtype: bool
+        """
+        with self._lock:
+            return group_id in self._security_groups and group_id not in self._security_group_usage
+
+    def is_user_unused(self, user_name: str) -> bool:
+        """
+        Verifies if the given IAM user is unused based on the tracker parameters, in O(1) time.
+
+        :param user_name: The name of the IAM user.
+        :type user_name: str
+        :return: True if the IAM user is tracked and unused, otherwise False.
+        :rtype: bool
+        """
+        from pyawsopstoolkit_insights.iam import _cutoff_date, _user_is_excluded, _user_is_unused
+
+        cutoff_date = _cutoff_date(self.no_of_days)
+        with self._lock:
+            user = self._users.get(user_name)
+
+            return user is not None and not _user_is_excluded(user, cutoff_date, self.include_newly_created) \
+                and _user_is_unused(user, cutoff_date)
+
+    def unused_network_interfaces(self) -> list:
+        """
+        Returns a list of the tracked ENIs which are not attached, without calling AWS.
+
+        :return: A list of unused ENIs, as copies of the tracked boto3 dictionaries including the Region key.
+        :rtype: list
+        """
+        with self._lock:
+            return copy.deepcopy([
+                network_interface for network_interface in self._network_interfaces.values()
+                if network_interface.get('Status') == 'available'
+            ])
+
+    def unused_roles(self) -> list:
+        """
+        Returns a list of the tracked IAM roles which are unused based on the tracker parameters, without calling AWS.
+        The models are built outside of the lock from copies of the tracked state, using the account resolved by seed.
+
+        :return: A list of unused IAM roles.
+        :rtype: list
+        """
+        from pyawsopstoolkit_insights.iam import Role
+
+        with self._lock:
+            roles = copy.deepcopy([role for role_name, role in self._roles.items() if self.is_role_unused(role_name)])
+            account = self._account
+
+        return list(Role(session=self.session)._convert_roles(roles, account))
+
+    def unused_security_groups(self) -> list:
+        """
+        Returns a list of the tracked security groups which are not associated with any ENI, without calling AWS. The
+        models are built outside of the lock from copies of the tracked state, using the account resolved by seed.
+
+        :return: A list of unused EC2 security groups.
+        :rtype: list
+        """
+        from pyawsopstoolkit_insights.ec2 import SecurityGroup
+
+        with self._lock:
+            security_groups = copy.deepcopy([
+                sg for group_id, sg in self._security_groups.items() if group_id not in self._security_group_usage
+            ])
+            account = self._account
+
+        return list(SecurityGroup(session=self.session)._convert_security_groups(security_groups, account))
+
+    def unused_users(self) -> list:
+        """
+        Returns a list of the tracked IAM users which are unused based on the tracker parameters, without calling AWS.
+        The models are built outside of the lock from copies of the tracked state, using the account resolved by seed.
+
+        :return: A list of unused IAM users.
+        :rtype: list
+        """
+        from pyawsopstoolkit_insights.iam import User
+
+        with self._lock:
+            users = copy.deepcopy([user for user_name, user in self._users.items() if self.is_user_unused(user_name)])
+            account = self._account
+
+        return list(User(session=self.session)._convert_users(users, account))
@@ -15,6 +15,9 @@ setup(
         "pyawsopstoolkit==0.1.19",
         "pyawsopstoolkit_advsearch==0.1.1"
     ],
+    extras_require={
+        "arrow": ["pyarrow"]
+    },
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
     keywords=[
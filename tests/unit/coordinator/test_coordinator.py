@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from pyawsopstoolkit_insights.coordinator import Coordinator, SQLiteWorkQueue
+
+
+class TestCoordinator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue = SQLiteWorkQueue(path=os.path.join(self.temp_dir.name, 'queue.db'))
+        self.coordinator = Coordinator(queue=self.queue)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_initialization(self):
+        self.assertEqual(self.coordinator.queue, self.queue)
+
+    def test_invalid_types(self):
+        from pyawsopstoolkit_validators.exceptions import ValidationError
+
+        with self.assertRaises(TypeError):
+            Coordinator(queue='queue')
+        with self.assertRaises(TypeError):
+            self.coordinator.publish(accounts='123456789012', regions=['eu-west-1'])
+        with self.assertRaises(ValueError):
+            self.coordinator.publish(accounts=['123456789012'], regions=['eu-west-1'], checks=['unknown'])
+        with self.assertRaises(ValidationError):
+            self.coordinator.publish(accounts=['123456789012'], regions=['invalid'])
+
+    def test_publish(self):
+        self.assertEqual(self.coordinator.publish(
+            accounts=['123456789012', '210987654321'],
+            regions=['eu-west-1', 'us-east-1'],
+            checks=['unused_roles', 'unused_security_groups']
+        ), 6)
+        self.assertEqual(self.coordinator.publish(
+            accounts=['123456789012'], regions=['eu-west-1'], checks=['unused_roles']
+        ), 0)
+        self.assertEqual(
+            sorted(task['id'] for task in self.queue.tasks() if task['account'] == '123456789012'),
+            [
+                '123456789012.eu-west-1.unused_security_groups',
+                '123456789012.global.unused_roles',
+                '123456789012.us-east-1.unused_security_groups'
+            ]
+        )
+        self.assertEqual(self.coordinator.status(), {'pending': 6, 'leased': 0, 'done': 0, 'failed': 0})
+
+    def test_merge(self):
+        self.assertFalse(self.coordinator.merge()['complete'])
+
+        self.coordinator.publish(
+            accounts=['123456789012', '210987654321'], regions=['eu-west-1'], checks=['unused_volumes']
+        )
+        first = self.queue.lease('worker1', 60)
+        self.queue.complete(first['id'], 'worker1', [{'VolumeId': 'vol-1'}, {'VolumeId': 'vol-2'}])
+
+        merged = self.coordinator.merge()
+
+        self.assertFalse(merged['complete'])
+        self.assertEqual(merged['results'], {'unused_volumes': [
+            {'account': first['account'], 'region': 'eu-west-1', 'resource': {'VolumeId': 'vol-1'}},
+            {'account': first['account'], 'region': 'eu-west-1', 'resource': {'VolumeId': 'vol-2'}}
+        ]})
+
+        second = self.queue.lease('worker1', 60)
+        self.queue.complete(second['id'], 'worker1', [])
+
+        self.assertTrue(self.coordinator.merge()['complete'])
+
+
+if __name__ == "__main__":
+    unittest.main()
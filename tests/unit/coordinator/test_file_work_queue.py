@@ -0,0 +1,185 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from pyawsopstoolkit_insights.coordinator import FileWorkQueue
+
+
+class TestFileWorkQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'queue')
+        self.queue = FileWorkQueue(path=self.path, max_attempts=2)
+        self.tasks = [
+            {'id': f'123456789012.eu-west-1.check{i}', 'account': '123456789012', 'region': 'eu-west-1',
+             'check': f'check{i}'}
+            for i in range(5)
+        ]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_initialization(self):
+        self.assertEqual(self.queue.path, self.path)
+        self.assertEqual(self.queue.max_attempts, 2)
+        self.assertTrue(os.path.isdir(os.path.join(self.path, 'pending')))
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            FileWorkQueue(path=123)
+        with self.assertRaises(ValueError):
+            FileWorkQueue(path=self.path, max_attempts=0)
+
+    def test_put_is_idempotent(self):
+        self.assertEqual(self.queue.put(self.tasks), 5)
+        self.assertEqual(self.queue.put(self.tasks), 0)
+        self.assertEqual(len(self.queue.tasks()), 5)
+
+    def test_lease_complete(self):
+        self.queue.put(self.tasks[:1])
+
+        task = self.queue.lease('worker1', 60)
+
+        self.assertEqual(task['id'], self.tasks[0]['id'])
+        self.assertEqual(task['attempts'], 1)
+        self.assertIsNone(self.queue.lease('worker2', 60))
+        self.assertFalse(self.queue.complete(task['id'], 'worker2', []))
+        self.assertTrue(self.queue.complete(task['id'], 'worker1', [{'name': 'test_role'}]))
+        self.assertEqual([result['result'] for result in self.queue.results()], [[{'name': 'test_role'}]])
+        self.assertEqual([task['status'] for task in self.queue.tasks()], ['done'])
+
+    def test_fail_retries_until_max_attempts(self):
+        self.queue.put(self.tasks[:1])
+
+        self.assertTrue(self.queue.fail(self.queue.lease('worker1', 60)['id'], 'worker1', 'error'))
+        self.assertEqual(self.queue.tasks()[0]['status'], 'pending')
+        self.assertTrue(self.queue.fail(self.queue.lease('worker1', 60)['id'], 'worker1', 'error'))
+        self.assertEqual(self.queue.tasks()[0]['status'], 'failed')
+        self.assertIsNone(self.queue.lease('worker1', 60))
+
+    def test_expired_lease_is_reclaimed(self):
+        self.queue.put(self.tasks[:1])
+
+        task = self.queue.lease('worker1', 0)
+        reclaimed = self.queue.lease('worker2', 60)
+
+        self.assertEqual(reclaimed['id'], task['id'])
+        self.assertEqual(reclaimed['attempts'], 2)
+        self.assertFalse(self.queue.complete(task['id'], 'worker1', []))
+        self.assertTrue(self.queue.complete(task['id'], 'worker2', []))
+
+    def test_lease_is_exclusive_while_being_recorded(self):
+        self.queue.put(self.tasks[:1])
+        published = self.queue._file('pending', self.tasks[0]['id'])
+        os.utime(published, (os.path.getmtime(published) - 3600,) * 2)
+        other_queue = FileWorkQueue(path=self.path, max_attempts=2)
+        interleaved = []
+        release = self.queue._release
+
+        def _release(claim, task, status):
+            interleaved.append(other_queue.lease('worker2', 60))
+            release(claim, task, status)
+
+        with patch.object(self.queue, '_release', side_effect=_release):
+            task = self.queue.lease('worker1', 60)
+
+        self.assertEqual(interleaved, [None])
+        self.assertIsNone(other_queue.lease('worker2', 60))
+        self.assertEqual(task['attempts'], 1)
+        self.assertTrue(self.queue.complete(task['id'], 'worker1', []))
+
+    def test_abandoned_claim_is_recovered(self):
+        self.queue.put(self.tasks[:1])
+
+        with patch.object(self.queue, '_release', side_effect=RuntimeError('stopped')):
+            with self.assertRaises(RuntimeError):
+                self.queue.lease('worker1', 60)
+
+        self.assertIsNone(self.queue.lease('worker2', 60))
+        self.assertEqual(self.queue.put(self.tasks[:1]), 0)
+
+        claim = os.path.join(self.path, 'leased', self.queue._list_claims()[0][0])
+        os.utime(claim, (os.path.getmtime(claim) - 3600,) * 2)
+        task = self.queue.lease('worker2', 60)
+
+        self.assertEqual(task['id'], self.tasks[0]['id'])
+        self.assertEqual(task['owner'], 'worker2')
+        self.assertEqual(self.queue._list_claims(), [])
+
+    def test_abandoned_claim_fails_after_max_attempts(self):
+        self.queue.put(self.tasks[:1])
+        self.queue.lease('worker1', 0)
+        task = self.queue.lease('worker2', 60)
+        self.assertEqual(task['attempts'], 2)
+
+        with patch.object(self.queue, '_release', side_effect=RuntimeError('stopped')):
+            with self.assertRaises(RuntimeError):
+                self.queue.complete(task['id'], 'worker2', [])
+
+        claim = os.path.join(self.path, 'leased', self.queue._list_claims()[0][0])
+        os.utime(claim, (os.path.getmtime(claim) - 3600,) * 2)
+
+        self.assertIsNone(self.queue.lease('worker3', 60))
+        self.assertEqual(
+            [(task['id'], task['status'], task['error']) for task in self.queue.tasks()],
+            [(self.tasks[0]['id'], 'failed', 'lease expired')]
+        )
+
+    def test_unreadable_claim_is_failed(self):
+        task_id = self.tasks[0]['id']
+        claim = os.path.join(self.path, 'leased', f'.{task_id}.0123.claim')
+        with open(claim, 'w', encoding='utf-8') as handle:
+            handle.write('{"id": ')
+        os.utime(claim, (os.path.getmtime(claim) - 3600,) * 2)
+
+        self.assertIsNone(self.queue.lease('worker1', 60))
+        self.assertEqual(
+            [(task['id'], task['status'], task['error']) for task in self.queue.tasks()],
+            [(task_id, 'failed', 'unreadable task')]
+        )
+
+    def test_claim_recovered_concurrently_is_skipped(self):
+        self.queue.put(self.tasks[:1])
+        with patch.object(self.queue, '_release', side_effect=RuntimeError('stopped')):
+            with self.assertRaises(RuntimeError):
+                self.queue.lease('worker1', 60)
+        claim = os.path.join(self.path, 'leased', self.queue._list_claims()[0][0])
+        os.utime(claim, (os.path.getmtime(claim) - 3600,) * 2)
+
+        def _read(path):
+            os.remove(path)
+            return FileWorkQueue._read(path)
+
+        with patch.object(self.queue, '_read', side_effect=_read):
+            self.assertIsNone(self.queue.lease('worker2', 60))
+
+    def test_extend(self):
+        self.queue.put(self.tasks[:1])
+
+        task = self.queue.lease('worker1', 0)
+
+        self.assertFalse(self.queue.extend(task['id'], 'worker2', 60))
+        self.assertTrue(self.queue.extend(task['id'], 'worker1', 60))
+        self.assertIsNone(self.queue.lease('worker2', 60))
+        self.assertTrue(self.queue.complete(task['id'], 'worker1', []))
+        self.assertFalse(self.queue.extend(task['id'], 'worker1', 60))
+
+    def test_concurrent_leases(self):
+        self.queue.put(self.tasks)
+
+        def _lease_all(worker_id):
+            leased = []
+            while (task := self.queue.lease(worker_id, 60)) is not None:
+                leased.append(task['id'])
+            return leased
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leased = [task_id for tasks in executor.map(_lease_all, ['w1', 'w2', 'w3', 'w4']) for task_id in tasks]
+
+        self.assertEqual(sorted(leased), sorted(task['id'] for task in self.tasks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pyawsopstoolkit_insights.coordinator import SQLiteWorkQueue
+
+
+class TestSQLiteWorkQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'queue.db')
+        self.queue = SQLiteWorkQueue(path=self.path, max_attempts=2)
+        self.tasks = [
+            {'id': f'123456789012.eu-west-1.check{i}', 'account': '123456789012', 'region': 'eu-west-1',
+             'check': f'check{i}'}
+            for i in range(5)
+        ]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_initialization(self):
+        self.assertEqual(self.queue.path, self.path)
+        self.assertEqual(self.queue.max_attempts, 2)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            SQLiteWorkQueue(path=123)
+        with self.assertRaises(ValueError):
+            SQLiteWorkQueue(path=self.path, max_attempts=0)
+
+    def test_put_is_idempotent(self):
+        self.assertEqual(self.queue.put(self.tasks), 5)
+        self.assertEqual(self.queue.put(self.tasks), 0)
+        self.assertEqual(len(self.queue.tasks()), 5)
+
+    def test_lease_complete(self):
+        self.queue.put(self.tasks[:1])
+
+        task = self.queue.lease('worker1', 60)
+
+        self.assertEqual(task['id'], self.tasks[0]['id'])
+        self.assertEqual(task['attempts'], 1)
+        self.assertIsNone(self.queue.lease('worker2', 60))
+        self.assertFalse(self.queue.complete(task['id'], 'worker2', []))
+        self.assertTrue(self.queue.complete(task['id'], 'worker1', [{'name': 'test_role'}]))
+        self.assertEqual([result['result'] for result in self.queue.results()], [[{'name': 'test_role'}]])
+        self.assertEqual([task['status'] for task in self.queue.tasks()], ['done'])
+
+    def test_fail_retries_until_max_attempts(self):
+        self.queue.put(self.tasks[:1])
+
+        self.assertTrue(self.queue.fail(self.queue.lease('worker1', 60)['id'], 'worker1', 'error'))
+        self.assertEqual(self.queue.tasks()[0]['status'], 'pending')
+        self.assertTrue(self.queue.fail(self.queue.lease('worker1', 60)['id'], 'worker1', 'error'))
+        self.assertEqual(self.queue.tasks()[0]['status'], 'failed')
+        self.assertIsNone(self.queue.lease('worker1', 60))
+
+    def test_expired_lease_is_reclaimed(self):
+        self.queue.put(self.tasks[:1])
+
+        task = self.queue.lease('worker1', 0)
+        reclaimed = self.queue.lease('worker2', 60)
+
+        self.assertEqual(reclaimed['id'], task['id'])
+        self.assertEqual(reclaimed['attempts'], 2)
+        self.assertFalse(self.queue.complete(task['id'], 'worker1', []))
+        self.assertTrue(self.queue.complete(task['id'], 'worker2', []))
+
+    def test_extend(self):
+        self.queue.put(self.tasks[:1])
+
+        task = self.queue.lease('worker1', 0)
+
+        self.assertFalse(self.queue.extend(task['id'], 'worker2', 60))
+        self.assertTrue(self.queue.extend(task['id'], 'worker1', 60))
+        self.assertIsNone(self.queue.lease('worker2', 60))
+        self.assertTrue(self.queue.complete(task['id'], 'worker1', []))
+        self.assertFalse(self.queue.extend(task['id'], 'worker1', 60))
+
+    def test_concurrent_leases(self):
+        self.queue.put(self.tasks)
+
+        def _lease_all(worker_id):
+            leased = []
+            while (task := self.queue.lease(worker_id, 60)) is not None:
+                leased.append(task['id'])
+            return leased
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leased = [task_id for tasks in executor.map(_lease_all, ['w1', 'w2', 'w3', 'w4']) for task_id in tasks]
+
+        self.assertEqual(sorted(leased), sorted(task['id'] for task in self.tasks))
+
+
+if __name__ == "__main__":
+    unittest.main()
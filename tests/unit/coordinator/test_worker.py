@@ -0,0 +1,111 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from pyawsopstoolkit_insights.coordinator import Coordinator, FileWorkQueue, Worker
+
+
+class TestWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+        from pyawsopstoolkit.session import Session
+
+        self.account = Account('123456789012')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue = FileWorkQueue(path=os.path.join(self.temp_dir.name, 'queue'), max_attempts=2)
+        self.coordinator = Coordinator(queue=self.queue)
+        self.sessions = []
+
+        def _session_factory(account):
+            session = Session(profile_name=account)
+            self.sessions.append(account)
+            return session
+
+        self.worker = Worker(queue=self.queue, session_factory=_session_factory, worker_id='worker1')
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_initialization(self):
+        self.assertEqual(self.worker.queue, self.queue)
+        self.assertEqual(self.worker.worker_id, 'worker1')
+        self.assertEqual(self.worker.lease_seconds, 900)
+        self.assertIsNotNone(Worker(queue=self.queue, session_factory=lambda account: None).worker_id)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            Worker(queue=self.queue, session_factory='factory')
+        with self.assertRaises(TypeError):
+            Worker(queue=[], session_factory=lambda account: None)
+        with self.assertRaises(ValueError):
+            self.worker.lease_seconds = -1
+        with self.assertRaises(ValueError):
+            Worker(queue=self.queue, session_factory=lambda account: None, lease_seconds=0)
+
+    @patch('pyawsopstoolkit_insights.ec2.Volume.unused_volumes')
+    @patch('pyawsopstoolkit_insights.iam.Role.unused_roles')
+    def test_run(self, mock_unused_roles, mock_unused_volumes):
+        mock_unused_roles.return_value = [{'RoleName': 'test_role'}]
+        mock_unused_volumes.side_effect = lambda region: [{'VolumeId': 'vol-1', 'Region': region}]
+        self.coordinator.publish(
+            accounts=['123456789012', '210987654321'], regions=['eu-west-1', 'us-east-1'],
+            checks=['unused_roles', 'unused_volumes']
+        )
+
+        self.assertEqual(self.worker.run(max_tasks=2), 2)
+        self.assertEqual(self.worker.run(), 4)
+        self.assertFalse(self.worker.run_once())
+
+        merged = self.coordinator.merge()
+
+        self.assertTrue(merged['complete'])
+        self.assertEqual(len(merged['results']['unused_roles']), 2)
+        self.assertEqual(
+            sorted((record['account'], record['resource']['Region']) for record in merged['results']['unused_volumes']),
+            [
+                ('123456789012', 'eu-west-1'), ('123456789012', 'us-east-1'),
+                ('210987654321', 'eu-west-1'), ('210987654321', 'us-east-1')
+            ]
+        )
+        self.assertEqual(sorted(set(self.sessions)), ['123456789012', '210987654321'])
+
+    @patch('pyawsopstoolkit_insights.iam.User.unused_users')
+    def test_run_retries_failed_shards(self, mock_unused_users):
+        error = RuntimeError('throttled')
+        mock_unused_users.side_effect = [error, [], error, error]
+        self.coordinator.publish(accounts=['123456789012', '210987654321'], regions=[], checks=['unused_users'])
+
+        self.assertEqual(self.worker.run(), 4)
+
+        merged = self.coordinator.merge()
+
+        self.assertFalse(merged['complete'])
+        self.assertEqual(len(merged['failed']), 1)
+        self.assertEqual(merged['failed'][0]['id'], '210987654321.global.unused_users')
+        self.assertEqual(merged['failed'][0]['error'], 'RuntimeError: throttled')
+        self.assertEqual(mock_unused_users.call_count, 4)
+
+    @patch('pyawsopstoolkit_insights.iam.Role.unused_roles')
+    def test_run_renews_lease_of_long_running_shards(self, mock_unused_roles):
+        other_worker = Worker(queue=self.queue, session_factory=lambda account: None, worker_id='worker2')
+        self.worker.lease_seconds = 1
+        leased_by_other = []
+
+        def _unused_roles():
+            time.sleep(1.5)
+            leased_by_other.append(other_worker.run_once())
+            return []
+
+        mock_unused_roles.side_effect = _unused_roles
+        self.coordinator.publish(accounts=['123456789012'], regions=[], checks=['unused_roles'])
+
+        self.assertTrue(self.worker.run_once())
+        self.assertEqual(leased_by_other, [False])
+        self.assertTrue(self.coordinator.merge()['complete'])
+        self.assertEqual(mock_unused_roles.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
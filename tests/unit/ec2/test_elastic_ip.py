@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pyawsopstoolkit_insights.ec2 import ElasticIP
+
+
+class TestElasticIP(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.session import Session
+
+        self.profile_name = 'temp'
+        self.session = Session(profile_name=self.profile_name)
+        self.elastic_ip = ElasticIP(session=self.session)
+
+    def test_initialization(self):
+        self.assertEqual(self.elastic_ip.session, self.session)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            ElasticIP(session=123)
+        with self.assertRaises(TypeError):
+            self.elastic_ip.session = 123
+        with self.assertRaises(TypeError):
+            self.elastic_ip.unused_elastic_ips(region={'eu-west-1'})
+
+    @patch('boto3.Session')
+    def test_unused_elastic_ips_no_addresses_returned(self, mock_session):
+        session_instance = mock_session.return_value
+        session_instance.client.return_value.describe_addresses.return_value = {}
+
+        self.assertEqual(len(self.elastic_ip.unused_elastic_ips()), 0)
+
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_elastic_ips(self, mock_client):
+        client = MagicMock()
+        client.describe_addresses.return_value = {'Addresses': [
+            {'AllocationId': 'eipalloc-1', 'PublicIp': '203.0.113.1', 'Domain': 'vpc'},
+            {'AllocationId': 'eipalloc-2', 'PublicIp': '203.0.113.2', 'AssociationId': 'eipassoc-2'},
+            {'AllocationId': 'eipalloc-3', 'PublicIp': '203.0.113.3', 'NetworkInterfaceId': 'eni-3'}
+        ]}
+        mock_client.return_value = client
+
+        unused_elastic_ips = self.elastic_ip.unused_elastic_ips(region=['eu-west-1', 'us-east-1'])
+
+        self.assertEqual([address['AllocationId'] for address in unused_elastic_ips], ['eipalloc-1', 'eipalloc-1'])
+        self.assertEqual([address['Region'] for address in unused_elastic_ips], ['eu-west-1', 'us-east-1'])
+        self.assertEqual(client.describe_addresses.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
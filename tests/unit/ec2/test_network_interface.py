@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pyawsopstoolkit_insights.ec2 import NetworkInterface
+
+
+class TestNetworkInterface(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.session import Session
+
+        self.profile_name = 'temp'
+        self.session = Session(profile_name=self.profile_name)
+        self.network_interface = NetworkInterface(session=self.session)
+
+    def test_initialization(self):
+        self.assertEqual(self.network_interface.session, self.session)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            NetworkInterface(session='temp')
+        with self.assertRaises(TypeError):
+            self.network_interface.unused_network_interfaces(region=('eu-west-1',))
+
+    @patch('boto3.Session')
+    def test_unused_network_interfaces_no_network_interfaces_returned(self, mock_session):
+        session_instance = mock_session.return_value
+        session_instance.client.return_value.list_buckets.return_value = {}
+
+        self.assertEqual(len(self.network_interface.unused_network_interfaces()), 0)
+
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_network_interfaces(self, mock_client):
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.return_value = [
+            {'NetworkInterfaces': [{'NetworkInterfaceId': 'eni-1', 'Status': 'available'}]}
+        ]
+        mock_client.return_value = client
+
+        unused_network_interfaces = self.network_interface.unused_network_interfaces()
+
+        self.assertEqual(unused_network_interfaces, [
+            {'NetworkInterfaceId': 'eni-1', 'Status': 'available', 'Region': 'eu-west-1'}
+        ])
+        client.get_paginator.assert_called_once_with('describe_network_interfaces')
+        client.get_paginator.return_value.paginate.assert_called_once_with(
+            Filters=[{'Name': 'status', 'Values': ['available']}]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from pyawsopstoolkit_insights.ec2 import SecurityGroup
 
@@ -14,6 +14,48 @@ class TestSecurityGroup(unittest.TestCase):
         self.session = Session(profile_name=self.profile_name)
         self.security_group = SecurityGroup(session=self.session)
 
+    @staticmethod
+    def _security_group(sg_id, name, ports, description=None):
+        return {
+            'GroupId': sg_id,
+            'GroupName': name,
+            'OwnerId': '123456789012',
+            'VpcId': 'vpc-1a2b3c4d',
+            'Description': description or f'Security group {name}',
+            'IpPermissions': [
+                {
+                    'FromPort': port,
+                    'ToPort': port,
+                    'IpProtocol': 'tcp',
+                    'IpRanges': [{'CidrIp': '10.0.0.0/16'}]
+                }
+                for port in ports
+            ],
+            'IpPermissionsEgress': [
+                {'FromPort': 0, 'ToPort': 0, 'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}
+            ]
+        }
+
+    @staticmethod
+    def _mock_ec2_client(security_groups, security_groups_in_use):
+        client = MagicMock()
+
+        def _get_paginator(operation_name):
+            paginator = MagicMock()
+            if operation_name == 'describe_security_groups':
+                paginator.paginate.return_value = [{'SecurityGroups': security_groups}]
+            else:
+                paginator.paginate.return_value = [{'NetworkInterfaces': [
+                    {'NetworkInterfaceId': f'eni-{sg_id}', 'Groups': [{'GroupId': sg_id}]}
+                    for sg_id in security_groups_in_use
+                ]}]
+
+            return paginator
+
+        client.get_paginator.side_effect = _get_paginator
+
+        return client
+
     def test_initialization(self):
         self.assertEqual(self.security_group.session, self.session)
 
@@ -31,6 +73,8 @@ class TestSecurityGroup(unittest.TestCase):
             SecurityGroup(session=invalid_session)
         with self.assertRaises(TypeError):
             self.security_group.session = invalid_session
+        with self.assertRaises(TypeError):
+            self.security_group.unused_security_groups(region=123)
 
     @patch('boto3.Session')
     def test_unused_security_groups_no_security_groups_returned(self, mock_session):
@@ -39,162 +83,102 @@ class TestSecurityGroup(unittest.TestCase):
 
         self.assertEqual(len(self.security_group.unused_security_groups()), 0)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.ec2.SecurityGroup')
-    def test_unused_security_groups_no_groups_matching_criteria(self, mock_ec2, mock_session):
-        from pyawsopstoolkit_models.ec2.security_group import SecurityGroup, IPPermission, IPRange
-
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
-
-        def mock_search_security_groups(include_usage=True, in_use=False):
-            if include_usage:
-                return []
-            else:
-                return [
-                    SecurityGroup(
-                        account=self.account,
-                        region='eu-west-1',
-                        id='sg-abcdef0123456789',
-                        name='my-security-group',
-                        owner_id='123456789012',
-                        vpc_id='vpc-1a2b3c4d',
-                        ip_permissions=[IPPermission(
-                            from_port=22,
-                            to_port=22,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='0.0.0.0/0'
-                            )]
-                        )],
-                        ip_permissions_egress=[IPPermission(
-                            from_port=0,
-                            to_port=0,
-                            ip_protocol='-1',
-                            ip_ranges=[IPRange(
-                                cidr_ip='0.0.0.0/0'
-                            )]
-                        )],
-                        description='My first security group',
-                        in_use=True
-                    )
-                ]
-
-        mock_ec2.return_value.search_security_groups.return_value = mock_search_security_groups()
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_security_groups_no_groups_matching_criteria(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_ec2_client(
+            [self._security_group('sg-abcdef0123456789', 'my-security-group', [22])],
+            ['sg-abcdef0123456789']
+        )
 
         self.assertEqual(len(self.security_group.unused_security_groups()), 0)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.ec2.SecurityGroup')
-    def test_unused_security_groups_some_groups_matching_criteria(self, mock_ec2, mock_session):
-        from pyawsopstoolkit_models.ec2.security_group import SecurityGroup, IPPermission, IPRange
-
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
-
-        def mock_search_security_groups(include_usage=True, in_use=False):
-            if include_usage:
-                return [
-                    SecurityGroup(
-                        account=self.account,
-                        region='ap-southeast-2',
-                        id='sg-fedcba9876543210',
-                        name='db-access-sg',
-                        owner_id='210987654321',
-                        vpc_id='vpc-1b2c3d4e',
-                        ip_permissions=[IPPermission(
-                            from_port=3306,
-                            to_port=3306,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='10.0.0.0/16'
-                            )]
-                        )],
-                        ip_permissions_egress=[IPPermission(
-                            from_port=1024,
-                            to_port=65535,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='10.0.0.0/16'
-                            )]
-                        )],
-                        description='Security group for database access',
-                        in_use=False
-                    )
-                ]
-            else:
-                return [
-                    SecurityGroup(
-                        account=self.account,
-                        region='us-east-1',
-                        id='sg-1234567890abcdef',
-                        name='web-server-sg',
-                        owner_id='098765432109',
-                        vpc_id='vpc-4d3c2b1a',
-                        ip_permissions=[IPPermission(
-                            from_port=80,
-                            to_port=80,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='192.168.1.0/24'
-                            )]
-                        ), IPPermission(
-                            from_port=443,
-                            to_port=443,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='192.168.1.0/24'
-                            )]
-                        )],
-                        ip_permissions_egress=[IPPermission(
-                            from_port=0,
-                            to_port=0,
-                            ip_protocol='-1',
-                            ip_ranges=[IPRange(
-                                cidr_ip='0.0.0.0/0'
-                            )]
-                        )],
-                        description='Security group for web server',
-                        in_use=True
-                    ),
-                    SecurityGroup(
-                        account=self.account,
-                        region='eu-central-1',
-                        id='sg-0987abcdef654321',
-                        name='ssh-access-sg',
-                        owner_id='567890123456',
-                        vpc_id='vpc-5e4d3c2b',
-                        ip_permissions=[IPPermission(
-                            from_port=22,
-                            to_port=22,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='203.0.113.0/24'
-                            )]
-                        )],
-                        ip_permissions_egress=[IPPermission(
-                            from_port=80,
-                            to_port=80,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='0.0.0.0/0'
-                            )]
-                        ), IPPermission(
-                            from_port=443,
-                            to_port=443,
-                            ip_protocol='tcp',
-                            ip_ranges=[IPRange(
-                                cidr_ip='0.0.0.0/0'
-                            )]
-                        )],
-                        description='Security group for SSH and web traffic',
-                        in_use=True
-                    )
-                ]
-
-        mock_ec2.return_value.search_security_groups.return_value = mock_search_security_groups()
-
-        self.assertEqual(len(self.security_group.unused_security_groups()), 1)
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_security_groups_some_groups_matching_criteria(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        client = self._mock_ec2_client(
+            [
+                self._security_group('sg-fedcba9876543210', 'db-access-sg', [3306]),
+                self._security_group('sg-1234567890abcdef', 'web-server-sg', [80, 443]),
+                self._security_group('sg-0987abcdef654321', 'ssh-access-sg', [22])
+            ],
+            ['sg-1234567890abcdef', 'sg-0987abcdef654321']
+        )
+        mock_client.return_value = client
+
+        unused_security_groups = self.security_group.unused_security_groups()
+
+        self.assertEqual(len(unused_security_groups), 1)
+        self.assertEqual(unused_security_groups[0].id, 'sg-fedcba9876543210')
+        self.assertEqual(unused_security_groups[0].region, 'eu-west-1')
+        self.assertFalse(unused_security_groups[0].in_use)
+        self.assertEqual(client.get_paginator.call_count, 2)
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_security_groups_multiple_regions(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_ec2_client(
+            [self._security_group('sg-fedcba9876543210', 'db-access-sg', [3306])], []
+        )
+
+        unused_security_groups = self.security_group.unused_security_groups(region=['eu-west-1', 'us-east-1'])
+
+        self.assertEqual([sg.region for sg in unused_security_groups], ['eu-west-1', 'us-east-1'])
+        self.assertEqual(
+            sorted(call.args[2] for call in mock_client.call_args_list), ['eu-west-1', 'us-east-1']
+        )
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_top_unused(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        security_groups = [
+            self._security_group(f'sg-{index}', name, range(no_of_rules))
+            for index, (name, no_of_rules) in enumerate(
+                [('web-sg', 2), ('db-sg', 3), ('app-sg', 0), ('ssh-sg', 2), ('used-sg', 5)]
+            )
+        ]
+        for sg, referenced_ids in zip(security_groups, [['sg-1'], ['sg-0'], [], ['sg-0', 'sg-3'], ['sg-0', 'sg-1']]):
+            sg['IpPermissions'].extend(
+                {'IpProtocol': '-1', 'UserIdGroupPairs': [{'GroupId': group_id}]} for group_id in referenced_ids
+            )
+        mock_client.return_value = self._mock_ec2_client(security_groups, ['sg-4'])
+
+        self.assertEqual([sg.id for sg in self.security_group.top_unused(k=3)], ['sg-2', 'sg-3', 'sg-1'])
+        self.assertEqual(
+            [sg.id for sg in self.security_group.top_unused(k=3, by='ip_permissions')], ['sg-1', 'sg-3', 'sg-0']
+        )
+        self.assertEqual([sg.name for sg in self.security_group.top_unused(k=2, by='name')], ['app-sg', 'db-sg'])
+
+    def test_top_unused_invalid_parameters(self):
+        with self.assertRaises(TypeError):
+            self.security_group.top_unused(k=None)
+        with self.assertRaises(ValueError):
+            self.security_group.top_unused(by='created_date')
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_security_groups_trusted(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        security_group = self._security_group('sg-fedcba9876543210', 'db-access-sg', [3306, 5432])
+        security_group['IpPermissions'][0].update({
+            'Ipv6Ranges': [{'CidrIpv6': '::/0'}],
+            'PrefixListIds': [{'PrefixListId': 'pl-12345678'}],
+            'UserIdGroupPairs': [{'GroupId': 'sg-1234567890abcdef', 'UserId': '123456789012'}]
+        })
+        mock_client.return_value = self._mock_ec2_client([security_group], [])
+
+        trusted_security_group = SecurityGroup(session=self.session, trusted=True)
+        unused_security_groups = trusted_security_group.unused_security_groups()
+
+        self.assertFalse(unused_security_groups[0].in_use)
+        self.assertEqual(unused_security_groups, self.security_group.unused_security_groups())
+        self.assertEqual(
+            unused_security_groups[0].to_dict(), self.security_group.unused_security_groups()[0].to_dict()
+        )
 
 
 if __name__ == "__main__":
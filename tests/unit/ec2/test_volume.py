@@ -0,0 +1,80 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from pyawsopstoolkit_insights.ec2 import Volume
+
+
+class TestVolume(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.session import Session
+
+        self.profile_name = 'temp'
+        self.session = Session(profile_name=self.profile_name)
+        self.volume = Volume(session=self.session)
+
+    def test_initialization(self):
+        self.assertEqual(self.volume.session, self.session)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            Volume(session=None)
+        with self.assertRaises(TypeError):
+            self.volume.unused_volumes(region=1)
+
+    @patch('boto3.Session')
+    def test_unused_volumes_no_volumes_returned(self, mock_session):
+        session_instance = mock_session.return_value
+        session_instance.client.return_value.list_buckets.return_value = {}
+
+        self.assertEqual(len(self.volume.unused_volumes()), 0)
+
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_volumes(self, mock_client):
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.return_value = [
+            {'Volumes': [{'VolumeId': 'vol-1', 'State': 'available', 'Size': 8}]},
+            {'Volumes': [{'VolumeId': 'vol-2', 'State': 'available', 'Size': 100}]}
+        ]
+        mock_client.return_value = client
+
+        unused_volumes = self.volume.unused_volumes(region='us-east-1')
+
+        self.assertEqual([volume['VolumeId'] for volume in unused_volumes], ['vol-1', 'vol-2'])
+        self.assertTrue(all(volume['Region'] == 'us-east-1' for volume in unused_volumes))
+        client.get_paginator.assert_called_once_with('describe_volumes')
+        client.get_paginator.return_value.paginate.assert_called_once_with(
+            Filters=[{'Name': 'status', 'Values': ['available']}]
+        )
+
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    def test_unused_volumes_coalesces_concurrent_calls(self, mock_client):
+        release = threading.Event()
+        client = MagicMock()
+
+        def _paginate(**kwargs):
+            release.wait(5)
+            return [{'Volumes': [{'VolumeId': 'vol-1', 'State': 'available'}]}]
+
+        client.get_paginator.return_value.paginate.side_effect = _paginate
+        mock_client.return_value = client
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(Volume(session=self.session).unused_volumes, region)
+                for region in ['eu-west-1', 'eu-west-1', 'us-east-1']
+            ]
+            time.sleep(0.2)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual([[volume['Region'] for volume in result] for result in results], [
+            ['eu-west-1'], ['eu-west-1'], ['us-east-1']
+        ])
+        self.assertEqual(client.get_paginator.return_value.paginate.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
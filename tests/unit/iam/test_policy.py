@@ -0,0 +1,139 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from pyawsopstoolkit_insights.iam import Policy
+
+
+class TestPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+        from pyawsopstoolkit.session import Session
+
+        self.profile_name = 'temp'
+        self.account = Account('123456789012')
+        self.session = Session(profile_name=self.profile_name)
+        self.policy = Policy(session=self.session)
+
+    def _arn(self, name):
+        return f'arn:aws:iam::{self.account.number}:policy/{name}'
+
+    def _policy(self, name, attachment_count=0, boundary_usage_count=0, created_date=datetime(2022, 3, 15)):
+        return {
+            'PolicyName': name,
+            'PolicyId': f'ID{name}',
+            'Arn': self._arn(name),
+            'Path': '/',
+            'AttachmentCount': attachment_count,
+            'PermissionsBoundaryUsageCount': boundary_usage_count,
+            'CreateDate': created_date,
+            'PolicyVersionList': [{'Document': {'Version': '2012-10-17', 'Statement': []}}]
+        }
+
+    def _mock_iam_client(self, policies, roles=None, users=None, groups=None, password_last_used=None):
+        client = MagicMock()
+        password_last_used = password_last_used or {}
+
+        def _get_paginator(operation_name):
+            paginator = MagicMock()
+            if operation_name == 'get_account_authorization_details':
+                paginator.paginate.return_value = [
+                    {'Policies': policies[:1], 'RoleDetailList': roles or [], 'UserDetailList': users or []},
+                    {'Policies': policies[1:], 'GroupDetailList': groups or []}
+                ]
+            elif operation_name == 'list_users':
+                paginator.paginate.return_value = [{'Users': [
+                    {
+                        'UserName': user['UserName'],
+                        'UserId': user['UserName'],
+                        'Arn': f'arn:aws:iam::{self.account.number}:user/{user["UserName"]}',
+                        'CreateDate': datetime(2022, 3, 15),
+                        'PasswordLastUsed': password_last_used.get(user['UserName'], None)
+                    }
+                    for user in users or []
+                ]}]
+            else:
+                paginator.paginate.return_value = [{'AccessKeyMetadata': []}]
+
+            return paginator
+
+        client.get_paginator.side_effect = _get_paginator
+        client.get_login_profile.return_value = {'LoginProfile': {}}
+
+        return client
+
+    def test_initialization(self):
+        self.assertEqual(self.policy.session, self.session)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            Policy(session='session')
+        with self.assertRaises(TypeError):
+            self.policy.unused_policies(include_unused_principals='yes')
+        with self.assertRaises(TypeError):
+            self.policy.unused_policies(no_of_days='90')
+
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_policies(self, mock_client):
+        client = self._mock_iam_client([
+            self._policy('unused'),
+            self._policy('attached', attachment_count=1),
+            self._policy('boundary', boundary_usage_count=1),
+            self._policy('new', created_date=datetime.today())
+        ])
+        mock_client.return_value = client
+
+        unused_policies = self.policy.unused_policies()
+
+        self.assertEqual([policy['PolicyName'] for policy in unused_policies], ['unused'])
+        self.assertNotIn('PolicyVersionList', unused_policies[0])
+        client.get_paginator.assert_called_once_with('get_account_authorization_details')
+        client.list_entities_for_policy.assert_not_called()
+        self.assertEqual(len(self.policy.unused_policies(include_newly_created=True)), 2)
+
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_policies_include_unused_principals(self, mock_client):
+        mock_client.return_value = self._mock_iam_client(
+            [
+                self._policy('unused'),
+                self._policy('stale_role', attachment_count=1),
+                self._policy('used_role', attachment_count=2),
+                self._policy('stale_group', attachment_count=1),
+                self._policy('used_user', attachment_count=1)
+            ],
+            roles=[
+                {
+                    'RoleName': 'stale', 'Path': '/', 'CreateDate': datetime(2022, 3, 15), 'RoleLastUsed': {},
+                    'AttachedManagedPolicies': [{'PolicyArn': self._arn('stale_role')}]
+                },
+                {
+                    'RoleName': 'used', 'Path': '/', 'CreateDate': datetime(2022, 3, 15),
+                    'RoleLastUsed': {'LastUsedDate': datetime.today()},
+                    'AttachedManagedPolicies': [{'PolicyArn': self._arn('used_role')}]
+                },
+                {
+                    'RoleName': 'other_stale', 'Path': '/', 'CreateDate': datetime(2022, 3, 15),
+                    'PermissionsBoundary': {'PermissionsBoundaryArn': self._arn('used_role')}
+                }
+            ],
+            users=[
+                {'UserName': 'stale_user', 'GroupList': ['stale_group']},
+                {'UserName': 'active_user', 'AttachedManagedPolicies': [{'PolicyArn': self._arn('used_user')}]},
+                {'UserName': 'other_user'}
+            ],
+            groups=[
+                {'GroupName': 'stale_group', 'AttachedManagedPolicies': [{'PolicyArn': self._arn('stale_group')}]}
+            ],
+            password_last_used={'active_user': datetime.today()}
+        )
+
+        self.assertEqual(
+            [policy['PolicyName'] for policy in self.policy.unused_policies(include_unused_principals=True)],
+            ['unused', 'stale_role', 'stale_group']
+        )
+        login_profile_calls = mock_client.return_value.get_login_profile.call_args_list
+        self.assertEqual([call.kwargs['UserName'] for call in login_profile_calls], ['stale_user'])
+
+
+if __name__ == "__main__":
+    unittest.main()
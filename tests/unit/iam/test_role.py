@@ -1,6 +1,11 @@
+import asyncio
+import json
+import threading
+import time
 import unittest
-from datetime import datetime
-from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
 
 from pyawsopstoolkit_insights.iam import Role
 
@@ -15,6 +20,46 @@ class TestRole(unittest.TestCase):
         self.session = Session(profile_name=self.profile_name)
         self.role = Role(session=self.session)
 
+    def _role(self, name, path='/', created_date=datetime(2022, 3, 15), last_used_date=None, boundary=False):
+        role = {
+            'RoleName': name,
+            'RoleId': 'ABCDGH',
+            'Arn': f'arn:aws:iam::{self.account.number}:role/{name}',
+            'Path': path,
+            'MaxSessionDuration': 3600,
+            'CreateDate': created_date,
+            'AssumeRolePolicyDocument': {'Version': '2012-10-17', 'Statement': []}
+        }
+        details = {**role, 'RoleLastUsed': {'LastUsedDate': last_used_date} if last_used_date else {}, 'Tags': []}
+        if boundary:
+            details['PermissionsBoundary'] = {
+                'PermissionsBoundaryType': 'Policy',
+                'PermissionsBoundaryArn': f'arn:aws:iam::{self.account.number}:policy/some_boundary'
+            }
+
+        return role, details
+
+    @staticmethod
+    def _mock_iam_client(roles):
+        client = MagicMock()
+        details = {role['RoleName']: detail for role, detail in roles}
+        client.get_paginator.return_value.paginate.return_value = [{'Roles': [role for role, _ in roles]}]
+        client.get_role.side_effect = lambda RoleName: {'Role': details[RoleName]}
+
+        return client
+
+    def _mock_blocking_iam_client(self, release):
+        client = self._mock_iam_client([self._role('test_role1')])
+        pages = client.get_paginator.return_value.paginate.return_value
+
+        def _paginate():
+            release.wait(5)
+            return pages
+
+        client.get_paginator.return_value.paginate.side_effect = _paginate
+
+        return client
+
     def test_initialization(self):
         self.assertEqual(self.role.session, self.session)
 
@@ -40,150 +85,460 @@ class TestRole(unittest.TestCase):
 
         self.assertEqual(len(self.role.unused_roles()), 0)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.Role')
-    def test_unused_roles_no_roles_matching_criteria(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.role import Role, LastUsed
-        from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_no_roles_matching_criteria(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._role('test_role', last_used_date=datetime.today(), boundary=True)
+        ])
 
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
+        self.assertEqual(len(self.role.unused_roles()), 0)
 
-        mock_iam.return_value.search_roles.return_value = [
-            Role(
-                account=self.account,
-                name='test_role',
-                id='ABCDGH',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role',
-                max_session_duration=3600,
-                permissions_boundary=PermissionsBoundary(
-                    type='Policy',
-                    arn=f'arn:aws:iam::{self.account.number}:policy/some_boundary'
-                ),
-                last_used=LastUsed(
-                    used_date=datetime.today()
-                ),
-                created_date=datetime(2022, 3, 15)
-            )
-        ]
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_some_roles_matching_criteria(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._role('test_role1', last_used_date=datetime.today(), boundary=True),
+            self._role('test_role2', created_date=datetime.today()),
+            self._role('test_role3', path='/service-role/'),
+            self._role('test_role4', path='/aws-service-role/')
+        ])
 
-        self.assertEqual(len(self.role.unused_roles()), 0)
+        self.assertEqual(len(self.role.unused_roles()), 1)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.Role')
-    def test_unused_roles_some_roles_matching_criteria(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.role import Role, LastUsed
-        from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_some_roles_matching_criteria_include_newly_created(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._role('test_role1', last_used_date=datetime.today(), boundary=True),
+            self._role('test_role2', created_date=datetime.today()),
+            self._role('test_role3', path='/service-role/'),
+            self._role('test_role4', path='/aws-service-role/')
+        ])
 
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
+        self.assertEqual(len(self.role.unused_roles(include_newly_created=True)), 2)
 
-        mock_iam.return_value.search_roles.return_value = [
-            Role(
-                account=self.account,
-                name='test_role1',
-                id='ABCDGH',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role1',
-                max_session_duration=3600,
-                permissions_boundary=PermissionsBoundary(
-                    type='Policy',
-                    arn=f'arn:aws:iam::{self.account.number}:policy/some_boundary'
-                ),
-                last_used=LastUsed(
-                    used_date=datetime.today()
-                ),
-                created_date=datetime(2022, 3, 15)
-            ),
-            Role(
-                account=self.account,
-                name='test_role2',
-                id='BCDGHY',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role2',
-                max_session_duration=3600,
-                last_used=None,
-                created_date=datetime.today()
-            ),
-            Role(
-                account=self.account,
-                name='test_role3',
-                id='BCDGHY',
-                path='/service-role/',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role3',
-                max_session_duration=3600,
-                last_used=None,
-                created_date=datetime(2022, 3, 15)
-            ),
-            Role(
-                account=self.account,
-                name='test_role2',
-                id='BCDGHY',
-                path='/aws-service-role/',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role2',
-                max_session_duration=3600,
-                last_used=None,
-                created_date=datetime(2022, 3, 15)
-            )
-        ]
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_skips_detail_calls(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        client = self._mock_iam_client([
+            self._role('test_role1', created_date=datetime.today()),
+            self._role('test_role2', path='/aws-service-role/'),
+            self._role('test_role3', path='/service-role/', boundary=True)
+        ])
+        mock_client.return_value = client
 
-        self.assertEqual(len(self.role.unused_roles()), 1)
+        unused_roles = self.role.unused_roles()
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.Role')
-    def test_unused_roles_some_roles_matching_criteria_include_newly_created(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.role import Role, LastUsed
-        from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
+        client.get_role.assert_called_once_with(RoleName='test_role3')
+        self.assertEqual([role.name for role in unused_roles], ['test_role3'])
+        self.assertEqual(unused_roles[0].path, '/service-role/')
+        self.assertIsNone(unused_roles[0].permissions_boundary)
+        self.assertIsNone(unused_roles[0].assume_role_policy_document)
 
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_top_unused(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._role('test_role1', last_used_date=datetime(2023, 1, 10)),
+            self._role('test_role2', created_date=datetime(2021, 1, 1)),
+            self._role('test_role3', last_used_date=datetime.today()),
+            self._role('test_role4', last_used_date=datetime(2022, 6, 1)),
+            self._role('test_role5', created_date=datetime(2022, 1, 1))
+        ])
 
-        mock_iam.return_value.search_roles.return_value = [
-            Role(
-                account=self.account,
-                name='test_role1',
-                id='ABCDGH',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role1',
-                max_session_duration=3600,
-                permissions_boundary=PermissionsBoundary(
-                    type='Policy',
-                    arn=f'arn:aws:iam::{self.account.number}:policy/some_boundary'
-                ),
-                last_used=LastUsed(
-                    used_date=datetime.today()
-                ),
-                created_date=datetime(2022, 3, 15)
-            ),
-            Role(
-                account=self.account,
-                name='test_role2',
-                id='BCDGHY',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role2',
-                max_session_duration=3600,
-                last_used=None,
-                created_date=datetime.today()
-            ),
-            Role(
-                account=self.account,
-                name='test_role3',
-                id='BCDGHY',
-                path='/service-role/',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role3',
-                max_session_duration=3600,
-                last_used=None,
-                created_date=datetime(2022, 3, 15)
+        self.assertEqual(
+            [role.name for role in self.role.top_unused(k=3)], ['test_role2', 'test_role5', 'test_role4']
+        )
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_top_unused_by_created_date(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._role('test_role1', created_date=datetime(2023, 1, 10)),
+            self._role('test_role2', created_date=datetime(2021, 1, 1)),
+            self._role('test_role3', created_date=datetime(2022, 1, 1))
+        ])
+
+        self.assertEqual(
+            [role.name for role in self.role.top_unused(k=2, by='created_date')], ['test_role2', 'test_role3']
+        )
+
+    def test_top_unused_invalid_parameters(self):
+        with self.assertRaises(TypeError):
+            self.role.top_unused(k='10')
+        with self.assertRaises(ValueError):
+            self.role.top_unused(k=0)
+        with self.assertRaises(ValueError):
+            self.role.top_unused(by='last_activity')
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_coalesces_concurrent_calls(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        release = threading.Event()
+        mock_client.return_value = self._mock_blocking_iam_client(release)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(Role(session=self.session).unused_roles) for _ in range(4)]
+            time.sleep(0.2)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(mock_client.call_count, 1)
+        self.assertTrue(all([role.name for role in result] == ['test_role1'] for result in results))
+        self.assertEqual(len({id(result) for result in results}), 4)
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_coalesces_concurrent_asyncio_calls(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        release = threading.Event()
+        mock_client.return_value = self._mock_blocking_iam_client(release)
+
+        async def _unused_roles():
+            tasks = [asyncio.ensure_future(asyncio.to_thread(self.role.unused_roles)) for _ in range(3)]
+            await asyncio.sleep(0.2)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        results = asyncio.run(_unused_roles())
+
+        self.assertEqual(mock_client.call_count, 1)
+        self.assertTrue(all(len(result) == 1 for result in results))
+
+        self.role.unused_roles()
+        self.assertEqual(mock_client.call_count, 2)
+
+    def test_session_key_resolves_profile_identity(self):
+        from botocore.credentials import Credentials, DeferredRefreshableCredentials
+        from pyawsopstoolkit_insights.__fetch__ import _session_key
+
+        with patch('botocore.session.Session.get_credentials', side_effect=[
+            Credentials('AKIAREPLAY1', 'secret'), Credentials('AKIAREPLAY2', 'secret')
+        ]):
+            self.assertEqual(_session_key(self.session)[:2], ('temp', 'AKIAREPLAY1'))
+            self.assertEqual(_session_key(self.session)[:2], ('temp', 'AKIAREPLAY2'))
+
+        refresh = MagicMock()
+        with patch(
+                'botocore.session.Session.get_credentials',
+                return_value=DeferredRefreshableCredentials(refresh_using=refresh, method='sso')
+        ):
+            self.assertEqual(_session_key(self.session)[:2], ('temp', None))
+        refresh.assert_not_called()
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_does_not_coalesce_different_parameters(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        release = threading.Event()
+        mock_client.return_value = self._mock_blocking_iam_client(release)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(self.role.unused_roles, no_of_days) for no_of_days in [30, 90]]
+            time.sleep(0.2)
+            release.set()
+            [future.result() for future in futures]
+
+        self.assertEqual(mock_client.call_count, 2)
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_no_of_days_boundary(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._role('test_role1', last_used_date=datetime.today() - timedelta(days=90)),
+            self._role('test_role2', last_used_date=datetime.today() - timedelta(days=91))
+        ])
+
+        self.assertEqual([role.name for role in self.role.unused_roles()], ['test_role2'])
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_trusted(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._role('test_role1', last_used_date=datetime(2022, 6, 1)),
+            self._role('test_role2'),
+            self._role('test_role3', last_used_date=datetime.today())
+        ])
+
+        trusted_role = Role(session=self.session, trusted=True)
+
+        self.assertTrue(trusted_role.trusted)
+        self.assertEqual(trusted_role.unused_roles(), self.role.unused_roles())
+        self.assertEqual(
+            [role.to_dict() for role in trusted_role.top_unused(k=1)],
+            [role.to_dict() for role in self.role.top_unused(k=1)]
+        )
+
+    def test_trusted_invalid_type(self):
+        with self.assertRaises(TypeError):
+            Role(session=self.session, trusted='yes')
+        with self.assertRaises(TypeError):
+            self.role.trusted = 1
+
+    def _trust_policy_roles(self):
+        def _statement(principal, condition=None):
+            statement = {'Effect': 'Allow', 'Principal': principal, 'Action': 'sts:AssumeRole'}
+            if condition:
+                statement['Condition'] = condition
+            return {'Version': '2012-10-17', 'Statement': [statement]}
+
+        external = _statement({'AWS': 'arn:aws:iam::210987654321:root'})
+        documents = {
+            'test_role1': _statement({'Service': 'ec2.amazonaws.com'}),
+            'test_role2': external,
+            'test_role3': _statement(
+                {'AWS': ['210987654321']}, {'StringEquals': {'sts:ExternalId': 'some_external_id'}}
             ),
-            Role(
-                account=self.account,
-                name='test_role2',
-                id='BCDGHY',
-                path='/aws-service-role/',
-                arn=f'arn:aws:iam::{self.account.number}:role/test_role2',
-                max_session_duration=3600,
-                last_used=None,
-                created_date=datetime(2022, 3, 15)
-            )
-        ]
+            'test_role4': _statement('*'),
+            'test_role5': _statement({'AWS': '*'}, {'StringEquals': {'aws:PrincipalOrgID': 'o-a1b2c3d4e5'}}),
+            'test_role6': external,
+            'test_role7': _statement({'AWS': f'arn:aws:iam::{self.account.number}:role/some_role'})
+        }
+        roles = []
+        for name, document in documents.items():
+            role, details = self._role(name)
+            role['AssumeRolePolicyDocument'] = document
+            roles.append((role, details))
 
-        self.assertEqual(len(self.role.unused_roles(include_newly_created=True)), 2)
+        return roles
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_risky_trust_policies(self, mock_client, mock_account):
+        from pyawsopstoolkit_insights import iam
+
+        mock_account.return_value = self.account
+        client = self._mock_iam_client(self._trust_policy_roles())
+        mock_client.return_value = client
+
+        with patch(
+                'pyawsopstoolkit_insights.iam._trust_policy_findings', wraps=iam._trust_policy_findings
+        ) as mock_eval:
+            risky_roles = self.role.risky_trust_policies()
+
+        self.assertEqual(
+            {role['RoleName']: sorted(finding['Rule'] for finding in role['Findings']) for role in risky_roles},
+            {
+                'test_role2': ['external_account', 'missing_external_id'],
+                'test_role3': ['external_account'],
+                'test_role4': ['wildcard_principal'],
+                'test_role6': ['external_account', 'missing_external_id']
+            }
+        )
+        self.assertEqual(risky_roles[0]['Findings'][0]['Principal'], 'arn:aws:iam::210987654321:root')
+        self.assertEqual(mock_eval.call_count, 6)
+        client.get_role.assert_not_called()
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_risky_trust_policies_trusted_accounts_and_rules(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client(self._trust_policy_roles())
+
+        self.assertEqual(
+            [role['RoleName'] for role in self.role.risky_trust_policies(trusted_accounts=['210987654321'])],
+            ['test_role4']
+        )
+        self.assertEqual(
+            [role['RoleName'] for role in self.role.risky_trust_policies(rules=['missing_external_id'])],
+            ['test_role2', 'test_role6']
+        )
+
+    def test_risky_trust_policies_invalid_parameters(self):
+        with self.assertRaises(TypeError):
+            self.role.risky_trust_policies(trusted_accounts='210987654321')
+        with self.assertRaises(ValueError):
+            self.role.risky_trust_policies(rules=['unknown'])
+
+    def test_compile_trust_policy_url_encoded(self):
+        from urllib.parse import quote
+
+        from pyawsopstoolkit_insights.iam import _compile_trust_policy
+
+        document = {'Statement': {'Effect': 'Allow', 'Principal': {'AWS': '*'}, 'Action': ['sts:AssumeRole']}}
+        digest, compiled = _compile_trust_policy(quote(json.dumps(document)))
+
+        self.assertEqual(_compile_trust_policy(document), (digest, compiled))
+        self.assertIs(_compile_trust_policy(document)[1], compiled)
+        self.assertEqual(compiled[0]['Principals'], (('AWS', '*'),))
+
+    def test_compile_trust_policy_wildcard_actions(self):
+        from pyawsopstoolkit_insights.iam import _compile_trust_policy
+
+        def _compiled(**actions):
+            return _compile_trust_policy({'Statement': [{'Effect': 'Allow', 'Principal': {'AWS': '*'}, **actions}]})[1]
+
+        for action in ('sts:Assume*', 'STS:AssumeRole*', 'sts:*', '*', 'sts:AssumeRoleWith?AML', ['s3:*', 'sts:As*']):
+            self.assertEqual(len(_compiled(Action=action)), 1, action)
+        for action in ('sts:GetCallerIdentity', 'sts:TagSession', 's3:*', 'sts:AssumeRoot*'):
+            self.assertEqual(_compiled(Action=action), (), action)
+
+    def test_compile_trust_policy_not_action(self):
+        from pyawsopstoolkit_insights.iam import _compile_trust_policy
+
+        def _compiled(not_action):
+            return _compile_trust_policy({
+                'Statement': [{'Effect': 'Allow', 'Principal': {'AWS': '*'}, 'NotAction': not_action}]
+            })[1]
+
+        for not_action in ('sts:TagSession', 's3:*', 'sts:AssumeRoleWithSAML', ['sts:AssumeRole', 'sts:*SAML']):
+            self.assertEqual(len(_compiled(not_action)), 1, not_action)
+        for not_action in ('sts:Assume*', 'sts:*', '*', ['sts:AssumeRole', 'sts:AssumeRoleWith*']):
+            self.assertEqual(_compiled(not_action), (), not_action)
+
+    def test_trust_policy_findings_condition_operators(self):
+        from pyawsopstoolkit_insights.iam import _compile_trust_policy, _trust_policy_findings
+
+        def _rules(principal, condition):
+            compiled = _compile_trust_policy({'Statement': [{
+                'Effect': 'Allow', 'Principal': {'AWS': principal}, 'Action': 'sts:AssumeRole', 'Condition': condition
+            }]})[1]
+            rules = ('wildcard_principal', 'missing_external_id')
+            return [
+                finding['Rule'] for finding in _trust_policy_findings(compiled, self.account.number, frozenset(), rules)
+            ]
+
+        for condition in (
+                {'Null': {'aws:PrincipalOrgID': 'false'}},
+                {'StringNotEquals': {'aws:PrincipalOrgID': 'o-a1b2c3d4e5'}},
+                {'ForAnyValue:StringLike': {'aws:PrincipalOrgID': '*'}},
+                {'StringLike': {'aws:PrincipalArn': ['arn:aws:iam::*', '*']}},
+                {'StringEqualsIfExists': {'aws:PrincipalOrgID': 'o-a1b2c3d4e5'}},
+                {'ForAllValues:StringEquals': {'aws:PrincipalOrgID': 'o-a1b2c3d4e5'}}
+        ):
+            self.assertEqual(_rules('*', condition), ['wildcard_principal'], condition)
+        for condition in (
+                {'StringEquals': {'aws:PrincipalOrgID': 'o-a1b2c3d4e5'}},
+                {'ForAnyValue:StringLike': {'aws:PrincipalOrgPaths': 'o-a1b2c3d4e5/r-ab12/*'}},
+                {'ArnLike': {'aws:PrincipalArn': 'arn:aws:iam::123456789012:role/*'}}
+        ):
+            self.assertEqual(_rules('*', condition), [], condition)
+
+        self.assertEqual(
+            _rules('210987654321', {'StringLike': {'sts:ExternalId': '*'}}), ['missing_external_id']
+        )
+        self.assertEqual(_rules('210987654321', {'StringEquals': {'sts:ExternalId': 'some_external_id'}}), [])
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_risky_trust_policies_wildcard_actions(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        roles = self._trust_policy_roles()[3:4]
+        roles[0][0]['AssumeRolePolicyDocument'] = {
+            'Statement': [{'Effect': 'Allow', 'Principal': {'AWS': '*'}, 'Action': 'sts:Assume*'}]
+        }
+        mock_client.return_value = self._mock_iam_client(roles)
+
+        self.assertEqual(
+            [finding['Rule'] for role in self.role.risky_trust_policies() for finding in role['Findings']],
+            ['wildcard_principal']
+        )
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_chunked(self, mock_client, mock_account):
+        import tempfile
+
+        mock_account.return_value = self.account
+        client = self._mock_iam_client([
+            *[self._role(f'test_role{i}') for i in range(5)],
+            self._role('test_role5', last_used_date=datetime.today())
+        ])
+        mock_client.return_value = client
+
+        with patch(
+                'pyawsopstoolkit_insights.__fetch__.tempfile.TemporaryFile', wraps=tempfile.TemporaryFile
+        ) as spill:
+            unused_roles = self.role.unused_roles(chunk_size=2, max_memory=1)
+
+            self.assertNotIsInstance(unused_roles, list)
+            self.assertEqual([role.name for role in unused_roles], [f'test_role{i}' for i in range(5)])
+            spill.assert_called_once()
+        client.get_paginator.return_value.paginate.assert_called_once_with(PaginationConfig={'PageSize': 2})
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_roles_chunked_raises_on_call(self, mock_client, mock_account):
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+
+        mock_account.return_value = self.account
+        client = self._mock_iam_client([self._role('test_role1')])
+        client.get_role.side_effect = ClientError({'Error': {'Code': 'AccessDenied'}}, 'GetRole')
+        mock_client.return_value = client
+
+        with self.assertRaises(AdvanceSearchError):
+            self.role.unused_roles(max_memory=1024)
+
+    def test_unused_roles_chunked_invalid_parameters(self):
+        with self.assertRaises(TypeError):
+            self.role.unused_roles(chunk_size='100')
+        with self.assertRaises(ValueError):
+            self.role.unused_roles(chunk_size=0)
+        with self.assertRaises(ValueError):
+            self.role.unused_roles(max_memory=-1)
+
+    def test_unused_roles_chunked_peak_memory(self):
+        import tracemalloc
+
+        def _role(i):
+            return {
+                'RoleName': f'test_role{i}',
+                'RoleId': f'ABCDGH{i}',
+                'Arn': f'arn:aws:iam::{self.account.number}:role/test_role{i}',
+                'Path': '/',
+                'MaxSessionDuration': 3600,
+                'CreateDate': datetime(2022, 3, 15)
+            }
+
+        class _Paginator:
+            def __init__(self, count):
+                self.count = count
+
+            def paginate(self, PaginationConfig=None):
+                page_size = (PaginationConfig or {}).get('PageSize', 100)
+                for start in range(0, self.count, page_size):
+                    yield {'Roles': [_role(i) for i in range(start, min(start + page_size, self.count))]}
+
+        class _Client:
+            def __init__(self, count):
+                self.count = count
+
+            def get_paginator(self, operation_name):
+                return _Paginator(self.count)
+
+            @staticmethod
+            def get_role(RoleName):
+                return {'Role': {**_role(int(RoleName[len('test_role'):])), 'RoleLastUsed': {}}}
+
+        def _peak(count, **kwargs):
+            with patch('pyawsopstoolkit_insights.iam._get_client', return_value=_Client(count)):
+                tracemalloc.start()
+                try:
+                    self.assertEqual(sum(1 for _ in role.unused_roles(**kwargs)), count)
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        role = Role(session=self.session, trusted=True)
+        with patch('pyawsopstoolkit.session.Session.get_account', return_value=self.account):
+            _peak(100, chunk_size=50, max_memory=64 * 1024)
+            small = _peak(1000, chunk_size=50, max_memory=64 * 1024)
+            large = _peak(4000, chunk_size=50, max_memory=64 * 1024)
+            unbounded = _peak(4000)
+
+        self.assertLess(large, small * 1.5)
+        self.assertLess(large * 4, unbounded)
 
 
 if __name__ == "__main__":
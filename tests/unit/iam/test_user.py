@@ -1,6 +1,6 @@
 import unittest
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from pyawsopstoolkit_insights.iam import User
 
@@ -15,6 +15,75 @@ class TestUser(unittest.TestCase):
         self.session = Session(profile_name=self.profile_name)
         self.user = User(session=self.session)
 
+    def _user(
+            self, name, created_date=datetime(2022, 5, 18), password_last_used_date=None, login_profile_date=None,
+            access_key_last_used_date=None
+    ):
+        user = {
+            'UserName': name,
+            'UserId': 'ABDCGHY',
+            'Arn': f'arn:aws:iam::{self.account.number}:user/{name}',
+            'Path': '/',
+            'CreateDate': created_date
+        }
+        if password_last_used_date:
+            user['PasswordLastUsed'] = password_last_used_date
+
+        return {
+            'user': user,
+            'login_profile_date': login_profile_date,
+            'access_key_last_used_date': access_key_last_used_date
+        }
+
+    @staticmethod
+    def _mock_iam_client(users):
+        from botocore.exceptions import ClientError
+
+        client = MagicMock()
+        details = {user['user']['UserName']: user for user in users}
+
+        def _get_paginator(operation_name):
+            paginator = MagicMock()
+            if operation_name == 'list_users':
+                paginator.paginate.return_value = [{'Users': [user['user'] for user in users]}]
+            else:
+                paginator.paginate.side_effect = lambda UserName: [{'AccessKeyMetadata': [{
+                    'UserName': UserName,
+                    'AccessKeyId': f'{UserName}_KEY1',
+                    'Status': 'Active',
+                    'CreateDate': datetime(2022, 6, 18)
+                }]}]
+
+            return paginator
+
+        def _get_login_profile(UserName):
+            login_profile_date = details[UserName]['login_profile_date']
+            if login_profile_date is None:
+                raise ClientError({'Error': {'Code': 'NoSuchEntity'}}, 'GetLoginProfile')
+
+            return {'LoginProfile': {'UserName': UserName, 'CreateDate': login_profile_date}}
+
+        def _get_access_key_last_used(AccessKeyId):
+            last_used_date = details[AccessKeyId.replace('_KEY1', '')]['access_key_last_used_date']
+
+            return {'AccessKeyLastUsed': {'LastUsedDate': last_used_date} if last_used_date else {}}
+
+        client.get_paginator.side_effect = _get_paginator
+        client.get_login_profile.side_effect = _get_login_profile
+        client.get_access_key_last_used.side_effect = _get_access_key_last_used
+
+        return client
+
+    def _some_users(self):
+        return [
+            self._user('test_user1', login_profile_date=datetime.today()),
+            self._user('test_user2', password_last_used_date=datetime.today()),
+            self._user('test_user3', access_key_last_used_date=datetime.today()),
+            self._user('test_user4', password_last_used_date=datetime(2022, 5, 20)),
+            self._user('test_user5'),
+            self._user('test_user6', created_date=datetime.today())
+        ]
+
     def test_initialization(self):
         self.assertEqual(self.user.session, self.session)
 
@@ -40,234 +109,146 @@ class TestUser(unittest.TestCase):
 
         self.assertEqual(len(self.user.unused_users()), 0)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.User')
-    def test_unused_users_no_users_matching_criteria1(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.user import User
-
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
-
-        mock_iam.return_value.search_users.return_value = [
-            User(
-                account=self.account,
-                name='test_user',
-                id='ABCDGJH',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user',
-                created_date=datetime(2022, 5, 18),
-                password_last_used_date=datetime.today()
-            )
-        ]
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_no_users_matching_criteria1(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._user('test_user', password_last_used_date=datetime.today())
+        ])
 
         self.assertEqual(len(self.user.unused_users()), 0)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.User')
-    def test_unused_users_no_users_matching_criteria2(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.user import User, LoginProfile
-
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
-
-        mock_iam.return_value.search_users.return_value = [
-            User(
-                account=self.account,
-                name='test_user',
-                id='ABCDGJH',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user',
-                created_date=datetime(2022, 5, 18),
-                login_profile=LoginProfile(
-                    created_date=datetime.today()
-                )
-            )
-        ]
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_no_users_matching_criteria2(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._user('test_user', login_profile_date=datetime.today())
+        ])
 
         self.assertEqual(len(self.user.unused_users()), 0)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.User')
-    def test_unused_users_no_users_matching_criteria3(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.user import User
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_no_users_matching_criteria3(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._user('test_user', created_date=datetime.today())
+        ])
 
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
+        self.assertEqual(len(self.user.unused_users()), 0)
 
-        mock_iam.return_value.search_users.return_value = [
-            User(
-                account=self.account,
-                name='test_user',
-                id='ABCDGJH',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user',
-                created_date=datetime(2022, 5, 18),
-                password_last_used_date=datetime.today()
-            )
-        ]
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_no_users_matching_criteria4(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._user('test_user', access_key_last_used_date=datetime.today())
+        ])
 
         self.assertEqual(len(self.user.unused_users()), 0)
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.User')
-    def test_unused_users_no_users_matching_criteria4(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.user import User, AccessKey
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_some_roles_matching_criteria(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client(self._some_users())
 
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
+        unused_users = self.user.unused_users()
 
-        mock_iam.return_value.search_users.return_value = [
-            User(
-                account=self.account,
-                name='test_user',
-                id='ABCDGJH',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user',
-                created_date=datetime(2022, 5, 18),
-                access_keys=[
-                    AccessKey(
-                        id='ACCESS_KEY1',
-                        status='Active',
-                        created_date=datetime(2022, 6, 18),
-                        last_used_date=datetime.today()
-                    )
-                ]
-            )
-        ]
+        self.assertEqual(len(unused_users), 2)
+        self.assertEqual(sorted(user.name for user in unused_users), ['test_user4', 'test_user5'])
 
-        self.assertEqual(len(self.user.unused_users()), 0)
-
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.User')
-    def test_unused_users_some_roles_matching_criteria(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.user import User, LoginProfile, AccessKey
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_some_roles_matching_criteria_include_newly_created(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client(self._some_users())
 
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
+        self.assertEqual(len(self.user.unused_users(include_newly_created=True)), 3)
 
-        mock_iam.return_value.search_users.return_value = [
-            User(
-                account=self.account,
-                name='test_user1',
-                id='ABDCGHY',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user1',
-                created_date=datetime(2022, 5, 18),
-                login_profile=LoginProfile(
-                    created_date=datetime.today()
-                )
-            ),
-            User(
-                account=self.account,
-                name='test_user2',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user2',
-                created_date=datetime(2022, 5, 18),
-                password_last_used_date=datetime.today()
-            ),
-            User(
-                account=self.account,
-                name='test_user3',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user3',
-                created_date=datetime(2022, 5, 18),
-                access_keys=[
-                    AccessKey(
-                        id='ACCESS_KEY1',
-                        status='Active',
-                        created_date=datetime(2022, 6, 18),
-                        last_used_date=datetime.today()
-                    )
-                ]
-            ),
-            User(
-                account=self.account,
-                name='test_user4',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user4',
-                created_date=datetime(2022, 5, 18),
-                password_last_used_date=datetime(2022, 5, 20)
-            ),
-            User(
-                account=self.account,
-                name='test_user5',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user5',
-                created_date=datetime(2022, 5, 18)
-            ),
-            User(
-                account=self.account,
-                name='test_user5',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user5',
-                created_date=datetime.today()
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_skips_detail_calls(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        client = self._mock_iam_client(self._some_users())
+        mock_client.return_value = client
+
+        unused_users = self.user.unused_users()
+
+        client.get_user.assert_not_called()
+        self.assertEqual(
+            sorted(call.kwargs['UserName'] for call in client.get_login_profile.call_args_list),
+            ['test_user1', 'test_user3', 'test_user4', 'test_user5']
+        )
+        self.assertEqual(
+            sorted(call.kwargs['AccessKeyId'] for call in client.get_access_key_last_used.call_args_list),
+            ['test_user3_KEY1', 'test_user4_KEY1', 'test_user5_KEY1']
+        )
+        self.assertTrue(all(user.permissions_boundary is None for user in unused_users))
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_top_unused(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client([
+            self._user('test_user1', password_last_used_date=datetime(2022, 5, 20)),
+            self._user('test_user2', access_key_last_used_date=datetime(2022, 5, 19)),
+            self._user('test_user3', created_date=datetime(2021, 1, 1)),
+            self._user('test_user4', password_last_used_date=datetime.today())
+        ])
+
+        self.assertEqual(
+            [user.name for user in self.user.top_unused(k=2)], ['test_user3', 'test_user2']
+        )
+        self.assertEqual(
+            [user.name for user in self.user.top_unused(k=10, by='created_date')],
+            ['test_user3', 'test_user1', 'test_user2']
+        )
+
+    def test_top_unused_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            self.user.top_unused(k=-1)
+        with self.assertRaises(ValueError):
+            self.user.top_unused(by='last_used')
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_trusted(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client(self._some_users() + [
+            self._user(
+                'test_user7', login_profile_date=datetime(2022, 5, 19), access_key_last_used_date=datetime(2022, 6, 1)
             )
-        ]
+        ])
 
-        self.assertEqual(len(self.user.unused_users()), 2)
+        trusted_user = User(session=self.session, trusted=True)
+        unused_users = trusted_user.unused_users()
 
-    @patch('boto3.Session')
-    @patch('pyawsopstoolkit_advsearch.iam.User')
-    def test_unused_users_some_roles_matching_criteria_include_newly_created(self, mock_iam, mock_session):
-        from pyawsopstoolkit_models.iam.user import User, LoginProfile, AccessKey
+        self.assertEqual(sorted(user.name for user in unused_users), ['test_user4', 'test_user5', 'test_user7'])
+        self.assertEqual(unused_users, self.user.unused_users())
+        self.assertEqual(
+            [user.to_dict() for user in trusted_user.top_unused(k=2)],
+            [user.to_dict() for user in self.user.top_unused(k=2)]
+        )
 
-        session_instance = mock_session.return_value
-        session_instance.client.return_value.list_buckets.return_value = {}
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def test_unused_users_chunked(self, mock_client, mock_account):
+        mock_account.return_value = self.account
+        mock_client.return_value = self._mock_iam_client(self._some_users())
 
-        mock_iam.return_value.search_users.return_value = [
-            User(
-                account=self.account,
-                name='test_user1',
-                id='ABDCGHY',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user1',
-                created_date=datetime(2022, 5, 18),
-                login_profile=LoginProfile(
-                    created_date=datetime.today()
-                )
-            ),
-            User(
-                account=self.account,
-                name='test_user2',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user2',
-                created_date=datetime(2022, 5, 18),
-                password_last_used_date=datetime.today()
-            ),
-            User(
-                account=self.account,
-                name='test_user3',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user3',
-                created_date=datetime(2022, 5, 18),
-                access_keys=[
-                    AccessKey(
-                        id='ACCESS_KEY1',
-                        status='Active',
-                        created_date=datetime(2022, 6, 18),
-                        last_used_date=datetime.today()
-                    )
-                ]
-            ),
-            User(
-                account=self.account,
-                name='test_user4',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user4',
-                created_date=datetime(2022, 5, 18),
-                password_last_used_date=datetime(2022, 5, 20)
-            ),
-            User(
-                account=self.account,
-                name='test_user5',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user5',
-                created_date=datetime(2022, 5, 18)
-            ),
-            User(
-                account=self.account,
-                name='test_user5',
-                id='SHJYG',
-                arn=f'arn:aws:iam::{self.account.number}:user/test_user5',
-                created_date=datetime.today()
-            )
-        ]
+        unused_users = self.user.unused_users(chunk_size=1, max_memory=1)
 
-        self.assertEqual(len(self.user.unused_users(include_newly_created=True)), 3)
+        self.assertNotIsInstance(unused_users, list)
+        self.assertEqual([user.name for user in unused_users], ['test_user4', 'test_user5'])
+
+    def test_unused_users_chunked_invalid_parameters(self):
+        with self.assertRaises(TypeError):
+            self.user.unused_users(max_memory=1.5)
+        with self.assertRaises(ValueError):
+            self.user.unused_users(chunk_size=-1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,340 @@
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from pyawsopstoolkit_insights.remediation import Remediator
+
+
+def _client_error(code, operation_name):
+    from botocore.exceptions import ClientError
+
+    return ClientError({'Error': {'Code': code, 'Message': code}}, operation_name)
+
+
+class _FakeAWS:
+    """
+    A local in-memory IAM and EC2 backend enforcing the deletion dependencies of AWS, i.e. a role cannot be deleted
+    while attached, and a security group cannot be deleted while referenced by another security group.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.failures = {}
+        self.active = 0
+        self.max_active = 0
+        self.roles = {
+            'role1': {
+                'profiles': {'profile1'}, 'policies': {'arn:aws:iam::aws:policy/ReadOnlyAccess'}, 'inline': set()
+            },
+            'role2': {'profiles': set(), 'policies': set(), 'inline': {'inline1', 'inline2'}},
+            'role3': {'profiles': set(), 'policies': set(), 'inline': set()}
+        }
+        self.groups = {
+            'sg-0': {'GroupName': 'default', 'IpPermissions': [], 'IpPermissionsEgress': []},
+            'sg-1': {'IpPermissions': [], 'IpPermissionsEgress': []},
+            'sg-2': {'IpPermissions': [
+                {'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443, 'UserIdGroupPairs': [{'GroupId': 'sg-1'}]}
+            ], 'IpPermissionsEgress': []},
+            'sg-3': {'IpPermissions': [
+                {'IpProtocol': 'tcp', 'FromPort': 22, 'ToPort': 22, 'UserIdGroupPairs': [{'GroupId': 'sg-0'}]}
+            ], 'IpPermissionsEgress': [
+                {'IpProtocol': '-1', 'UserIdGroupPairs': [{'GroupId': 'sg-2'}, {'GroupId': 'sg-3'}]}
+            ]}
+        }
+
+    def client(self, session, service_name, region=None):
+        return SimpleNamespace(**{
+            name: self._call(name, getattr(self, name))
+            for name in dir(self) if not name.startswith('_') and name not in ('client', 'calls', 'lock')
+            and callable(getattr(self, name))
+        })
+
+    def _call(self, name, fn):
+        def _wrapper(*args, **kwargs):
+            with self.lock:
+                self.calls.append((name, kwargs))
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+            try:
+                if name in self.failures:
+                    raise _client_error(self.failures[name], name)
+                threading.Event().wait(0.01)
+                with self.lock:
+                    return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+        return _wrapper
+
+    def _role(self, role_name, operation_name):
+        if role_name not in self.roles:
+            raise _client_error('NoSuchEntity', operation_name)
+
+        return self.roles[role_name]
+
+    def get_paginator(self, operation_name):
+        pages = {
+            'list_instance_profiles_for_role': lambda RoleName: [{'InstanceProfiles': [
+                {'InstanceProfileName': name} for name in sorted(self._role(RoleName, operation_name)['profiles'])
+            ]}],
+            'list_attached_role_policies': lambda RoleName: [{'AttachedPolicies': [
+                {'PolicyArn': arn} for arn in sorted(self._role(RoleName, operation_name)['policies'])
+            ]}],
+            'list_role_policies': lambda RoleName: [{
+                'PolicyNames': sorted(self._role(RoleName, operation_name)['inline'])
+            }],
+            'describe_security_groups': lambda: [{'SecurityGroups': [
+                {'GroupId': group_id, **group} for group_id, group in self.groups.items()
+            ]}]
+        }
+
+        return SimpleNamespace(paginate=pages[operation_name])
+
+    def remove_role_from_instance_profile(self, InstanceProfileName, RoleName):
+        self._role(RoleName, 'RemoveRoleFromInstanceProfile')['profiles'].remove(InstanceProfileName)
+
+    def detach_role_policy(self, PolicyArn, RoleName):
+        self._role(RoleName, 'DetachRolePolicy')['policies'].remove(PolicyArn)
+
+    def delete_role_policy(self, PolicyName, RoleName):
+        self._role(RoleName, 'DeleteRolePolicy')['inline'].remove(PolicyName)
+
+    def delete_role(self, RoleName):
+        if any(self._role(RoleName, 'DeleteRole').values()):
+            raise _client_error('DeleteConflict', 'DeleteRole')
+        del self.roles[RoleName]
+
+    def _revoke(self, key, GroupId, IpPermissions):
+        def _match(pair):
+            return {k: v for k, v in pair.items() if k != 'Description'}
+
+        revoked = [_match(pair) for permission in IpPermissions for pair in permission['UserIdGroupPairs']]
+        existing = [_match(pair) for permission in self.groups[GroupId][key] for pair in permission['UserIdGroupPairs']]
+        if any(pair not in existing for pair in revoked):
+            raise _client_error('InvalidPermission.NotFound', 'RevokeSecurityGroupIngress')
+        for permission in self.groups[GroupId][key]:
+            permission['UserIdGroupPairs'] = [
+                pair for pair in permission['UserIdGroupPairs'] if _match(pair) not in revoked
+            ]
+
+    def revoke_security_group_ingress(self, GroupId, IpPermissions):
+        self._revoke('IpPermissions', GroupId, IpPermissions)
+
+    def revoke_security_group_egress(self, GroupId, IpPermissions):
+        self._revoke('IpPermissionsEgress', GroupId, IpPermissions)
+
+    def delete_security_group(self, GroupId):
+        if GroupId not in self.groups:
+            raise _client_error('InvalidGroup.NotFound', 'DeleteSecurityGroup')
+        if self.groups[GroupId].get('GroupName') == 'default':
+            raise _client_error('CannotDelete', 'DeleteSecurityGroup')
+        for group_id, group in self.groups.items():
+            for permission in group['IpPermissions'] + group['IpPermissionsEgress']:
+                if group_id != GroupId and any(p['GroupId'] == GroupId for p in permission['UserIdGroupPairs']):
+                    raise _client_error('DependencyViolation', 'DeleteSecurityGroup')
+        del self.groups[GroupId]
+
+
+class TestRemediator(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.session import Session
+
+        self.session = Session(profile_name='temp')
+        self.aws = _FakeAWS()
+        self.patcher = patch('pyawsopstoolkit_insights.remediation._get_client', side_effect=self.aws.client)
+        self.patcher.start()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal = os.path.join(self.temp_dir.name, 'journal.jsonl')
+        self.roles = [SimpleNamespace(name=name) for name in ('role1', 'role2', 'role3')]
+        self.security_groups = [SimpleNamespace(id=group_id, region='eu-west-1') for group_id in ('sg-1', 'sg-2')]
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+        self.temp_dir.cleanup()
+
+    def _mutations(self):
+        return [name for name, _ in self.aws.calls if name not in ('get_paginator',)]
+
+    def test_initialization(self):
+        remediator = Remediator(session=self.session)
+
+        self.assertTrue(remediator.dry_run)
+        self.assertEqual(remediator.max_workers, 10)
+        self.assertIsNone(remediator.rate_limit)
+        self.assertIsNone(remediator.journal)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            Remediator(session=123)
+        with self.assertRaises(TypeError):
+            Remediator(session=self.session, dry_run='no')
+        with self.assertRaises(ValueError):
+            Remediator(session=self.session, max_workers=0)
+        with self.assertRaises(ValueError):
+            Remediator(session=self.session, rate_limit=-1)
+        with self.assertRaises(TypeError):
+            Remediator(session=self.session).plan(roles='role1')
+        with self.assertRaises(TypeError):
+            Remediator(session=self.session).execute('steps')
+
+    def test_plan(self):
+        steps = Remediator(session=self.session).plan(roles=self.roles, security_groups=self.security_groups)
+        steps_by_operation = {}
+        for step in steps:
+            steps_by_operation.setdefault(step['Operation'], []).append(step)
+
+        self.assertEqual(len(steps_by_operation['delete_role']), 3)
+        self.assertEqual(len(steps_by_operation['delete_role'][0]['DependsOn']), 2)
+        self.assertEqual(len(steps_by_operation['delete_role'][1]['DependsOn']), 2)
+        self.assertEqual(steps_by_operation['delete_role'][2]['DependsOn'], [])
+        self.assertEqual(
+            [step['Parameters']['GroupId'] for step in steps_by_operation['revoke_security_group_ingress']], ['sg-2']
+        )
+        self.assertEqual(
+            [step['Parameters']['GroupId'] for step in steps_by_operation['revoke_security_group_egress']], ['sg-3']
+        )
+        sg_1, sg_2 = steps_by_operation['delete_security_group']
+        self.assertEqual(sg_1['DependsOn'], [steps_by_operation['revoke_security_group_ingress'][0]['Id']])
+        self.assertEqual(sg_2['DependsOn'], [
+            steps_by_operation['revoke_security_group_egress'][0]['Id'],
+            steps_by_operation['revoke_security_group_ingress'][0]['Id']
+        ])
+        self.assertEqual(
+            steps, Remediator(session=self.session).plan(roles=self.roles, security_groups=self.security_groups)
+        )
+
+    def test_plan_missing_role(self):
+        steps = Remediator(session=self.session).plan(roles=[SimpleNamespace(name='unknown_role')])
+
+        self.assertEqual(steps, [])
+
+    def test_plan_excludes_default_security_groups(self):
+        remediator = Remediator(session=self.session, dry_run=False)
+        steps = remediator.plan(security_groups=[SimpleNamespace(id='sg-0', region='eu-west-1')] + self.security_groups)
+
+        self.assertFalse(any(step['Parameters']['GroupId'] == 'sg-0' for step in steps))
+        self.assertFalse(any('sg-0' in step['Id'] for step in steps))
+
+        result = remediator.execute(steps)
+
+        self.assertEqual(result['failed'], {})
+        self.assertEqual(sorted(self.aws.groups), ['sg-0', 'sg-3'])
+        self.assertEqual(self.aws.groups['sg-3']['IpPermissions'][0]['UserIdGroupPairs'], [{'GroupId': 'sg-0'}])
+
+    def test_execute_cross_account_reference(self):
+        self.aws.groups['sg-4'] = {'IpPermissions': [{
+            'IpProtocol': 'tcp', 'FromPort': 80, 'ToPort': 80, 'UserIdGroupPairs': [{
+                'GroupId': 'sg-1', 'UserId': '210987654321', 'VpcPeeringConnectionId': 'pcx-1', 'Description': 'peer'
+            }]
+        }], 'IpPermissionsEgress': []}
+        remediator = Remediator(session=self.session, dry_run=False)
+        steps = remediator.plan(security_groups=self.security_groups[:1])
+
+        self.assertIn(
+            {'GroupId': 'sg-1', 'UserId': '210987654321', 'VpcPeeringConnectionId': 'pcx-1'},
+            [pair for step in steps for permission in step['Parameters'].get('IpPermissions', [])
+             for pair in permission['UserIdGroupPairs']]
+        )
+
+        result = remediator.execute(steps)
+
+        self.assertEqual(result['failed'], {})
+        self.assertNotIn('sg-1', self.aws.groups)
+        self.assertEqual(self.aws.groups['sg-4']['IpPermissions'][0]['UserIdGroupPairs'], [])
+
+    def test_execute_dry_run(self):
+        remediator = Remediator(session=self.session)
+        steps = remediator.plan(roles=self.roles, security_groups=self.security_groups)
+        self.aws.calls.clear()
+
+        result = remediator.execute(steps)
+
+        self.assertEqual(len(result['executed']), len(steps))
+        self.assertLess(
+            result['executed'].index(steps[0]['Id']),
+            result['executed'].index(next(step['Id'] for step in steps if step['Operation'] == 'delete_role'))
+        )
+        self.assertEqual(self.aws.calls, [])
+        self.assertEqual(len(self.aws.roles), 3)
+
+    def test_execute(self):
+        remediator = Remediator(session=self.session, dry_run=False, max_workers=2)
+        steps = remediator.plan(roles=self.roles, security_groups=self.security_groups)
+        self.aws.max_active = 0
+
+        result = remediator.execute(steps)
+
+        self.assertEqual(sorted(result['executed']), sorted(step['Id'] for step in steps))
+        self.assertEqual(result['failed'], {})
+        self.assertEqual(result['blocked'], [])
+        self.assertEqual(self.aws.roles, {})
+        self.assertEqual(list(self.aws.groups), ['sg-0', 'sg-3'])
+        self.assertEqual(self.aws.groups['sg-3']['IpPermissionsEgress'][0]['UserIdGroupPairs'], [{'GroupId': 'sg-3'}])
+        self.assertLessEqual(self.aws.max_active, 2)
+
+    def test_execute_failure_blocks_dependents_and_resumes(self):
+        remediator = Remediator(session=self.session, dry_run=False, journal=self.journal)
+        steps = remediator.plan(roles=self.roles)
+        self.aws.failures['detach_role_policy'] = 'AccessDenied'
+
+        result = remediator.execute(steps)
+
+        self.assertEqual(
+            list(result['failed']), [step['Id'] for step in steps if step['Operation'] == 'detach_role_policy']
+        )
+        self.assertEqual(result['blocked'], [steps[2]['Id']])
+        self.assertEqual(sorted(self.aws.roles), ['role1'])
+        self.assertEqual(self.aws.roles['role1']['profiles'], set())
+
+        del self.aws.failures['detach_role_policy']
+        self.aws.calls.clear()
+        resumed = remediator.execute(steps)
+
+        self.assertEqual(len(resumed['skipped']), len(steps) - 2)
+        self.assertEqual(resumed['executed'], [steps[1]['Id'], steps[2]['Id']])
+        self.assertEqual(self._mutations(), ['detach_role_policy', 'delete_role'])
+        self.assertEqual(self.aws.roles, {})
+
+    def test_execute_already_applied(self):
+        remediator = Remediator(session=self.session, dry_run=False)
+        steps = remediator.plan(security_groups=self.security_groups)
+        del self.aws.groups['sg-1']
+
+        result = remediator.execute(steps)
+
+        self.assertEqual(result['failed'], {})
+        self.assertNotIn('sg-2', self.aws.groups)
+
+    @patch('pyawsopstoolkit_insights.remediation.time.sleep')
+    def test_execute_rate_limit(self, mock_sleep):
+        remediator = Remediator(session=self.session, dry_run=False, max_workers=1, rate_limit=2)
+        steps = remediator.plan(roles=self.roles)
+
+        remediator.execute(steps)
+
+        self.assertEqual(mock_sleep.call_count, len(steps) - 1)
+        self.assertAlmostEqual(
+            max(call.args[0] for call in mock_sleep.call_args_list), 0.5 * (len(steps) - 1), delta=0.25
+        )
+
+    def test_execute_invalid_steps(self):
+        remediator = Remediator(session=self.session)
+        step = {'Id': 'step1', 'Service': 'iam', 'Region': None, 'Operation': 'delete_role', 'Parameters': {}}
+
+        with self.assertRaises(ValueError):
+            remediator.execute([{**step, 'DependsOn': ['step2']}])
+        with self.assertRaises(ValueError):
+            remediator.execute([step, step])
+        with self.assertRaises(ValueError):
+            remediator.execute([
+                {**step, 'DependsOn': ['step2']}, {**step, 'Id': 'step2', 'DependsOn': ['step1']}
+            ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from pyawsopstoolkit_insights.replay import ReplayBackend
+
+
+class TestReplayBackend(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = ReplayBackend()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_initialization(self):
+        self.assertEqual(self.backend.account, '123456789012')
+        self.assertEqual(self.backend.latency, 0.0)
+        self.assertEqual(self.backend.throttle_rate, 0.0)
+        self.assertEqual(self.backend.max_attempts, 5)
+        self.assertEqual(self.backend.page_size, 100)
+        self.assertIsNone(self.backend.seed)
+        self.assertEqual(self.backend.stats()['total_calls'], 0)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            ReplayBackend(account=123456789012)
+        with self.assertRaises(ValueError):
+            ReplayBackend(latency=-1)
+        with self.assertRaises(ValueError):
+            ReplayBackend(throttle_rate=1.5)
+        with self.assertRaises(ValueError):
+            ReplayBackend(page_size=0)
+        with self.assertRaises(TypeError):
+            self.backend.max_attempts = '5'
+        with self.assertRaises(TypeError):
+            self.backend.populate(roles='10')
+        with self.assertRaises(TypeError):
+            self.backend.record('session')
+
+    def test_session(self):
+        from pyawsopstoolkit.session import Session
+
+        session = self.backend.session()
+
+        self.assertIsInstance(session, Session)
+        self.assertEqual(session.get_account().number, '123456789012')
+        self.assertEqual(self.backend.stats()['calls'], {'sts.GetCallerIdentity': 1})
+
+    def test_unused_roles(self):
+        from pyawsopstoolkit_insights.iam import Role
+
+        self.backend.populate(roles=250)
+
+        unused_roles = Role(session=self.backend.session()).unused_roles()
+
+        self.assertEqual(len(unused_roles), 125)
+        self.assertEqual(unused_roles[0].name, 'role1')
+        self.assertEqual(self.backend.stats()['calls'], {
+            'iam.GetRole': 250, 'iam.ListRoles': 3, 'sts.GetCallerIdentity': 1
+        })
+
+    def test_unused_users(self):
+        from pyawsopstoolkit_insights.iam import User
+
+        self.backend.populate(users=10)
+
+        unused_users = User(session=self.backend.session()).unused_users()
+
+        self.assertEqual([user.name for user in unused_users], ['user1', 'user3', 'user5', 'user7', 'user9'])
+        self.assertEqual(self.backend.stats()['calls'], {
+            'iam.GetLoginProfile': 5, 'iam.ListAccessKeys': 5, 'iam.ListUsers': 1, 'sts.GetCallerIdentity': 1
+        })
+
+    def test_unused_ec2_resources(self):
+        from pyawsopstoolkit_insights.ec2 import NetworkInterface, SecurityGroup
+
+        self.backend.page_size = 4
+        self.backend.populate(security_groups=6, network_interfaces=6, region='eu-west-1')
+        session = self.backend.session()
+
+        unused_security_groups = SecurityGroup(session=session).unused_security_groups('eu-west-1')
+        unused_network_interfaces = NetworkInterface(session=session).unused_network_interfaces('eu-west-1')
+
+        self.assertEqual([sg.id for sg in unused_security_groups], ['sg-00000003', 'sg-00000004', 'sg-00000005'])
+        self.assertEqual(
+            [eni['NetworkInterfaceId'] for eni in unused_network_interfaces],
+            ['eni-00000001', 'eni-00000003', 'eni-00000005']
+        )
+        self.assertEqual(self.backend.stats()['calls']['ec2.DescribeNetworkInterfaces'], 2)
+
+        client = session.get_session().client('ec2', region_name='eu-west-1')
+        page = client.describe_network_interfaces(MaxResults=5)
+        self.assertEqual(len(page['NetworkInterfaces']), 5)
+        self.assertEqual(page['NextToken'], '5')
+
+    def test_unsupported_filter(self):
+        from botocore.exceptions import ClientError
+
+        self.backend.populate(network_interfaces=2, region='eu-west-1')
+        client = self.backend.session().get_session().client('ec2', region_name='eu-west-1')
+
+        self.assertEqual(len(client.describe_network_interfaces(
+            Filters=[{'Name': 'status', 'Values': ['available']}]
+        )['NetworkInterfaces']), 1)
+        with self.assertRaises(ClientError) as context:
+            client.describe_network_interfaces(Filters=[{'Name': 'subnet-id', 'Values': ['subnet-1a2b3c4d']}])
+        self.assertEqual(context.exception.response['Error']['Code'], 'InvalidParameterValue')
+
+    def test_latency_and_concurrency(self):
+        from pyawsopstoolkit_insights.__globals__ import MAX_WORKERS
+        from pyawsopstoolkit_insights.iam import Role
+
+        self.backend.latency = 0.01
+        self.backend.populate(roles=40)
+
+        Role(session=self.backend.session()).unused_roles()
+        stats = self.backend.stats()
+
+        self.assertGreater(stats['max_concurrency'], 1)
+        self.assertLessEqual(stats['max_concurrency'], MAX_WORKERS)
+        self.assertGreaterEqual(stats['elapsed'], 0.01 * 42 / MAX_WORKERS)
+        self.assertAlmostEqual(stats['throughput'], stats['total_calls'] / stats['elapsed'])
+
+        self.backend.reset_stats()
+        self.assertEqual(self.backend.stats()['total_calls'], 0)
+
+    @patch('botocore.endpoint.time')
+    def test_throttling(self, mock_time):
+        from botocore.exceptions import ClientError
+        from pyawsopstoolkit_advsearch.exceptions import AdvanceSearchError
+        from pyawsopstoolkit_insights.iam import Role
+
+        backend = ReplayBackend(throttle_rate=0.2, max_attempts=10, seed=1)
+        backend.populate(roles=50, network_interfaces=1)
+
+        self.assertEqual(len(Role(session=backend.session()).unused_roles()), 25)
+        stats = backend.stats()
+        self.assertGreater(stats['throttled'], 0)
+        self.assertEqual(stats['total_calls'], 51 + stats['throttled'] + 1)
+        self.assertEqual(mock_time.sleep.call_count, stats['throttled'])
+        self.assertGreater(min(call.args[0] for call in mock_time.sleep.call_args_list), 0)
+
+        backend.throttle_rate = 1
+        with self.assertRaises(AdvanceSearchError):
+            Role(session=backend.session()).unused_roles()
+
+        backend.reset_stats()
+        client = backend.session().get_session().client('ec2', region_name='eu-west-1')
+        with self.assertRaises(ClientError) as context:
+            client.describe_network_interfaces()
+        self.assertEqual(context.exception.response['Error']['Code'], 'RequestLimitExceeded')
+        self.assertEqual(context.exception.response['ResponseMetadata']['RetryAttempts'], 9)
+        self.assertEqual(backend.stats()['throttled'], 10)
+
+    def test_add_response(self):
+        from botocore.exceptions import ClientError
+
+        created_date = datetime(2022, 3, 15, tzinfo=timezone.utc)
+        self.backend.add_response('iam', 'GetRole', {'Role': {
+            'Path': '/', 'RoleName': 'role1', 'RoleId': 'AROAREPLAY1', 'Arn': 'arn:aws:iam::123456789012:role/role1',
+            'CreateDate': created_date
+        }}, params={'RoleName': 'role1'})
+        client = self.backend.session().get_session().client('iam')
+
+        self.assertEqual(client.get_role(RoleName='role1')['Role']['CreateDate'], created_date)
+        with self.assertRaises(ClientError) as context:
+            client.get_role(RoleName='role2')
+        self.assertEqual(context.exception.response['Error']['Code'], 'ReplayResponseNotFound')
+
+    def test_record_save_load(self):
+        from pyawsopstoolkit_insights.iam import Role, User
+
+        self.backend.populate(roles=6, users=4)
+        recorder = ReplayBackend()
+        session = recorder.record(self.backend.session())
+        unused_roles = Role(session=session).unused_roles()
+        unused_users = User(session=session).unused_users()
+        path = os.path.join(self.temp_dir.name, 'recording.jsonl')
+
+        self.assertEqual(recorder.save(path), 13)
+
+        replay = ReplayBackend()
+        self.assertEqual(replay.load(path), 13)
+        session = replay.session()
+        self.assertEqual(Role(session=session).unused_roles(), unused_roles)
+        self.assertEqual(
+            [user.name for user in User(session=session).unused_users()], [user.name for user in unused_users]
+        )
+        self.assertEqual(replay.stats()['calls']['iam.GetLoginProfile'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from pyawsopstoolkit_insights.report import CSVWriter
+
+
+class TestCSVWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'report.csv')
+        self.writer = CSVWriter(path=self.path)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _security_group(self, sg_id):
+        from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+
+        return SecurityGroup(
+            account=self.account,
+            region='eu-west-1',
+            id=sg_id,
+            name='my-security-group',
+            owner_id='123456789012',
+            vpc_id='vpc-1a2b3c4d',
+            in_use=False
+        )
+
+    def test_initialization(self):
+        self.assertEqual(self.writer.path, self.path)
+        self.assertEqual(self.writer.batch_size, 1000)
+        self.assertFalse(self.writer.compress)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            CSVWriter(path=None)
+        with self.assertRaises(ValueError):
+            CSVWriter(path=self.path, batch_size=-1)
+        with self.assertRaises(TypeError):
+            self.writer.batch_size = 1.5
+        with self.assertRaises(TypeError):
+            CSVWriter(path=self.path, fieldnames=['id', 1])
+
+    def test_write_models(self):
+        self.writer.batch_size = 1
+        count = self.writer.write(self._security_group(f'sg-{i}') for i in range(3))
+
+        self.assertEqual(count, 3)
+        with open(self.path, encoding='utf-8', newline='') as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual([row['id'] for row in rows], ['sg-0', 'sg-1', 'sg-2'])
+        self.assertEqual(json.loads(rows[0]['account'])['number'], '123456789012')
+
+    def test_write_compressed(self):
+        self.writer.compress = True
+        self.writer.write([{'id': 'sg-0', 'tags': [{'Key': 'env', 'Value': 'dev'}]}])
+
+        with gzip.open(self.path, 'rt', encoding='utf-8', newline='') as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual(json.loads(rows[0]['tags']), [{'Key': 'env', 'Value': 'dev'}])
+
+    def test_write_mixed_keys(self):
+        records = [{'AllocationId': 'a'}, {'AllocationId': 'b', 'Tags': [{'Key': 'env', 'Value': 'dev'}]}]
+
+        self.assertEqual(self.writer.write(records), 2)
+        with open(self.path, encoding='utf-8', newline='') as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual(rows[0], {'AllocationId': 'a', 'Tags': ''})
+        self.assertEqual(json.loads(rows[1]['Tags']), [{'Key': 'env', 'Value': 'dev'}])
+
+        self.writer.batch_size = 1
+        with self.assertRaises(ValueError):
+            self.writer.write(records)
+
+        self.writer.fieldnames = ['AllocationId', 'Tags', 'Description']
+        self.assertEqual(self.writer.write(records), 2)
+        with open(self.path, encoding='utf-8', newline='') as handle:
+            reader = csv.DictReader(handle)
+            rows = list(reader)
+        self.assertEqual(reader.fieldnames, ['AllocationId', 'Tags', 'Description'])
+        self.assertEqual(json.loads(rows[1]['Tags']), [{'Key': 'env', 'Value': 'dev'}])
+
+        self.writer.fieldnames = ['AllocationId']
+        with self.assertRaises(ValueError):
+            self.writer.write(records)
+
+    def test_write_no_records(self):
+        self.assertEqual(self.writer.write([]), 0)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+        self.writer.fieldnames = ['AllocationId', 'Tags']
+        self.assertEqual(self.writer.write(iter([])), 0)
+        with open(self.path, encoding='utf-8', newline='') as handle:
+            self.assertEqual(handle.read(), 'AllocationId,Tags\r\n')
+
+    def test_write_failure_keeps_previous_report(self):
+        self.writer.write([{'AllocationId': 'a'}])
+
+        self.writer.batch_size = 1
+        with self.assertRaises(ValueError):
+            self.writer.write([{'AllocationId': 'b'}, {'AllocationId': 'c', 'Tags': []}])
+
+        with open(self.path, encoding='utf-8', newline='') as handle:
+            self.assertEqual([row['AllocationId'] for row in csv.DictReader(handle)], ['a'])
+        self.assertEqual(os.listdir(self.temp_dir.name), ['report.csv'])
+
+
+if __name__ == "__main__":
+    unittest.main()
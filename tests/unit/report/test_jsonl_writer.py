@@ -0,0 +1,91 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from pyawsopstoolkit_insights.report import JSONLWriter
+
+
+class TestJSONLWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'report.jsonl')
+        self.writer = JSONLWriter(path=self.path)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _role(self, name):
+        from pyawsopstoolkit_models.iam.role import Role
+
+        return Role(
+            account=self.account,
+            name=name,
+            id='ABCDGH',
+            arn=f'arn:aws:iam::{self.account.number}:role/{name}',
+            max_session_duration=3600,
+            created_date=datetime(2022, 3, 15)
+        )
+
+    def test_initialization(self):
+        self.assertEqual(self.writer.path, self.path)
+        self.assertEqual(self.writer.batch_size, 1000)
+        self.assertFalse(self.writer.compress)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            JSONLWriter(path=123)
+        with self.assertRaises(TypeError):
+            JSONLWriter(path=self.path, batch_size='10')
+        with self.assertRaises(ValueError):
+            JSONLWriter(path=self.path, batch_size=0)
+        with self.assertRaises(TypeError):
+            self.writer.compress = 'yes'
+
+    def test_write_models(self):
+        count = self.writer.write([self._role('test_role1'), self._role('test_role2')])
+
+        self.assertEqual(count, 2)
+        with open(self.path, encoding='utf-8') as handle:
+            lines = [json.loads(line) for line in handle]
+        self.assertEqual([line['name'] for line in lines], ['test_role1', 'test_role2'])
+        self.assertEqual(lines[0]['created_date'], '2022-03-15T00:00:00')
+
+    def test_write_generator_in_batches(self):
+        self.writer.batch_size = 3
+        count = self.writer.write({'id': i} for i in range(10))
+
+        self.assertEqual(count, 10)
+        with open(self.path, encoding='utf-8') as handle:
+            self.assertEqual([json.loads(line)['id'] for line in handle], list(range(10)))
+
+    def test_write_compressed(self):
+        self.writer.compress = True
+        self.writer.write([self._role('test_role1')])
+
+        with gzip.open(self.path, 'rt', encoding='utf-8') as handle:
+            self.assertEqual(json.loads(handle.readline())['name'], 'test_role1')
+
+    def test_write_invalid_record(self):
+        with self.assertRaises(TypeError):
+            self.writer.write([123])
+
+    def test_write_failure_keeps_previous_report(self):
+        self.writer.write([{'name': 'test_role1'}])
+
+        self.writer.batch_size = 1
+        with self.assertRaises(TypeError):
+            self.writer.write([{'name': 'test_role2'}, 123])
+
+        with open(self.path, encoding='utf-8') as handle:
+            self.assertEqual([json.loads(line)['name'] for line in handle], ['test_role1'])
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [os.path.basename(self.path)])
+
+
+if __name__ == "__main__":
+    unittest.main()
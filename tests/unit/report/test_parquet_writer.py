@@ -0,0 +1,131 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from pyawsopstoolkit_insights.report import ArrowWriter, ParquetWriter
+
+PYARROW_INSTALLED = importlib.util.find_spec('pyarrow') is not None
+
+
+class TestParquetWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'report.parquet')
+        self.writer = ParquetWriter(path=self.path, batch_size=2)
+        self.records = [
+            {'id': f'sg-{i}', 'description': None if i == 0 else f'group {i}', 'in_use': False}
+            for i in range(5)
+        ]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_initialization(self):
+        self.assertEqual(self.writer.path, self.path)
+        self.assertEqual(self.writer.batch_size, 2)
+        self.assertEqual(self.writer.compression, 'snappy')
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            ParquetWriter(path=self.path, compression=None)
+        with self.assertRaises(ValueError):
+            ArrowWriter(path=self.path, batch_size=0)
+
+    @unittest.skipIf(PYARROW_INSTALLED, 'pyarrow is installed')
+    def test_write_without_pyarrow(self):
+        with self.assertRaises(ImportError):
+            self.writer.write(self.records)
+
+    @unittest.skipUnless(PYARROW_INSTALLED, 'pyarrow is not installed')
+    def test_write_parquet(self):
+        import pyarrow.parquet as pq
+
+        self.assertEqual(self.writer.write(iter(self.records)), 5)
+
+        parquet_file = pq.ParquetFile(self.path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertEqual(parquet_file.read().column('description').to_pylist()[1], 'group 1')
+
+    @unittest.skipUnless(PYARROW_INSTALLED, 'pyarrow is not installed')
+    def test_write_parquet_mixed_keys(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        records = [{'AllocationId': 'a'}, {'AllocationId': 'b', 'Tags': [{'Key': 'env', 'Value': 'dev'}]}]
+
+        self.assertEqual(self.writer.write(records), 2)
+        self.assertEqual(
+            pq.read_table(self.path).column('Tags').to_pylist(), [None, '[{"Key": "env", "Value": "dev"}]']
+        )
+
+        self.writer.batch_size = 1
+        with self.assertRaises(ValueError):
+            self.writer.write(records)
+
+        self.writer.schema = pa.schema([pa.field('AllocationId', pa.string()), pa.field('Tags', pa.string())])
+        self.assertEqual(self.writer.write(records), 2)
+        self.assertEqual(pq.read_table(self.path).column('Tags').to_pylist()[1], '[{"Key": "env", "Value": "dev"}]')
+
+        self.writer.schema = pa.schema([pa.field('AllocationId', pa.string())])
+        with self.assertRaises(ValueError):
+            self.writer.write(records)
+        with self.assertRaises(TypeError):
+            self.writer.schema = ['AllocationId']
+
+    @unittest.skipUnless(PYARROW_INSTALLED, 'pyarrow is not installed')
+    def test_write_arrow_mixed_keys(self):
+        import pyarrow as pa
+
+        path = os.path.join(self.temp_dir.name, 'report.arrow')
+        records = [{'AllocationId': 'a'}, {'AllocationId': 'b', 'Tags': [{'Key': 'env', 'Value': 'dev'}]}]
+
+        self.assertEqual(ArrowWriter(path=path).write(records), 2)
+        with pa.ipc.open_file(path) as reader:
+            self.assertEqual(reader.read_all().column_names, ['AllocationId', 'Tags'])
+        with self.assertRaises(ValueError):
+            ArrowWriter(path=path, batch_size=1).write(records)
+
+    @unittest.skipUnless(PYARROW_INSTALLED, 'pyarrow is not installed')
+    def test_write_failure_keeps_previous_report(self):
+        import pyarrow.parquet as pq
+
+        records = [{'AllocationId': 'a'}, {'AllocationId': 'b', 'Tags': ['env']}]
+        self.writer.write(records[:1])
+
+        self.writer.batch_size = 1
+        with self.assertRaises(ValueError):
+            self.writer.write(records)
+
+        self.assertEqual(pq.read_table(self.path).column('AllocationId').to_pylist(), ['a'])
+        self.assertEqual(os.listdir(self.temp_dir.name), ['report.parquet'])
+
+    @unittest.skipUnless(PYARROW_INSTALLED, 'pyarrow is not installed')
+    def test_write_no_records(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.assertEqual(self.writer.write([]), 0)
+        self.assertEqual(pq.read_table(self.path).num_rows, 0)
+
+        schema = pa.schema([pa.field('AllocationId', pa.string())])
+        path = os.path.join(self.temp_dir.name, 'report.arrow')
+        self.assertEqual(ArrowWriter(path=path, schema=schema).write(iter([])), 0)
+        with pa.ipc.open_file(path) as reader:
+            self.assertEqual(reader.schema, schema)
+            self.assertEqual(reader.read_all().num_rows, 0)
+
+    @unittest.skipUnless(PYARROW_INSTALLED, 'pyarrow is not installed')
+    def test_write_arrow(self):
+        import pyarrow as pa
+
+        path = os.path.join(self.temp_dir.name, 'report.arrow')
+        self.assertEqual(ArrowWriter(path=path, batch_size=2).write(self.records), 5)
+
+        with pa.ipc.open_file(path) as reader:
+            self.assertEqual(reader.num_record_batches, 3)
+            self.assertEqual(reader.read_all().num_rows, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from pyawsopstoolkit_insights.tracker import FileEventSource
+
+
+class TestFileEventSource(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'events.jsonl')
+        self.records = [
+            {'eventSource': 'iam.amazonaws.com', 'eventName': 'DeleteRole', 'requestParameters': {'roleName': name}}
+            for name in ['test_role1', 'test_role2', 'test_role3']
+        ]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_initialization(self):
+        self.assertEqual(FileEventSource(path=self.path).path, self.path)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            FileEventSource(path=123)
+
+    def test_events_json_lines(self):
+        with open(self.path, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(json.dumps(record) for record in self.records) + '\n\n')
+
+        self.assertEqual(list(FileEventSource(path=self.path).events()), self.records)
+
+    def test_events_cloudtrail_log_files(self):
+        path = os.path.join(self.temp_dir.name, 'events.json.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as handle:
+            handle.write(json.dumps({'Records': self.records[:2]}) + '\n')
+            handle.write(json.dumps({'Records': self.records[2:]}) + '\n')
+
+        self.assertEqual(list(FileEventSource(path=path).events()), self.records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from queue import Queue, SimpleQueue
+
+from pyawsopstoolkit_insights.tracker import QueueEventSource
+
+
+class TestQueueEventSource(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queue = Queue()
+        self.records = [
+            {'eventSource': 'iam.amazonaws.com', 'eventName': 'DeleteRole', 'requestParameters': {'roleName': name}}
+            for name in ['test_role1', 'test_role2', 'test_role3']
+        ]
+
+    def test_initialization(self):
+        source = QueueEventSource(queue=self.queue)
+
+        self.assertEqual(source.queue, self.queue)
+        self.assertIsNone(source.timeout)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            QueueEventSource(queue=[])
+        with self.assertRaises(TypeError):
+            QueueEventSource(queue=self.queue, timeout='1')
+
+    def test_events(self):
+        self.queue.put(self.records[0])
+        self.queue.put({'Records': self.records[1:]})
+
+        self.assertEqual(list(QueueEventSource(queue=self.queue).events()), self.records)
+        self.assertTrue(self.queue.empty())
+
+    def test_events_with_timeout(self):
+        simple_queue = SimpleQueue()
+        simple_queue.put(self.records[0])
+
+        self.assertEqual(list(QueueEventSource(queue=simple_queue, timeout=0.01).events()), self.records[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,304 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from pyawsopstoolkit_insights.tracker import Tracker
+
+
+class TestTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+        from pyawsopstoolkit.session import Session
+
+        self.profile_name = 'temp'
+        self.account = Account('123456789012')
+        self.session = Session(profile_name=self.profile_name)
+        self.tracker = Tracker(session=self.session)
+        self.now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _mock_client(self):
+        from botocore.exceptions import ClientError
+
+        client = MagicMock()
+        pages = {
+            'list_roles': [{'Roles': [
+                {
+                    'RoleName': name,
+                    'RoleId': 'ABCDGH',
+                    'Arn': f'arn:aws:iam::{self.account.number}:role/{name}',
+                    'Path': '/',
+                    'MaxSessionDuration': 3600,
+                    'CreateDate': datetime(2022, 3, 15)
+                }
+                for name in ['test_role1', 'test_role2']
+            ]}],
+            'list_users': [{'Users': [{
+                'UserName': 'test_user1',
+                'UserId': 'ABDCGHY',
+                'Arn': f'arn:aws:iam::{self.account.number}:user/test_user1',
+                'Path': '/',
+                'CreateDate': datetime(2022, 5, 18)
+            }]}],
+            'list_access_keys': [{'AccessKeyMetadata': [{
+                'UserName': 'test_user1', 'AccessKeyId': 'AKIATEST1', 'Status': 'Active',
+                'CreateDate': datetime(2022, 6, 18)
+            }]}],
+            'describe_security_groups': [{'SecurityGroups': [
+                {'GroupId': group_id, 'GroupName': group_id, 'OwnerId': self.account.number, 'VpcId': 'vpc-1a2b3c4d'}
+                for group_id in ['sg-1', 'sg-2']
+            ]}],
+            'describe_network_interfaces': [{'NetworkInterfaces': [
+                {
+                    'NetworkInterfaceId': 'eni-1',
+                    'Status': 'in-use',
+                    'Groups': [{'GroupId': 'sg-1'}],
+                    'Attachment': {'AttachmentId': 'eni-attach-1', 'InstanceId': 'i-1', 'DeleteOnTermination': True}
+                },
+                {'NetworkInterfaceId': 'eni-2', 'Status': 'available', 'Groups': [{'GroupId': 'sg-1'}]}
+            ]}]
+        }
+
+        def _get_paginator(operation_name):
+            paginator = MagicMock()
+            paginator.paginate.return_value = pages[operation_name]
+
+            return paginator
+
+        def _get_role(RoleName):
+            role = next(role for role in pages['list_roles'][0]['Roles'] if role['RoleName'] == RoleName)
+            last_used = datetime.today() if RoleName == 'test_role2' else datetime(2022, 6, 1)
+
+            return {'Role': {**role, 'RoleLastUsed': {'LastUsedDate': last_used}}}
+
+        client.get_paginator.side_effect = _get_paginator
+        client.get_role.side_effect = _get_role
+        client.get_login_profile.side_effect = ClientError({'Error': {'Code': 'NoSuchEntity'}}, 'GetLoginProfile')
+        client.get_access_key_last_used.return_value = {'AccessKeyLastUsed': {'LastUsedDate': datetime(2022, 7, 1)}}
+
+        return client
+
+    def _event(self, event_source, event_name, region='eu-west-1', **kwargs):
+        return {
+            'eventVersion': '1.08',
+            'eventTime': self.now,
+            'eventSource': event_source,
+            'eventName': event_name,
+            'awsRegion': region,
+            'recipientAccountId': self.account.number,
+            **kwargs
+        }
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    @patch('pyawsopstoolkit_insights.__fetch__._get_client')
+    @patch('pyawsopstoolkit_insights.iam._get_client')
+    def _seed(self, mock_iam_client, mock_ec2_client, mock_account):
+        mock_account.return_value = self.account
+        mock_iam_client.return_value = self._mock_client()
+        mock_ec2_client.return_value = self._mock_client()
+
+        self.tracker.seed()
+
+    def test_initialization(self):
+        self.assertEqual(self.tracker.session, self.session)
+        self.assertEqual(self.tracker.no_of_days, 90)
+        self.assertFalse(self.tracker.include_newly_created)
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            Tracker(session=123)
+        with self.assertRaises(TypeError):
+            Tracker(session=self.session, no_of_days='90')
+        with self.assertRaises(TypeError):
+            self.tracker.include_newly_created = 'yes'
+        with self.assertRaises(TypeError):
+            self.tracker.apply('event')
+        with self.assertRaises(TypeError):
+            self.tracker.consume([])
+
+    @patch('pyawsopstoolkit.session.Session.get_account')
+    def test_seed(self, mock_account):
+        mock_account.return_value = self.account
+        self._seed()
+
+        self.assertTrue(self.tracker.is_role_unused('test_role1'))
+        self.assertFalse(self.tracker.is_role_unused('test_role2'))
+        self.assertFalse(self.tracker.is_role_unused('unknown_role'))
+        self.assertTrue(self.tracker.is_user_unused('test_user1'))
+        self.assertTrue(self.tracker.is_security_group_unused('sg-2'))
+        self.assertFalse(self.tracker.is_security_group_unused('sg-1'))
+        self.assertTrue(self.tracker.is_network_interface_unused('eni-2'))
+        self.assertEqual([role.name for role in self.tracker.unused_roles()], ['test_role1'])
+        self.assertEqual([user.name for user in self.tracker.unused_users()], ['test_user1'])
+        self.assertEqual([sg.id for sg in self.tracker.unused_security_groups()], ['sg-2'])
+        self.assertEqual(
+            [eni['NetworkInterfaceId'] for eni in self.tracker.unused_network_interfaces()], ['eni-2']
+        )
+
+    def test_queries_use_account_resolved_by_seed(self):
+        self._seed()
+
+        with patch('pyawsopstoolkit.session.Session.get_account', side_effect=AssertionError('get_account called')):
+            roles = self.tracker.unused_roles()
+            users = self.tracker.unused_users()
+            security_groups = self.tracker.unused_security_groups()
+
+        self.assertEqual([role.account.number for role in roles], [self.account.number])
+        self.assertEqual([user.name for user in users], ['test_user1'])
+        self.assertEqual([sg.account.number for sg in security_groups], [self.account.number])
+
+        self.tracker.unused_network_interfaces()[0]['Status'] = 'in-use'
+        self.assertTrue(self.tracker.is_network_interface_unused('eni-2'))
+
+    def test_apply_role_and_key_use(self):
+        self._seed()
+
+        self.assertTrue(self.tracker.apply(self._event('s3.amazonaws.com', 'ListBuckets', userIdentity={
+            'type': 'AssumedRole',
+            'sessionContext': {'sessionIssuer': {
+                'type': 'Role', 'userName': 'test_role1', 'arn': f'arn:aws:iam::{self.account.number}:role/test_role1',
+                'accountId': self.account.number
+            }}
+        })))
+        self.assertTrue(self.tracker.apply(self._event('ec2.amazonaws.com', 'DescribeInstances', userIdentity={
+            'type': 'IAMUser', 'userName': 'test_user1', 'accessKeyId': 'AKIATEST1'
+        })))
+
+        self.assertFalse(self.tracker.is_role_unused('test_role1'))
+        self.assertFalse(self.tracker.is_user_unused('test_user1'))
+        self.assertEqual(self.tracker.unused_users(), [])
+
+    def test_apply_assume_role(self):
+        self._seed()
+
+        self.assertTrue(self.tracker.apply(self._event('sts.amazonaws.com', 'AssumeRole', requestParameters={
+            'roleArn': f'arn:aws:iam::{self.account.number}:role/test_role1', 'roleSessionName': 'session'
+        })))
+
+        self.assertFalse(self.tracker.is_role_unused('test_role1'))
+
+    def test_apply_cross_account_role_use(self):
+        self._seed()
+        other_role_arn = 'arn:aws:iam::210987654321:role/test_role1'
+
+        self.assertFalse(self.tracker.apply(self._event('sts.amazonaws.com', 'AssumeRole', requestParameters={
+            'roleArn': other_role_arn, 'roleSessionName': 'session'
+        })))
+        self.assertFalse(self.tracker.apply(self._event('s3.amazonaws.com', 'ListBuckets', userIdentity={
+            'type': 'AssumedRole',
+            'sessionContext': {'sessionIssuer': {
+                'type': 'Role', 'userName': 'test_role1', 'arn': other_role_arn, 'accountId': '210987654321'
+            }}
+        })))
+        self.assertFalse(self.tracker.apply(self._event(
+            'sts.amazonaws.com', 'AssumeRole', recipientAccountId='210987654321', requestParameters={
+                'roleArn': f'arn:aws:iam::{self.account.number}:role/test_role1', 'roleSessionName': 'session'
+            }
+        )))
+        self.assertFalse(self.tracker.apply(self._event(
+            'ec2.amazonaws.com', 'DeleteSecurityGroup', recipientAccountId='210987654321',
+            requestParameters={'groupId': 'sg-2'}
+        )))
+
+        self.assertTrue(self.tracker.is_role_unused('test_role1'))
+        self.assertTrue(self.tracker.is_security_group_unused('sg-2'))
+
+    def test_apply_iam_lifecycle(self):
+        self._seed()
+
+        self.tracker.apply(self._event('iam.amazonaws.com', 'CreateRole', responseElements={'role': {
+            'roleName': 'test_role3', 'roleId': 'ABCDGH', 'path': '/',
+            'arn': f'arn:aws:iam::{self.account.number}:role/test_role3'
+        }}))
+        self.tracker.apply(self._event('iam.amazonaws.com', 'DeleteRole', requestParameters={'roleName': 'test_role1'}))
+        self.tracker.apply(self._event('iam.amazonaws.com', 'DeleteAccessKey', requestParameters={
+            'userName': 'test_user1', 'accessKeyId': 'AKIATEST1'
+        }))
+
+        self.assertFalse(self.tracker.is_role_unused('test_role1'))
+        self.assertFalse(self.tracker.is_role_unused('test_role3'))
+        self.assertFalse(self.tracker.apply(self._event('s3.amazonaws.com', 'ListBuckets', userIdentity={
+            'type': 'IAMUser', 'userName': 'test_user1', 'accessKeyId': 'AKIATEST1'
+        })))
+        self.assertTrue(self.tracker.is_user_unused('test_user1'))
+
+    def test_apply_network_interface_lifecycle(self):
+        self._seed()
+
+        self.tracker.apply(self._event('ec2.amazonaws.com', 'CreateSecurityGroup', requestParameters={
+            'groupName': 'sg-3', 'groupDescription': 'Security group sg-3', 'vpcId': 'vpc-1a2b3c4d'
+        }, responseElements={'_return': True, 'groupId': 'sg-3'}))
+        self.assertTrue(self.tracker.is_security_group_unused('sg-3'))
+
+        self.tracker.apply(self._event('ec2.amazonaws.com', 'CreateNetworkInterface', responseElements={
+            'networkInterface': {'networkInterfaceId': 'eni-3', 'groupSet': {'items': [{'groupId': 'sg-3'}]}}
+        }))
+        self.assertFalse(self.tracker.is_security_group_unused('sg-3'))
+        self.assertTrue(self.tracker.is_network_interface_unused('eni-3'))
+
+        self.tracker.apply(self._event('ec2.amazonaws.com', 'AttachNetworkInterface', requestParameters={
+            'networkInterfaceId': 'eni-3', 'instanceId': 'i-3', 'deviceIndex': 1
+        }, responseElements={'attachmentId': 'eni-attach-3'}))
+        self.assertFalse(self.tracker.is_network_interface_unused('eni-3'))
+
+        self.tracker.apply(self._event('ec2.amazonaws.com', 'DetachNetworkInterface', requestParameters={
+            'attachmentId': 'eni-attach-3'
+        }))
+        self.assertTrue(self.tracker.is_network_interface_unused('eni-3'))
+
+        self.tracker.apply(self._event('ec2.amazonaws.com', 'ModifyNetworkInterfaceAttribute', requestParameters={
+            'networkInterfaceId': 'eni-3', 'groupSet': {'items': [{'groupId': 'sg-2'}]}
+        }))
+        self.assertTrue(self.tracker.is_security_group_unused('sg-3'))
+        self.assertFalse(self.tracker.is_security_group_unused('sg-2'))
+
+    def test_apply_instance_termination(self):
+        self._seed()
+
+        self.tracker.apply(self._event('ec2.amazonaws.com', 'TerminateInstances', responseElements={
+            'instancesSet': {'items': [{'instanceId': 'i-1'}]}
+        }))
+        self.assertFalse(self.tracker.is_security_group_unused('sg-1'))
+
+        self.tracker.apply(self._event('ec2.amazonaws.com', 'DeleteNetworkInterface', requestParameters={
+            'networkInterfaceId': 'eni-2'
+        }))
+        self.assertTrue(self.tracker.is_security_group_unused('sg-1'))
+
+    def test_apply_ignored_events(self):
+        self._seed()
+
+        self.assertFalse(self.tracker.apply(self._event(
+            'ec2.amazonaws.com', 'DeleteSecurityGroup', requestParameters={'groupId': 'sg-2'},
+            errorCode='Client.DependencyViolation'
+        )))
+        self.assertFalse(self.tracker.apply(self._event(
+            'ec2.amazonaws.com', 'DeleteSecurityGroup', region='us-east-1', requestParameters={'groupId': 'sg-2'}
+        )))
+        self.assertFalse(self.tracker.apply(self._event('s3.amazonaws.com', 'ListBuckets')))
+        self.assertTrue(self.tracker.is_security_group_unused('sg-2'))
+
+        self.assertTrue(self.tracker.apply(self._event(
+            'ec2.amazonaws.com', 'DeleteSecurityGroup', requestParameters={'groupId': 'sg-2'}
+        )))
+        self.assertFalse(self.tracker.is_security_group_unused('sg-2'))
+
+    def test_consume(self):
+        from queue import Queue
+
+        from pyawsopstoolkit_insights.tracker import QueueEventSource
+
+        self._seed()
+        events = Queue()
+        events.put({'Records': [
+            self._event('iam.amazonaws.com', 'DeleteRole', requestParameters={'roleName': 'test_role1'}),
+            self._event('iam.amazonaws.com', 'DeleteRole', requestParameters={'roleName': 'unknown_role'})
+        ]})
+        events.put(self._event('ec2.amazonaws.com', 'DeleteSecurityGroup', requestParameters={'groupId': 'sg-2'}))
+
+        self.assertEqual(self.tracker.consume(QueueEventSource(queue=events)), 2)
+        self.assertFalse(self.tracker.is_role_unused('test_role1'))
+        self.assertFalse(self.tracker.is_security_group_unused('sg-2'))
+
+
+if __name__ == "__main__":
+    unittest.main()